@@ -0,0 +1,129 @@
+"""
+Cross-check and speed benchmark of the event-driven and the vectorized backtests.
+
+Backtests the market open momentum strategy on the same bars with the BacktestEngine
+and the VectorizedBacktester, compares their fills one by one (time, ticker, reason,
+quantity, price and commission) and reports the time of both, and the time the
+vectorized backtest takes to scan --combinations random risk parameter combinations.
+Exits with status 1 when the trades differ.
+
+The bars are a synthetic random walk unless --bar-cache is given, then the cached
+intraday bars of the configured tickers and [Backtest] period are used.
+
+Run from the repository root:
+    python -m benchmarks.backtest_benchmark --tickers 20 --days 21 --combinations 1000
+"""
+import argparse
+import configparser
+import logging
+import sys
+import types
+import numpy as np
+import pandas as pd
+from src.app.backtest_engine import BacktestEngine
+from src.app.vectorized_backtester import VectorizedBacktester
+from src.data_structures.bar_cache import BarCache
+from src.execution.configuration import Configuration
+from src.utilities.utils import timezone_from_calendar
+
+
+def synthetic_bars(tickers: int, days: int, interval: str) -> dict[str, pd.DataFrame]:
+    """Random walk bars over the regular sessions of the business days of 2024"""
+    rng = np.random.default_rng(0)
+    bars_per_day = int(pd.Timedelta("6h30min") / pd.Timedelta(interval))
+    offsets = pd.Timedelta("9h30min") + pd.Timedelta(interval) * np.arange(bars_per_day)
+    index = pd.DatetimeIndex([day + offset for day in pd.bdate_range("2024-01-02", periods=days) for offset in offsets])
+
+    bars = {}
+    for ticker in range(tickers):
+        close = 100 * np.exp(np.cumsum(rng.normal(0, 0.002, len(index))))
+        open_ = np.r_[100.0, close[:-1]]
+        bars[f"T{ticker:03d}"] = pd.DataFrame({
+            "open": open_,
+            "high": np.maximum(open_, close) * (1 + rng.uniform(0, 0.001, len(index))),
+            "low": np.minimum(open_, close) * (1 - rng.uniform(0, 0.001, len(index))),
+            "close": close,
+            "volume": rng.integers(1000, 100000, len(index)).astype(float),
+            }, index=index)
+    return bars
+
+
+def compare_trades(event: pd.DataFrame, vectorized: pd.DataFrame) -> list[str]:
+    """Differences between the fills of both backtests, empty when they are the same"""
+    frames = []
+    for trades in (event, vectorized):
+        trades = trades.assign(time=pd.DatetimeIndex(trades["time"]).tz_convert("UTC"))
+        frames.append(trades.sort_values(["time", "ticker", "reason", "quantity"]).reset_index(drop=True))
+    event, vectorized = frames
+
+    if len(event) != len(vectorized):
+        return [f"{len(event)} event-driven trades, {len(vectorized)} vectorized trades"]
+
+    differences = []
+    for column in ("time", "ticker", "reason"):
+        mismatches = np.flatnonzero(event[column].to_numpy() != vectorized[column].to_numpy())
+        if len(mismatches):
+            differences.append(f"{len(mismatches)} trades differ in {column}, first at row {mismatches[0]}")
+    for column in ("quantity", "price", "commission"):
+        mismatches = np.flatnonzero(~np.isclose(event[column], vectorized[column], rtol=1e-9, atol=1e-12))
+        if len(mismatches):
+            differences.append(f"{len(mismatches)} trades differ in {column}, first at row {mismatches[0]}")
+    return differences
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--config", default="run.cfg")
+    parser.add_argument("--tickers", type=int, default=20)
+    parser.add_argument("--days", type=int, default=21)
+    parser.add_argument("--combinations", type=int, default=1000)
+    parser.add_argument("--bar-cache", help="Backtest the cached bars of the configured tickers instead")
+    args = parser.parse_args()
+
+    config = configparser.ConfigParser()
+    config.read(args.config)
+    config.set("Bot", "strategy", "market_open_momentum")
+    config.set("Bot", "order_type", "market")
+    if config.has_section("SimulatedBroker"):
+        config.set("SimulatedBroker", "fill_latency", "0")
+
+    if args.bar_cache:
+        cfg = Configuration(types.SimpleNamespace(config=config))
+        timezone = timezone_from_calendar(cfg.market)
+        start, end = pd.Timestamp(cfg.backtest_start), pd.Timestamp(cfg.backtest_end)
+        cache = BarCache(args.bar_cache)
+        bars = {ticker: cache.load(cfg.market_data_api, ticker, cfg.intraday_interval, start, end, timezone) for ticker in cfg.tickers}
+    else:
+        bars = synthetic_bars(args.tickers, args.days, config.get("APIs", "intraday_interval", fallback="5min"))
+        config.set("Bot", "tickers", ",".join(bars))
+        cfg = Configuration(types.SimpleNamespace(config=config))
+
+    logging.getLogger().setLevel(logging.WARNING)
+    event = BacktestEngine(cfg, bars).run()
+    backtester = VectorizedBacktester(cfg, bars)
+    vectorized = backtester.run(record_trades=True)
+
+    differences = compare_trades(event.trades, vectorized.trade_log)
+    equity_difference = np.max(np.abs(event.equity.to_numpy() - vectorized.equity[0])) if len(event.equity) else 0.0
+    print(f"{len(cfg.tickers)} tickers, {len(backtester.bar_closes)} bar closes, {len(event.trades)} trades")
+    print(f"Event-driven: {event.elapsed:8.2f}s   Vectorized: {vectorized.elapsed:8.2f}s   Largest equity difference: {equity_difference:.2e}")
+
+    rng = np.random.default_rng(0)
+    scan = backtester.run(
+        stop_loss=rng.uniform(0.01, 0.2, args.combinations),
+        take_profit=rng.uniform(0.01, 0.5, args.combinations),
+        max_exposure=rng.uniform(0.05, 0.5, args.combinations)
+        )
+    best = scan.summary().sort_values("total_return", ascending=False).head(5)
+    print(f"Vectorized scan of {args.combinations} combinations: {scan.elapsed:.2f}s")
+    print(best.to_string(index=False))
+
+    if differences:
+        print("Trades differ:\n  " + "\n  ".join(differences))
+        return 1
+    print("Trades are identical")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,68 @@
+"""
+Start-up cost of the bot per configuration: import time, peak resident memory and the
+heavy third party packages loaded when the app module is imported and the configured
+market data API, broker API and strategy are resolved through their factories.
+
+Every configuration is measured in a fresh interpreter. Run from the repository root:
+    python -m benchmarks.import_benchmark
+    python -m benchmarks.import_benchmark --market-data twelve_data --broker alpaca --strategy market_open_momentum
+"""
+import argparse
+import json
+import subprocess
+import sys
+
+
+HEAVY_PACKAGES = ["torch", "transformers", "onnxruntime", "bs4", "alpaca", "twelvedata", "yfinance", "aiohttp", "websocket"]
+
+CONFIGURATIONS = {
+    "momentum": ("twelve_data", "alpaca", "market_open_momentum"),
+    "sentiment": ("alpha_vantage", "alpaca", "bert_sentiment"),
+}
+
+MEASURE = """
+import json, resource, sys, time
+start = time.perf_counter()
+import src.app.generic_bot_app
+from src.readers.api_factories import BrokerAPIFactory, MarketDataAPIFactory
+from src.strategys.strategy_factory import StrategyFactory
+MarketDataAPIFactory.registry.load({market_data!r})
+BrokerAPIFactory.registry.load({broker!r})
+StrategyFactory.registry.load({strategy!r})
+seconds = time.perf_counter() - start
+# Kilobytes on Linux, bytes on macOS
+rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / (1024 ** 2 if sys.platform == "darwin" else 1024)
+print(json.dumps({{"seconds": seconds, "rss_mb": rss, "heavy": [name for name in {heavy!r} if name in sys.modules]}}))
+"""
+
+
+def measure(market_data: str, broker: str, strategy: str) -> dict:
+    code = MEASURE.format(market_data=market_data, broker=broker, strategy=strategy, heavy=HEAVY_PACKAGES)
+    process = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True)
+    if process.returncode != 0:
+        return {"error": process.stderr.strip().splitlines()[-1]}
+    return json.loads(process.stdout.strip().splitlines()[-1])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--market-data")
+    parser.add_argument("--broker", default="alpaca")
+    parser.add_argument("--strategy", default="market_open_momentum")
+    args = parser.parse_args()
+
+    configurations = CONFIGURATIONS
+    if args.market_data:
+        configurations = {"custom": (args.market_data, args.broker, args.strategy)}
+
+    for name, (market_data, broker, strategy) in configurations.items():
+        result = measure(market_data, broker, strategy)
+        label = f"{name} ({market_data}, {broker}, {strategy})"
+        if "error" in result:
+            print(f"{label:<60} failed: {result['error']}")
+        else:
+            print(f"{label:<60} {result['seconds']:6.2f}s {result['rss_mb']:8.1f}MB   loaded: {', '.join(result['heavy']) or '-'}")
+
+
+if __name__ == "__main__":
+    main()
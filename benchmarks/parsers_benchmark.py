@@ -0,0 +1,81 @@
+"""
+Micro-benchmark of the time series JSON parsers against the previous pandas based 
+implementations, on synthetic 5000 point payloads.
+
+Run from the repository root:
+    python -m benchmarks.parsers_benchmark
+"""
+import json
+import timeit
+import pandas as pd
+from src.parsers.json_decoder import loads
+from src.parsers.time_series_json_parsers import AlphaVantageTimeSeriesJSONParser, TwelveDataTimeSeriesJSONParser
+
+
+POINTS = 5000
+REPEATS = 20
+
+
+def twelve_data_payload(points: int) -> str:
+    start = pd.Timestamp("2024-01-02 09:30")
+    values = [
+        {"datetime": str(start + pd.Timedelta(minutes=i)), "open": f"{100 + i * 0.01:.5f}", "high": f"{101 + i * 0.01:.5f}",
+         "low": f"{99 + i * 0.01:.5f}", "close": f"{100.5 + i * 0.01:.5f}", "volume": str(1000 + i)}
+        for i in reversed(range(points))
+    ]
+    return json.dumps({"meta": {"symbol": "AAPL"}, "values": values, "status": "ok"})
+
+
+def alpha_vantage_payload(points: int) -> str:
+    start = pd.Timestamp("2004-01-02")
+    series = {
+        str((start + pd.Timedelta(days=i)).date()): {"1. open": f"{100 + i * 0.01:.4f}", "2. high": f"{101 + i * 0.01:.4f}",
+                                                     "3. low": f"{99 + i * 0.01:.4f}", "4. close": f"{100.5 + i * 0.01:.4f}",
+                                                     "5. volume": str(1000 + i)}
+        for i in reversed(range(points))
+    }
+    return json.dumps({"Meta Data": {"2. Symbol": "IBM"}, "Time Series (Daily)": series})
+
+
+def legacy_twelve_data_parse(data, timezone):
+    df = pd.DataFrame(data)
+    df.index = pd.to_datetime(df['datetime']).dt.tz_localize(timezone)
+    df.pop('datetime')
+    return df
+
+
+def legacy_alpha_vantage_parse(data):
+    df = pd.DataFrame.from_dict(data["Time Series (Daily)"], orient="index")
+    df.index = pd.to_datetime(df.index)
+    df = df.astype(float)
+    df = df.rename(columns={"1. open": "Open", "2. high": "High", "3. low": "Low", "4. close": "Close", "5. volume": "Volume"})
+    return df[["Open", "High", "Low", "Close", "Volume"]]
+
+
+def measure(function) -> float:
+    return min(timeit.repeat(function, number=1, repeat=REPEATS)) * 1e3
+
+
+def main() -> None:
+    twelve_data = twelve_data_payload(POINTS)
+    alpha_vantage = alpha_vantage_payload(POINTS)
+
+    cases = {
+        "Twelve Data": (
+            lambda: legacy_twelve_data_parse(json.loads(twelve_data)["values"], "US/Eastern"),
+            lambda: TwelveDataTimeSeriesJSONParser.parse(loads(twelve_data)["values"], "US/Eastern"),
+        ),
+        "Alpha Vantage": (
+            lambda: legacy_alpha_vantage_parse(json.loads(alpha_vantage)),
+            lambda: AlphaVantageTimeSeriesJSONParser.parse(loads(alpha_vantage)),
+        ),
+    }
+
+    print(f"Decode and parse of {POINTS} points, best of {REPEATS} runs")
+    for name, (legacy, current) in cases.items():
+        legacy_ms, current_ms = measure(legacy), measure(current)
+        print(f"{name:<14} legacy {legacy_ms:7.2f}ms   current {current_ms:7.2f}ms   speedup {legacy_ms / current_ms:4.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""
+Parity and latency benchmark of the sentiment inference backends (pytorch, quantized, onnx)
+against the original per-article get_pt_score scoring of the BERT strategy.
+
+Reports per backend the share of articles with the same predicted class as the reference,
+the largest logit difference, the time to score all articles and the size of the weights.
+Exits with status 1 when a backend agrees with the reference on less than --min-agreement
+of the articles, so it can be run before switching [Sentiment] backend in run.cfg.
+
+Run from the repository root:
+    python -m benchmarks.sentiment_backends_benchmark --model nlptown/bert-base-multilingual-uncased-sentiment
+"""
+import argparse
+import sys
+import time
+import numpy as np
+import torch
+from src.strategys.sentiment_strategy import BERTBasedSentimentStrategy
+from src.utilities.model_registry import ModelRegistry
+from src.utilities.sentiment_scorer import SentimentScorer
+
+
+SUBJECTS = ["Tesla", "Apple", "The company", "Shares of the chip maker", "The retailer", "Analysts"]
+EVENTS = ["reported record quarterly revenue", "missed earnings expectations", "announced a large layoff",
+          "raised its full year guidance", "faces a regulatory investigation", "unveiled a new product line",
+          "cut its dividend", "beat analyst estimates by a wide margin"]
+CONTEXTS = ["", " as demand slowed in China", " after a volatile trading session",
+            " while competition in the sector keeps increasing", " and the stock jumped in after hours trading"]
+
+
+def synthetic_articles(count: int) -> list[str]:
+    rng = np.random.default_rng(0)
+    return [f"{rng.choice(SUBJECTS)} {rng.choice(EVENTS)}{rng.choice(CONTEXTS)}." for _ in range(count)]
+
+
+def reference_logits(model_id: str, texts: list[str]) -> np.ndarray:
+    """One article per forward pass, as get_pt_score did"""
+    loaded = ModelRegistry.get(model_id)
+    with torch.inference_mode():
+        return np.stack([loaded.model(loaded.tokenizer.encode(text, return_tensors='pt')).logits[0].numpy() for text in texts])
+
+
+def backend_logits(model_id: str, backend_type: str, texts: list[str], onnx_dir: str) -> np.ndarray:
+    loaded = ModelRegistry.get(model_id)
+    backend = ModelRegistry.get_backend(model_id, backend_type, onnx_dir)
+    return np.concatenate([backend.logits(dict(loaded.tokenizer([text], return_tensors="np"))) for text in texts])
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--model", default=BERTBasedSentimentStrategy.BERT_MODEL)
+    parser.add_argument("--backends", nargs="+", default=["pytorch", "quantized", "onnx"])
+    parser.add_argument("--articles", type=int, default=256)
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--onnx-dir", default="cache/onnx")
+    parser.add_argument("--min-agreement", type=float, default=0.95)
+    args = parser.parse_args()
+
+    texts = synthetic_articles(args.articles)
+    loaded = ModelRegistry.get(args.model)
+
+    start = time.perf_counter()
+    reference = reference_logits(args.model, texts)
+    reference_s = time.perf_counter() - start
+    print(f"{args.model}, {len(texts)} articles")
+    print(f"{'get_pt_score':<12} {reference_s:8.2f}s   {loaded.memory_bytes / 1e6:7.1f}MB")
+
+    failed = []
+    for backend_type in args.backends:
+        # Created outside of the timed section, the ONNX export runs once
+        backend = ModelRegistry.get_backend(args.model, backend_type, args.onnx_dir)
+        scorer = SentimentScorer(args.batch_size, backend=backend_type, onnx_dir=args.onnx_dir)
+
+        start = time.perf_counter()
+        predictions = scorer.predict(args.model, texts)
+        elapsed = time.perf_counter() - start
+
+        agreement = float(np.mean(predictions == reference.argmax(axis=-1)))
+        max_diff = float(np.abs(backend_logits(args.model, backend_type, texts, args.onnx_dir) - reference).max())
+        print(f"{backend_type:<12} {elapsed:8.2f}s   {backend.memory_bytes / 1e6:7.1f}MB   speedup {reference_s / elapsed:5.1f}x"
+              f"   agreement {agreement:6.1%}   max logit diff {max_diff:.2e}")
+
+        if agreement < args.min_agreement:
+            failed.append(backend_type)
+
+    if failed:
+        print(f"Agreement below {args.min_agreement:.0%} for: {', '.join(failed)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,6 +1,8 @@
 from src.execution.orchestrator import ExecutionOrchestrator
 
 
-config_path = "C:/Users/raoul/Documents/UpworkProjects/algorithmic_trading_lib/run.cfg"
-executor = ExecutionOrchestrator.run(config_path)
+# Guarded, the sentiment worker processes import this module when they are spawned
+if __name__ == "__main__":
+    config_path = "C:/Users/raoul/Documents/UpworkProjects/algorithmic_trading_lib/run.cfg"
+    executor = ExecutionOrchestrator.run(config_path)
 
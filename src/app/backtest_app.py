@@ -0,0 +1,80 @@
+from src.execution.workflow import Task
+from src.execution.configuration import Configuration
+from src.app.backtest_engine import BacktestEngine
+from src.app.vectorized_backtester import VectorizedBacktester
+from src.strategys.strategy_factory import StrategyFactory
+from src.readers.cached_mkdata_api import CachedMarketDataAPI
+from src.readers.api_factories import MarketDataAPIFactory
+from src.data_structures.bar_cache import BarCache
+from src.utilities.rate_limiter import RateLimiterRegistry
+from src.utilities.utils import timezone_from_calendar
+import pandas as pd
+import numpy as np
+import logging
+import os
+
+
+class BacktestApplication(Task):
+    """
+    Backtests the configured strategy on the intraday bars between the [Backtest] start and end dates,
+    event-driven or vectorized over a grid of risk parameters, see the [Backtest] mode.
+    """
+
+    def execute(self, cfg: Configuration):
+        logging.info("Running BacktestApp")
+        if cfg.backtest_start is None:
+            raise ValueError("Backtest start date missing. Set start in the [Backtest] section of the config.")
+        RateLimiterRegistry.configure(cfg.rate_limits)
+
+        timezone = timezone_from_calendar(cfg.market)
+        start_date = pd.Timestamp(cfg.backtest_start)
+        end_date = pd.Timestamp(cfg.backtest_end) if cfg.backtest_end is not None else pd.Timestamp.today()
+
+        # The provider is only called for bars and news missing from the caches
+        mkdata_api = CachedMarketDataAPI(MarketDataAPIFactory.create_instance(cfg.market_data_api, cfg), cfg.response_cache_ttls)
+        if cfg.bar_cache_dir:
+            bar_cache = BarCache(cfg.bar_cache_dir)
+            bars = bar_cache.get_historical_prices_batch(
+                mkdata_api, cfg.market_data_api, cfg.tickers, cfg.intraday_interval, start_date, end_date, timezone
+                )
+        else:
+            bars = mkdata_api.get_historical_prices_batch(
+                cfg.tickers, cfg.intraday_interval, start_date=start_date, end_date=end_date, timezone=timezone
+                )
+
+        if cfg.backtest_mode == "vectorized":
+            self._scan(cfg, bars)
+            return None
+
+        strategy = StrategyFactory.create_instance(cfg.strategy)
+        engine = BacktestEngine(cfg, bars, strategy, news_source=mkdata_api)
+
+        # Logging every iteration of a long replay would take longer than the replay itself
+        logger = logging.getLogger()
+        log_level = logger.level
+        logger.setLevel(cfg.backtest_log_level)
+        try:
+            result = engine.run()
+        finally:
+            logger.setLevel(log_level)
+
+        logging.info(f"Backtest of {cfg.strategy} from {start_date} to {end_date}: {result.summary()}")
+        result.to_csv(cfg.backtest_output_dir)
+
+    @staticmethod
+    def _scan(cfg: Configuration, bars: dict[str, pd.DataFrame]) -> None:
+        """Vectorized backtest of every combination of the risk parameter grids"""
+        grids = [
+            cfg.position_sizing_grid or [cfg.position_sizing],
+            cfg.stop_loss_grid or [cfg.stop_loss],
+            cfg.take_profit_grid or [cfg.take_profit],
+            cfg.max_exposure_grid or [cfg.max_exposure],
+            ]
+        combinations = [grid.ravel() for grid in np.meshgrid(*grids, indexing="ij")]
+
+        result = VectorizedBacktester(cfg, bars).run(*combinations)
+        summary = result.summary().sort_values("total_return", ascending=False)
+        logging.info(f"Vectorized backtest of {len(summary)} risk parameter combinations, best:\n{summary.head(10).to_string(index=False)}")
+
+        os.makedirs(cfg.backtest_output_dir, exist_ok=True)
+        summary.to_csv(os.path.join(cfg.backtest_output_dir, "parameters.csv"), index=False)
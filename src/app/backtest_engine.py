@@ -0,0 +1,226 @@
+from dataclasses import dataclass
+from typing import Optional
+from src.app.trading_pipeline import TradingPipeline
+from src.strategys.abstract_strategy import AbstractStrategy
+from src.strategys.strategy_factory import StrategyFactory
+from src.utilities.risk_manager import RiskManager
+from src.utilities.statistics_gatherer import StatisticsGatherer
+from src.utilities.bar_scheduler import BarScheduler
+from src.utilities.simulated_clock import SimulatedClock
+from src.utilities.utils import timezone_from_calendar, trading_session
+from src.data_structures.bar_store import BarStore, BAR_FIELDS
+from src.data_structures.marketdata_state import MarketDataState
+from src.data_structures.portfolio_state import PortfolioState
+from src.readers.abstract_apis import AbstractMarketDataAPI
+from src.readers.historical_mkdata_api import HistoricalMarketDataAPI
+from src.readers.simulated_broker_api import SimulatedBrokerAPI
+from src.readers.api_factories import BrokerAPIFactory
+from src.services.market_data_service import MarketDataService
+from src.execution.configuration import Configuration
+import pandas as pd
+import numpy as np
+import logging
+import time
+import os
+
+
+DAY_NS = 86400 * 10**9
+
+
+def prepare_bars(bars: dict[str, pd.DataFrame], timezone) -> tuple[dict[str, np.ndarray], dict[str, np.ndarray]]:
+    """
+    Bars of a backtest per ticker: ascending unique bar starts in exchange local ns, as held by
+    the bar stores of the live state, and their OHLCV rows in BAR_FIELDS order. Bars without a close are dropped.
+    """
+    timestamps, values = {}, {}
+    for ticker, data in bars.items():
+        if data is None or data.empty:
+            logging.warning(f"Backtest: no bars for {ticker}")
+            continue
+
+        index = pd.DatetimeIndex(data.index)
+        if index.tz is not None:
+            # Stores built from naive provider data hold exchange local time, like the live state
+            index = index.tz_convert(timezone).tz_localize(None)
+
+        columns = {str(column).lower(): column for column in data.columns}
+        rows = np.full((len(data), len(BAR_FIELDS)), np.nan)
+        for column, field in enumerate(BAR_FIELDS):
+            if field in columns:
+                rows[:, column] = pd.to_numeric(data[columns[field]], errors="coerce").to_numpy(dtype=np.float64)
+
+        starts = index.as_unit("ns").asi8
+        order = np.argsort(starts, kind="stable")
+        starts, rows = starts[order], rows[order]
+        # Latest bar per timestamp
+        keep = np.r_[starts[1:] != starts[:-1], True] & ~np.isnan(rows[:, BAR_FIELDS.index("close")])
+        timestamps[ticker], values[ticker] = starts[keep], rows[keep]
+    return timestamps, values
+
+
+def trading_closes(closes: np.ndarray, market: str) -> np.ndarray:
+    """
+    Bar closes in exchange local ns the bot trades on. Like the live BarScheduler, the close of the
+    session is left out, orders placed then would only be filled at the next open.
+    """
+    days = closes - closes % DAY_NS
+    keep = np.ones(len(closes), dtype=bool)
+    for day in np.unique(days):
+        session = trading_session(market, pd.Timestamp(int(day)))
+        if session is not None:
+            session_close = session[1].tz_localize(None).value
+            keep[days == day] &= closes[days == day] < session_close
+    return closes[keep]
+
+
+@dataclass
+class BacktestResult:
+    """
+    Outcome of a backtest.
+
+    Attributes:
+        equity (pd.Series): Equity of the portfolio after every bar close.
+        trades (pd.DataFrame): Fills of the simulated broker.
+        statistics (pd.DataFrame): Signals and risk rules triggered per ticker, see StatisticsGatherer.
+        initial_cash (float): Cash at the start of the backtest.
+        bars (int): Number of bars replayed.
+        elapsed (float): Wall clock seconds the replay took.
+    """
+    equity: pd.Series
+    trades: pd.DataFrame
+    statistics: pd.DataFrame
+    initial_cash: float
+    bars: int
+    elapsed: float
+
+    def summary(self) -> dict[str, float]:
+        equity = self.equity.to_numpy()
+        final = equity[-1] if len(equity) else self.initial_cash
+        peaks = np.maximum.accumulate(equity) if len(equity) else equity
+        return {
+            "bar_closes": len(equity),
+            "bars": self.bars,
+            "trades": len(self.trades),
+            "final_equity": float(final),
+            "total_return": float(final / self.initial_cash - 1.0),
+            "max_drawdown": float(np.max(1.0 - equity / peaks)) if len(equity) else 0.0,
+            "elapsed": self.elapsed,
+            "bars_per_second": self.bars / self.elapsed if self.elapsed > 0 else float("inf"),
+        }
+
+    def to_csv(self, directory: str) -> None:
+        """Writes the equity curve, the trades and the statistics to the directory"""
+        os.makedirs(directory, exist_ok=True)
+        self.equity.rename("equity").to_csv(os.path.join(directory, "equity.csv"), index_label="bar_close")
+        self.trades.to_csv(os.path.join(directory, "trades.csv"), index=False)
+        self.statistics.to_csv(os.path.join(directory, "statistics.csv"), index=False)
+        logging.info(f"Backtest results written to {directory}")
+
+
+class BacktestEngine:
+    """Replays historical bars through a strategy, the RiskManager and a simulated broker.
+
+    The bars of all tickers are merged into one timeline of bar closes, iterated by
+    a BarScheduler on a simulated clock. At every close the bars that closed by then
+    are appended to the bar stores of a MarketDataState, then the TradingPipeline of
+    the live bot runs: stop loss, take profit, signals, maximum exposure, orders and
+    portfolio state. The strategy reads the bars and real time prices through a
+    MarketDataService and a HistoricalMarketDataAPI on the same clock, so it cannot
+    see a bar before its close, and the orders are filled by the SimulatedBrokerAPI.
+    Sleeping only advances the clock, so the replay runs as fast as the pipeline.
+
+    Bars are indexed by their start, as returned by the providers, and become visible
+    at their close, start + intraday interval. Like the live bot, nothing is traded at
+    the close of the session.
+
+    :param cfg: Configuration of the bot, signals are generated for its tickers.
+    :param bars: OHLCV bars per ticker. Naive timestamps are exchange local time.
+    :param strategy: Strategy generating the signals, the configured one by default.
+    :param broker_api: Simulated broker, by default one connected with the configuration.
+    :param news_source: API providing the news of the replayed period, None to replay without news.
+    """
+
+    def __init__(self,
+                 cfg: Configuration,
+                 bars: dict[str, pd.DataFrame],
+                 strategy: Optional[AbstractStrategy] = None,
+                 broker_api: Optional[SimulatedBrokerAPI] = None,
+                 news_source: Optional[AbstractMarketDataAPI] = None) -> None:
+        self.cfg = cfg
+        self.bars = bars
+        self.strategy = strategy if strategy is not None else StrategyFactory.create_instance(cfg.strategy)
+        self.broker_api = broker_api
+        self.news_source = news_source
+
+    def run(self) -> BacktestResult:
+        started = time.perf_counter()
+        timezone = timezone_from_calendar(self.cfg.market)
+        interval = pd.Timedelta(str(self.cfg.intraday_interval)).value
+        api_name = self.cfg.market_data_api
+
+        timestamps, values = prepare_bars(self.bars, timezone)
+        if not timestamps:
+            raise ValueError("No bars to replay")
+
+        # Bar closes in exchange local time, and per ticker the number of its bars closed by each of them
+        closes = trading_closes(np.unique(np.concatenate(list(timestamps.values()))) + interval, self.cfg.market)
+        if not len(closes):
+            raise ValueError("No bar closes to replay")
+        closed = {ticker: np.searchsorted(starts + interval, closes, side="right") for ticker, starts in timestamps.items()}
+        bar_closes = pd.DatetimeIndex(closes).tz_localize(timezone)
+        utc_closes = bar_closes.asi8
+
+        clock = SimulatedClock(bar_closes[0].timestamp())
+        mkdata_state = MarketDataState(self.cfg.bar_store_capacity)
+        stores = {ticker: BarStore(self.cfg.bar_store_capacity) for ticker in timestamps}
+        mkdata_state.market_data = {api_name: stores}
+        news_range = ((bar_closes[0] - pd.Timedelta(days=1)).normalize(), bar_closes[-1])
+        mkdata_state.add_apis({api_name: HistoricalMarketDataAPI(mkdata_state, api_name, clock.time, self.news_source, news_range, timezone)})
+        mkdata_service = MarketDataService(mkdata_state, clock.time)
+
+        broker_api = self.broker_api
+        if broker_api is None:
+            broker_api = BrokerAPIFactory.create_instance("simulated")
+            broker_api.connect(self.cfg)
+        broker_api.attach_market_data(mkdata_service, api_name)
+
+        portfolio_state = PortfolioState()
+        portfolio_state.populate_state(broker_api)
+        initial_cash = portfolio_state.equity
+
+        risk_manager = RiskManager(self.cfg.position_sizing, self.cfg.stop_loss, self.cfg.take_profit, self.cfg.max_exposure, portfolio_state)
+        statistics_gatherer = StatisticsGatherer()
+        pipeline = TradingPipeline(self.strategy, mkdata_service, broker_api, portfolio_state, risk_manager, statistics_gatherer, self.cfg)
+
+        logging.info(f"Backtest: replaying {len(closes)} bar closes of {len(stores)} tickers from {bar_closes[0]} to {bar_closes[-1]}")
+        self.strategy.start(self.cfg)
+        scheduler = BarScheduler(list(bar_closes), 0.0, clock.time, clock.sleep)
+        equity = np.full(len(closes), np.nan)
+        appended = dict.fromkeys(stores, 0)
+
+        try:
+            for bar_close in scheduler:
+                position = int(np.searchsorted(utc_closes, bar_close.value))
+                with mkdata_state.lock:
+                    for ticker, store in stores.items():
+                        ticker_timestamps, ticker_values = timestamps[ticker], values[ticker]
+                        for row in range(appended[ticker], closed[ticker][position]):
+                            store.append(int(ticker_timestamps[row]), ticker_values[row])
+                        appended[ticker] = closed[ticker][position]
+
+                pipeline.run()
+                equity[position] = portfolio_state.equity
+        finally:
+            self.strategy.shutdown()
+
+        elapsed = time.perf_counter() - started
+        result = BacktestResult(
+            equity=pd.Series(equity, index=bar_closes).dropna(),
+            trades=broker_api.trades,
+            statistics=statistics_gatherer.to_dataframe(),
+            initial_cash=initial_cash,
+            bars=int(sum(appended.values())),
+            elapsed=elapsed
+            )
+        logging.info(f"Backtest finished: {result.summary()}")
+        return result
@@ -1,18 +1,21 @@
 from src.execution.workflow import Task
 from src.execution.context import Context
 import logging
-from src.strategys.market_open_momentum_strategy import MarketOpenMomentumStrategy
-from src.strategys.sentiment_strategy import BERTBasedSentimentStrategy
+from src.strategys.strategy_factory import StrategyFactory
 from src.utilities.risk_manager import RiskManager
 from src.utilities.statistics_gatherer import StatisticsGatherer
-from src.utilities.enums import Signal, OrderType
-from src.data_structures.order import Order
+from src.app.trading_pipeline import TradingPipeline
 from src.data_structures.portfolio_state import PortfolioState
-from src.readers.api_factories import BrokerAPIFactory, MarketDataAPIFactory
+from src.readers.cached_mkdata_api import CachedMarketDataAPI
+from src.readers.api_factories import BrokerAPIFactory, MarketDataAPIFactory, PriceStreamFactory
 from src.data_structures.marketdata_state import MarketDataState
+from src.data_structures.bar_cache import BarCache
+from src.utilities.fetch_engine import FetchEngine
+from src.utilities.rate_limiter import RateLimiterRegistry
 from src.services.market_data_service import MarketDataService
-from src.utilities.utils import market_open
+from src.utilities.bar_scheduler import BarScheduler
 import sys
+import asyncio
 from src.execution.configuration import Configuration
 
 
@@ -21,9 +24,10 @@ class GenericBotApplication(Task):
 
     def execute(self, cfg: Configuration):
         logging.info("Running GenericBotApp")
+        RateLimiterRegistry.configure(cfg.rate_limits)
 
         mkdata_factory = MarketDataAPIFactory()
-        mkdata_api = mkdata_factory.create_instance(cfg.market_data_api)
+        mkdata_api = CachedMarketDataAPI(mkdata_factory.create_instance(cfg.market_data_api, cfg), cfg.response_cache_ttls)
 
         broker_api = BrokerAPIFactory.create_instance(cfg.broker_api)
         broker_api.connect(cfg)
@@ -31,52 +35,55 @@ class GenericBotApplication(Task):
         portfolio_state = PortfolioState()
         portfolio_state.populate_state(broker_api)
 
-        mkdata_state = MarketDataState()
+        bar_cache = BarCache(cfg.bar_cache_dir) if cfg.bar_cache_dir else None
+        fetch_engine = FetchEngine(cfg.max_fetch_workers)
+        mkdata_state = MarketDataState(cfg.bar_store_capacity, bar_cache, fetch_engine)
         mkdata_state.add_apis({cfg.market_data_api: mkdata_api})
-        mkdata_state.populate_historical_data(cfg.tickers, cfg)
-        mkdata_state.populate_intraday_data(cfg.tickers, cfg)
 
-        mkdata_service = MarketDataService(mkdata_state)
+        event_loop = asyncio.new_event_loop() if cfg.async_refresh else None
 
-        risk_manager = RiskManager(cfg.position_sizing, cfg.stop_loss, cfg.take_profit, cfg.max_exposure, portfolio_state)
-        statistics_gatherer = StatisticsGatherer()
+        strategy = StrategyFactory.create_instance(cfg.strategy)
+        try:
+            if event_loop is not None:
+                event_loop.run_until_complete(mkdata_state.populate_historical_data_async(cfg.tickers, cfg))
+            else:
+                mkdata_state.populate_historical_data(cfg.tickers, cfg)
 
-        while market_open(cfg.market):
-        
-            stop_loss_trades = risk_manager.check_stop_loss()
-            broker_api.close_positions(stop_loss_trades)
-            statistics_gatherer.increment_stop_loss(stop_loss_trades)
-
-            take_profit_tickers = risk_manager.check_take_profit()
-            broker_api.close_positions(take_profit_tickers)
-            statistics_gatherer.increment_take_profit(take_profit_tickers)
-
-            # signals = MarketOpenMomentumStrategy.generate_signals(mkdata_service, cfg.tickers, cfg)
-            signals = BERTBasedSentimentStrategy.generate_signals(mkdata_service, cfg.tickers, cfg)
-            
-            orders = []
-            prices = {}
-            for ticker, signal in signals.items():
-                price = mkdata_service.get_real_time_price(ticker)
-                units = risk_manager.units_to_trade(price)
-
-                orders.append(Order(ticker, signal, units, None, cfg.order_type))
-                prices[ticker] = price
-
-            approved_orders = risk_manager.check_max_exposures(orders, prices)
-            broker_api.place_orders(approved_orders)
-
-            statistics_gatherer.increment_signals(signals)
-            logging.info(f"Current cumulative signals: \n{str(statistics_gatherer.to_dataframe())}")
+            if cfg.price_stream:
+                # Started before the intraday backfill so no bars are missed in between
+                price_stream = PriceStreamFactory.create_instance(cfg.price_stream)
+                mkdata_state.attach_price_stream(cfg.market_data_api, price_stream, cfg.tickers, cfg)
+            mkdata_state.populate_intraday_data(cfg.tickers, cfg)
 
-            portfolio_state.populate_state(broker_api)
-            mkdata_state.populate_state(cfg)
+            mkdata_service = MarketDataService(mkdata_state)
+            broker_api.attach_market_data(mkdata_service, cfg.market_data_api)
 
+            strategy.start(cfg)
 
+            risk_manager = RiskManager(cfg.position_sizing, cfg.stop_loss, cfg.take_profit, cfg.max_exposure, portfolio_state)
+            statistics_gatherer = StatisticsGatherer()
+            pipeline = TradingPipeline(strategy, mkdata_service, broker_api, portfolio_state, risk_manager, statistics_gatherer, cfg)
 
+            scheduler = BarScheduler.for_session(cfg.market, cfg.intraday_interval, cfg.publication_lag)
+            if not scheduler.bar_closes:
+                logging.warning(f"No {cfg.market} bar closes left to trade today. Shutting down...")
+                return None
 
+            for bar_close in scheduler:
+                logging.info(f"Processing bar closing at {bar_close}")
 
+                if event_loop is not None and not cfg.price_stream:
+                    event_loop.run_until_complete(mkdata_state.populate_state_async(cfg))
+                else:
+                    mkdata_state.populate_state(cfg)
 
+                pipeline.run()
 
+                logging.info(f"Current cumulative signals: \n{str(statistics_gatherer.to_dataframe())}")
+                logging.debug(f"Market data response cache: {mkdata_api.stats()}")
 
-        
\ No newline at end of file
+            logging.info(f"Session finished. Scheduler timings: {scheduler.summary()}")
+        finally:
+            strategy.shutdown()
+            if event_loop is not None:
+                event_loop.close()
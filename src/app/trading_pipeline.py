@@ -0,0 +1,67 @@
+from src.strategys.abstract_strategy import AbstractStrategy
+from src.services.market_data_service import MarketDataService
+from src.readers.abstract_apis import AbstractBrokerAPI
+from src.data_structures.portfolio_state import PortfolioState
+from src.data_structures.order import Order
+from src.utilities.risk_manager import RiskManager
+from src.utilities.statistics_gatherer import StatisticsGatherer
+from src.execution.configuration import Configuration
+import logging
+
+
+class TradingPipeline:
+    """One iteration of the trading loop, run after every bar close.
+
+    Closes the positions hitting the stop loss or take profit, generates the
+    signals, sizes them into orders, keeps the orders within the maximum exposure,
+    places them and refreshes the portfolio state from the broker. The live bot
+    and the backtest engine run the same pipeline, only their market data and
+    broker differ.
+    """
+
+    def __init__(self,
+                 strategy: AbstractStrategy,
+                 mkdata_service: MarketDataService,
+                 broker_api: AbstractBrokerAPI,
+                 portfolio_state: PortfolioState,
+                 risk_manager: RiskManager,
+                 statistics_gatherer: StatisticsGatherer,
+                 cfg: Configuration) -> None:
+        self.strategy = strategy
+        self.mkdata_service = mkdata_service
+        self.broker_api = broker_api
+        self.portfolio_state = portfolio_state
+        self.risk_manager = risk_manager
+        self.statistics_gatherer = statistics_gatherer
+        self.cfg = cfg
+
+    def run(self) -> list[Order]:
+        """Runs one iteration, returns the orders placed"""
+        stop_loss_trades = self.risk_manager.check_stop_loss()
+        self.broker_api.close_positions(stop_loss_trades)
+        self.statistics_gatherer.increment_stop_loss(stop_loss_trades)
+
+        take_profit_tickers = self.risk_manager.check_take_profit()
+        self.broker_api.close_positions(take_profit_tickers)
+        self.statistics_gatherer.increment_take_profit(take_profit_tickers)
+
+        signals = self.strategy.generate_signals(self.mkdata_service, self.cfg.tickers, self.cfg)
+
+        orders = []
+        prices = self.mkdata_service.get_real_time_prices(list(signals.keys()), self.cfg.market_data_api)
+        for ticker, signal in signals.items():
+            if ticker not in prices:
+                logging.warning(f"No real time price for {ticker}. No order generated.")
+                continue
+
+            units = self.risk_manager.units_to_trade(prices[ticker])
+            orders.append(Order(ticker, signal, units, None, self.cfg.order_type))
+
+        approved_orders = self.risk_manager.check_max_exposures(orders, prices)
+        self.broker_api.place_orders(approved_orders)
+
+        self.statistics_gatherer.increment_signals(signals)
+        self.statistics_gatherer.increment_strategy_statistics(self.strategy.statistics())
+
+        self.portfolio_state.populate_state(self.broker_api)
+        return approved_orders
@@ -0,0 +1,223 @@
+from dataclasses import dataclass
+from typing import Optional
+from src.app.backtest_engine import prepare_bars, trading_closes, DAY_NS
+from src.data_structures.bar_store import BAR_FIELDS
+from src.utilities.enums import OrderType
+from src.utilities.utils import timezone_from_calendar
+from src.execution.configuration import Configuration
+import pandas as pd
+import numpy as np
+import logging
+import time
+
+
+@dataclass
+class VectorizedBacktestResult:
+    """
+    Outcome of a vectorized backtest, one row per parameter combination and one column per bar close.
+
+    Attributes:
+        bar_closes (pd.DatetimeIndex): Bar closes of the columns.
+        parameters (pd.DataFrame): position_sizing, stop_loss, take_profit and max_exposure per combination.
+        pnl (np.ndarray): Change of the equity at every bar close.
+        exposure (np.ndarray): Gross market value of the positions over the equity after every bar close.
+        trades (np.ndarray): Number of fills at every bar close.
+        initial_cash (float): Cash at the start of the backtest.
+        trade_log (pd.DataFrame | None): Every fill, when recorded.
+        elapsed (float): Wall clock seconds of the pass over the bar closes.
+    """
+    bar_closes: pd.DatetimeIndex
+    parameters: pd.DataFrame
+    pnl: np.ndarray
+    exposure: np.ndarray
+    trades: np.ndarray
+    initial_cash: float
+    trade_log: Optional[pd.DataFrame]
+    elapsed: float
+
+    @property
+    def equity(self) -> np.ndarray:
+        return self.initial_cash + np.cumsum(self.pnl, axis=1)
+
+    def summary(self) -> pd.DataFrame:
+        """Total return, maximum drawdown, mean and maximum exposure and number of trades per combination"""
+        equity = self.equity
+        drawdown = 1.0 - equity / np.maximum.accumulate(equity, axis=1) if equity.shape[1] else np.zeros_like(equity)
+        summary = self.parameters.copy()
+        summary["total_return"] = equity[:, -1] / self.initial_cash - 1.0 if equity.shape[1] else 0.0
+        summary["max_drawdown"] = drawdown.max(axis=1) if equity.shape[1] else 0.0
+        summary["mean_exposure"] = self.exposure.mean(axis=1) if equity.shape[1] else 0.0
+        summary["max_exposure_reached"] = self.exposure.max(axis=1) if equity.shape[1] else 0.0
+        summary["trades"] = self.trades.sum(axis=1)
+        return summary
+
+
+class VectorizedBacktester:
+    """Backtests the market open momentum strategy and the RiskManager rules with NumPy array operations.
+
+    The bars are turned once into tickers x bar closes panels of the latest close and
+    of the open of the day, so the signals of all tickers and bar closes are one array
+    comparison. The positions depend on the fills before them, so the risk rules and
+    the fills are applied in one pass over the bar closes, each step an array operation
+    over all tickers and all parameter combinations at once. Scanning a grid of risk
+    parameters costs little more than a single run.
+
+    Every step mirrors an iteration of the event-driven BacktestEngine with the
+    SimulatedBrokerAPI: the stop loss, take profit and exposure checks use the portfolio
+    state of the previous bar close like the RiskManager, the orders are sized with
+    position_sizing / price and all fills are at the latest close with the broker's
+    slippage and commission, so both produce the same trades. Only market orders
+    without a fill latency are supported.
+
+    :param cfg: Configuration of the bot, the signals are generated for its tickers.
+    :param bars: OHLCV bars per ticker indexed by bar start. Naive timestamps are exchange local time.
+    """
+
+    def __init__(self, cfg: Configuration, bars: dict[str, pd.DataFrame]) -> None:
+        if cfg.strategy.lower() != "market_open_momentum":
+            raise ValueError(f"The vectorized backtest only supports the market_open_momentum strategy, not {cfg.strategy}")
+        if cfg.order_type != OrderType.MARKET or cfg.fill_latency > 0:
+            raise ValueError("The vectorized backtest only supports market orders without a fill latency")
+
+        self.cfg = cfg
+        timezone = timezone_from_calendar(cfg.market)
+        interval = pd.Timedelta(str(cfg.intraday_interval)).value
+
+        timestamps, values = prepare_bars({ticker: bars[ticker] for ticker in cfg.tickers if ticker in bars}, timezone)
+        if not timestamps:
+            raise ValueError("No bars to backtest")
+
+        self.tickers = list(timestamps)
+        closes = trading_closes(np.unique(np.concatenate(list(timestamps.values()))) + interval, cfg.market)
+        if not len(closes):
+            raise ValueError("No bar closes to backtest")
+        self.bar_closes = pd.DatetimeIndex(closes).tz_localize(timezone)
+
+        # Latest close and open of the first bar of the day, of the bars closed by every bar close
+        day_starts = closes - closes % DAY_NS
+        self.prices = np.full((len(self.tickers), len(closes)), np.nan)
+        self.day_opens = np.full((len(self.tickers), len(closes)), np.nan)
+        for row, ticker in enumerate(self.tickers):
+            starts, ohlcv = timestamps[ticker], values[ticker]
+
+            latest = np.searchsorted(starts + interval, closes, side="right") - 1
+            closed = latest >= 0
+            self.prices[row, closed] = ohlcv[latest[closed], BAR_FIELDS.index("close")]
+
+            first = np.searchsorted(starts, day_starts, side="left")
+            opened = first < len(starts)
+            opened[opened] = starts[first[opened]] + interval <= closes[opened]
+            self.day_opens[row, opened] = ohlcv[first[opened], BAR_FIELDS.index("open")]
+
+        # BUY 1, SELL -1, HOLD 0, NaN without a signal
+        self.signals = np.sign(self.prices - self.day_opens)
+
+    def run(self,
+            position_sizing=None,
+            stop_loss=None,
+            take_profit=None,
+            max_exposure=None,
+            record_trades: bool = False) -> VectorizedBacktestResult:
+        """
+        Backtests every combination of the risk parameters, given as scalars or equally long
+        arrays and defaulting to the configured values.
+
+        :param record_trades: Also returns every fill, for cross-checks with the event-driven backtest.
+        """
+        started = time.perf_counter()
+        cfg = self.cfg
+        parameters = pd.DataFrame(np.broadcast_arrays(
+            np.atleast_1d(cfg.position_sizing if position_sizing is None else position_sizing).astype(np.float64),
+            np.atleast_1d(cfg.stop_loss if stop_loss is None else stop_loss).astype(np.float64),
+            np.atleast_1d(cfg.take_profit if take_profit is None else take_profit).astype(np.float64),
+            np.atleast_1d(cfg.max_exposure if max_exposure is None else max_exposure).astype(np.float64)
+            ), index=["position_sizing", "stop_loss", "take_profit", "max_exposure"]).T
+
+        sizing, stop_loss_factor, take_profit_factor, exposure_limit = (parameters[column].to_numpy()[:, None] for column in parameters.columns)
+        combinations, tickers, steps = len(parameters), len(self.tickers), len(self.bar_closes)
+        buy_factor = 1.0 + cfg.slippage_bps * 1e-4
+        sell_factor = 1.0 - cfg.slippage_bps * 1e-4
+
+        # Portfolio state after the previous bar close, per combination and ticker
+        quantity = np.zeros((combinations, tickers))
+        average_price = np.zeros((combinations, tickers))
+        market_value = np.zeros((combinations, tickers))
+        cash = np.full(combinations, cfg.initial_cash)
+        equity = cash.copy()
+
+        pnl = np.empty((combinations, steps))
+        exposure = np.empty((combinations, steps))
+        trade_counts = np.zeros((combinations, steps), dtype=np.int32)
+        trade_log = [] if record_trades else None
+
+        for step in range(steps):
+            price = self.prices[:, step]
+            signal = self.signals[:, step]
+            exists = quantity != 0.0
+
+            # Stop loss and take profit, on the market values of the previous bar close
+            closing = exists & ((market_value < (1 - stop_loss_factor) * average_price * quantity)
+                                | (market_value >= (1 + take_profit_factor) * average_price * quantity))
+            if closing.any():
+                fill_quantity = np.where(closing, -quantity, 0.0)
+                cash -= self._settle(fill_quantity, price, closing, buy_factor, sell_factor, step, "close", trade_log)
+                trade_counts[:, step] += closing.sum(axis=1)
+                quantity[closing] = 0.0
+                average_price[closing] = 0.0
+
+            # Signals sized into orders, checked against the maximum exposure of the previous bar close
+            units = sizing / price
+            order_value = units * price
+            ratio = np.where(exists, (market_value + order_value) / equity[:, None], order_value / equity[:, None])
+            approved = ~np.isnan(signal) & (signal != 0) & (ratio < exposure_limit)
+            if approved.any():
+                fill_quantity = np.where(approved, signal * units, 0.0)
+                fill_price = np.where(fill_quantity > 0, price * buy_factor, price * sell_factor)
+                cash -= self._settle(fill_quantity, price, approved, buy_factor, sell_factor, step, "market", trade_log)
+                trade_counts[:, step] += approved.sum(axis=1)
+
+                # Average entry price like the broker: increased, reduced or reversed positions
+                total = quantity + fill_quantity
+                increased = (quantity == 0.0) | ((quantity > 0) == (fill_quantity > 0))
+                reversed_ = ~increased & ((quantity > 0) != (total > 0))
+                with np.errstate(divide="ignore", invalid="ignore"):
+                    entry = np.where(increased, (quantity * average_price + fill_quantity * fill_price) / total,
+                                     np.where(reversed_, fill_price, average_price))
+                flat = np.abs(total) < 1e-12
+                average_price = np.where(approved, np.where(flat, 0.0, entry), average_price)
+                quantity = np.where(approved, np.where(flat, 0.0, total), quantity)
+
+            market_value = np.where(quantity != 0.0, quantity * price, 0.0)
+            new_equity = cash + market_value.sum(axis=1)
+            pnl[:, step] = new_equity - equity
+            exposure[:, step] = np.abs(market_value).sum(axis=1) / new_equity
+            equity = new_equity
+
+        elapsed = time.perf_counter() - started
+        logging.info(f"Vectorized backtest: {combinations} combinations x {tickers} tickers x {steps} bar closes in {elapsed:.2f}s")
+
+        if record_trades:
+            columns = ["combination", "time", "ticker", "quantity", "price", "commission", "reason"]
+            trade_log = pd.DataFrame(trade_log, columns=columns)
+        return VectorizedBacktestResult(self.bar_closes, parameters, pnl, exposure, trade_counts, cfg.initial_cash, trade_log, elapsed)
+
+    def _settle(self,
+                fill_quantity: np.ndarray,
+                price: np.ndarray,
+                filled: np.ndarray,
+                buy_factor: float,
+                sell_factor: float,
+                step: int,
+                reason: str,
+                trade_log: Optional[list]) -> np.ndarray:
+        """Cash spent per combination on the fills, at the slipped latest close plus commission"""
+        cfg = self.cfg
+        fill_price = np.where(fill_quantity > 0, price * buy_factor, price * sell_factor)
+        commission = np.maximum(np.abs(fill_quantity) * (cfg.commission_per_share + fill_price * cfg.commission_bps * 1e-4), cfg.min_commission)
+        spent = np.where(filled, fill_quantity * fill_price + commission, 0.0)
+
+        if trade_log is not None:
+            for combination, row in zip(*np.nonzero(filled)):
+                trade_log.append((combination, self.bar_closes[step], self.tickers[row], fill_quantity[combination, row],
+                                  fill_price[combination, row], commission[combination, row], reason))
+        return spent.sum(axis=1)
@@ -0,0 +1,166 @@
+from typing import Callable, Optional
+import pandas as pd
+import threading
+import logging
+import time
+
+
+# Called for every completed bar: (symbol, bar start in ns since epoch (UTC), (open, high, low, close, volume))
+BarListener = Callable[[str, int, tuple[float, float, float, float, float]], None]
+
+
+class BarBuilder:
+    """Aggregates streamed ticks into fixed interval OHLCV bars.
+
+    Bars are labelled with the start of their interval, like the bars returned
+    by the REST APIs, and aligned to the anchor, usually the session open, so
+    intervals that do not divide an hour line up with the REST bars. A bar is completed either by the first tick of a later
+    interval or by the close clock, a background thread that closes all open
+    bars shortly after each interval boundary so bars are emitted even when a
+    symbol does not trade. Waiters of wait_for_close are woken once all bars of
+    an interval have been emitted.
+
+    The first bar of every symbol only holds the ticks received after the
+    stream started. It is passed to on_first_bar, to be merged with the partial
+    bar loaded from the REST API, or dropped without it.
+
+    :param interval: Bar length, e.g. pd.Timedelta("5min").
+    :param on_bar: Called with every completed bar.
+    :param close_delay: Seconds to wait after an interval boundary for late ticks before closing the bars.
+    :param anchor: A bar start in ns since epoch (UTC), e.g. the session open. Default the UTC epoch.
+    :param on_first_bar: Called with the completed first bar of every symbol.
+    """
+
+    def __init__(self, 
+                 interval: pd.Timedelta, 
+                 on_bar: BarListener, 
+                 close_delay: float = 0.25,
+                 anchor: int = 0,
+                 on_first_bar: Optional[BarListener] = None) -> None:
+        self.interval = int(pd.Timedelta(interval).value)
+        if self.interval <= 0:
+            raise ValueError("Bar interval must be positive")
+
+        self.on_bar = on_bar
+        self.on_first_bar = on_first_bar
+        self.anchor = anchor
+        self.close_delay = close_delay
+        self._open_bars: dict[str, list] = {}     # symbol -> [bar start, open, high, low, close, volume, close time]
+        self._last_prices: dict[str, float] = {}
+        self._started: set[str] = set()
+        self._partial: set[str] = set()
+        self._last_close = 0                      # start of the next bar after the latest closed interval
+        self._lock = threading.Lock()
+        self._closed = threading.Condition(self._lock)
+        self._stop = threading.Event()
+        self._clock: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        """Starts the close clock"""
+        self._stop.clear()
+        self._clock = threading.Thread(target=self._run_clock, daemon=True, name="bar-close-clock")
+        self._clock.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def on_tick(self, symbol: str, timestamp: int, price: float, volume: float = 0.0) -> None:
+        """Adds a trade or price update, see AbstractPriceStream.add_listener"""
+        bar_start = self._bar_start(timestamp)
+        completed = None
+
+        with self._lock:
+            bar = self._open_bars.get(symbol)
+            if bar_start < (bar[0] if bar is not None else self._last_close):
+                logging.debug(f"BarBuilder: dropping late tick for {symbol} at {pd.Timestamp(timestamp, tz='UTC')}")
+                return None
+
+            self._last_prices[symbol] = price
+            if bar is None:
+                if symbol not in self._started:
+                    self._started.add(symbol)
+                    self._partial.add(symbol)
+                self._open_bars[symbol] = [bar_start, price, price, price, price, volume, timestamp]
+                return None
+
+            if bar_start > bar[0]:
+                completed = self._pop_bar(symbol)
+                self._open_bars[symbol] = [bar_start, price, price, price, price, volume, timestamp]
+            else:
+                bar[2] = max(bar[2], price)
+                bar[3] = min(bar[3], price)
+                bar[5] += volume
+                if timestamp >= bar[6]:
+                    # Ticks can arrive slightly out of order, the close is the latest tick
+                    bar[4] = price
+                    bar[6] = timestamp
+
+        if completed is not None:
+            self._emit(*completed)
+
+    def close_bars(self, until: int) -> int:
+        """
+        Completes all open bars that end at or before the given time and wakes the waiters.
+
+        :param until: Nanoseconds since epoch (UTC), usually an interval boundary.
+        :return: Number of bars emitted.
+        """
+        with self._lock:
+            completed = [
+                self._pop_bar(symbol) for symbol, bar in list(self._open_bars.items()) if bar[0] + self.interval <= until
+            ]
+        completed = [bar for bar in completed if bar is not None]
+
+        for bar in completed:
+            self._emit(*bar)
+
+        with self._closed:
+            self._last_close = max(self._last_close, until)
+            self._closed.notify_all()
+        return len(completed)
+
+    def wait_for_close(self, until: Optional[int] = None, timeout: Optional[float] = None) -> bool:
+        """
+        Blocks until all bars ending at or before `until` have been closed.
+
+        :param until: Nanoseconds since epoch (UTC). By default waits for the next close.
+        :return: False if the timeout expired first.
+        """
+        with self._closed:
+            target = until if until is not None else self._last_close + 1
+            return self._closed.wait_for(lambda: self._last_close >= target, timeout)
+
+    def last_price(self, symbol: str) -> Optional[float]:
+        """Price of the latest tick received for the symbol"""
+        with self._lock:
+            return self._last_prices.get(symbol)
+
+    def _bar_start(self, timestamp: int) -> int:
+        return timestamp - (timestamp - self.anchor) % self.interval
+
+    def _pop_bar(self, symbol: str) -> Optional[tuple[BarListener, str, int, tuple]]:
+        """Removes the open bar of the symbol and returns it with its listener. Must be called with the lock held."""
+        bar_start, open_, high, low, close, volume, _ = self._open_bars.pop(symbol)
+        listener = self.on_bar
+        if symbol in self._partial:
+            self._partial.discard(symbol)
+            if self.on_first_bar is None:
+                logging.debug(f"BarBuilder: dropping partial first bar of {symbol}")
+                return None
+            listener = self.on_first_bar
+        return listener, symbol, bar_start, (open_, high, low, close, volume)
+
+    @staticmethod
+    def _emit(listener: BarListener, symbol: str, bar_start: int, values: tuple) -> None:
+        listener(symbol, bar_start, values)
+
+    def _run_clock(self) -> None:
+        while True:
+            now = time.time_ns()
+            boundary = self._bar_start(now) + self.interval
+            if self._stop.wait((boundary - now) / 1e9 + self.close_delay):
+                return None
+
+            start = time.perf_counter()
+            count = self.close_bars(boundary)
+            logging.debug(f"BarBuilder: closed {count} bars at {pd.Timestamp(boundary, tz='UTC')} in {(time.perf_counter() - start) * 1e3:.1f}ms")
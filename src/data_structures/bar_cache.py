@@ -0,0 +1,191 @@
+import importlib.util
+import json
+import logging
+import os
+import pandas as pd
+from src.readers.abstract_apis import AbstractMarketDataAPI
+from src.utilities.period import Period
+from src.utilities.utils import chunked
+
+
+class BarCache:
+    """On-disk cache of historical bars.
+
+    Bars are stored as one Parquet file per provider, symbol and interval:
+    <cache_dir>/<provider>/<symbol>/<interval>.parquet. A JSON sidecar next to each
+    file records the date range that has been requested from the provider so far,
+    so a later request only fetches the leading and trailing ranges that are not
+    covered yet. Requires pyarrow.
+    """
+
+    def __init__(self, cache_dir: str) -> None:
+        if importlib.util.find_spec("pyarrow") is None:
+            raise ImportError("The bar cache requires pyarrow. Install it or remove bar_cache_dir from the config.")
+
+        self.cache_dir = cache_dir
+
+    def get_historical_prices(self,
+                              api: AbstractMarketDataAPI,
+                              provider: str,
+                              symbol: str,
+                              interval: Period,
+                              start_date: pd.Timestamp,
+                              end_date: pd.Timestamp,
+                              timezone=None) -> pd.DataFrame:
+        """
+        Serve a historical prices request from disk, fetching only the ranges
+        missing from the cache from the provider.
+        """
+        return self.get_historical_prices_batch(api, provider, [symbol], interval, start_date, end_date, timezone)[symbol]
+
+    def get_historical_prices_batch(self,
+                                    api: AbstractMarketDataAPI,
+                                    provider: str,
+                                    symbols: list[str],
+                                    interval: Period,
+                                    start_date: pd.Timestamp,
+                                    end_date: pd.Timestamp,
+                                    timezone=None) -> dict[str, pd.DataFrame]:
+        """
+        Serve historical prices for several symbols from disk. Symbols missing the
+        same date range are fetched together with the provider's batch request.
+        """
+        symbols_by_range: dict[tuple[pd.Timestamp, pd.Timestamp], list[str]] = {}
+        for symbol in symbols:
+            for missing_range in self.missing_ranges(provider, symbol, interval, start_date, end_date, timezone):
+                symbols_by_range.setdefault(missing_range, []).append(symbol)
+
+        for (range_start, range_end), range_symbols in symbols_by_range.items():
+            for chunk in chunked(range_symbols, api.max_batch_size):
+                logging.debug(f"BarCache: fetching {chunk} {interval} from {provider} between {range_start} and {range_end}")
+                data = api.get_historical_prices_batch(
+                    chunk,
+                    interval,
+                    start_date=range_start,
+                    end_date=range_end,
+                    timezone=timezone
+                    )
+
+                for symbol in chunk:
+                    self.merge(provider, symbol, interval, data.get(symbol), range_start, range_end, timezone)
+
+        return {symbol: self.load(provider, symbol, interval, start_date, end_date, timezone) for symbol in symbols}
+
+    def missing_ranges(self,
+                       provider: str,
+                       symbol: str,
+                       interval: Period,
+                       start_date: pd.Timestamp,
+                       end_date: pd.Timestamp,
+                       timezone=None) -> list[tuple[pd.Timestamp, pd.Timestamp]]:
+        """Returns the leading and trailing ranges of [start_date, end_date] not covered by the cache"""
+        coverage = self._read_coverage(provider, symbol, interval)
+        if coverage is None:
+            return [(start_date, end_date)]
+
+        covered_start, covered_end = coverage
+        ranges = []
+        if self._to_utc(start_date, timezone) < covered_start:
+            ranges.append((start_date, self._from_utc(covered_start, start_date, timezone)))
+        if self._to_utc(end_date, timezone) > covered_end:
+            ranges.append((self._from_utc(covered_end, end_date, timezone), end_date))
+        return ranges
+
+    def load(self,
+             provider: str,
+             symbol: str,
+             interval: Period,
+             start_date: pd.Timestamp = None,
+             end_date: pd.Timestamp = None,
+             timezone=None) -> pd.DataFrame | None:
+        """Reads the cached bars between and including start and end dates, in ascending order"""
+        path = self._path(provider, symbol, interval)
+        if not os.path.exists(path):
+            return None
+
+        data = pd.read_parquet(path)
+        if start_date is not None:
+            data = data[data.index >= self._match_index(start_date, data.index, timezone)]
+        if end_date is not None:
+            data = data[data.index <= self._match_index(end_date, data.index, timezone)]
+        return data
+
+    def merge(self,
+              provider: str,
+              symbol: str,
+              interval: Period,
+              data: pd.DataFrame,
+              start_date: pd.Timestamp,
+              end_date: pd.Timestamp,
+              timezone=None) -> None:
+        """
+        Merges newly fetched bars into the cache and extends the covered range, up to
+        the start of the latest fetched bar
+        """
+        if data is None:
+            logging.warning(f"BarCache: no data returned for {symbol} {interval} from {provider}. Cache not updated.")
+            return None
+        if data.empty:
+            # Providers return empty frames on transient errors, the range is fetched again next time
+            logging.warning(f"BarCache: empty data returned for {symbol} {interval} from {provider}. Cache not updated.")
+            return None
+
+        path = self._path(provider, symbol, interval)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        data = data.rename(columns=str.lower).apply(pd.to_numeric, errors="coerce")
+        # The latest bar may still be forming, it is only covered up to its start so the next request fetches it again
+        last_bar = self._to_utc(data.index.max(), timezone)
+        existing = pd.read_parquet(path) if os.path.exists(path) else None
+        if existing is not None and not existing.empty:
+            data = pd.concat([existing, data], axis=0)
+            data = data[~data.index.duplicated(keep="last")]
+        data = data.sort_index()
+
+        start_utc, end_utc = self._to_utc(start_date, timezone), min(self._to_utc(end_date, timezone), last_bar)
+        coverage = self._read_coverage(provider, symbol, interval)
+        if coverage is not None:
+            start_utc, end_utc = min(start_utc, coverage[0]), max(end_utc, coverage[1])
+
+        tmp_path = path + ".tmp"
+        data.to_parquet(tmp_path)
+        os.replace(tmp_path, path)
+        with open(self._coverage_path(provider, symbol, interval), "w") as file:
+            json.dump({"start": start_utc.isoformat(), "end": end_utc.isoformat()}, file)
+
+    def _path(self, provider: str, symbol: str, interval: Period) -> str:
+        return os.path.join(self.cache_dir, provider, symbol.replace("/", "_"), f"{interval}.parquet")
+
+    def _coverage_path(self, provider: str, symbol: str, interval: Period) -> str:
+        return self._path(provider, symbol, interval) + ".json"
+
+    def _read_coverage(self, provider: str, symbol: str, interval: Period) -> tuple[pd.Timestamp, pd.Timestamp] | None:
+        path = self._coverage_path(provider, symbol, interval)
+        if not os.path.exists(self._path(provider, symbol, interval)) or not os.path.exists(path):
+            return None
+
+        with open(path) as file:
+            coverage = json.load(file)
+        return pd.Timestamp(coverage["start"]), pd.Timestamp(coverage["end"])
+
+    @staticmethod
+    def _to_utc(timestamp: pd.Timestamp, timezone=None) -> pd.Timestamp:
+        timestamp = pd.Timestamp(timestamp)
+        if timestamp.tz is None:
+            timestamp = timestamp.tz_localize(timezone or "UTC")
+        return timestamp.tz_convert("UTC")
+
+    @staticmethod
+    def _from_utc(timestamp: pd.Timestamp, like: pd.Timestamp, timezone=None) -> pd.Timestamp:
+        """Converts a UTC timestamp back to the timezone convention of `like`"""
+        like = pd.Timestamp(like)
+        if like.tz is not None:
+            return timestamp.tz_convert(like.tz)
+        return timestamp.tz_convert(timezone or "UTC").tz_localize(None)
+
+    @staticmethod
+    def _match_index(timestamp: pd.Timestamp, index: pd.DatetimeIndex, timezone=None) -> pd.Timestamp:
+        timestamp = BarCache._to_utc(timestamp, timezone)
+        if index.tz is not None:
+            return timestamp.tz_convert(index.tz)
+        return timestamp.tz_convert(timezone or "UTC").tz_localize(None)
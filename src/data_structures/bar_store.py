@@ -0,0 +1,282 @@
+import numpy as np
+import pandas as pd
+from typing import Optional
+
+
+BAR_FIELDS = ("open", "high", "low", "close", "volume")
+
+
+class BarStore:
+    """Append-only columnar store of OHLCV bars for a single ticker.
+
+    Bars are kept in ascending timestamp order in preallocated NumPy columns
+    (float64 for OHLCV, int64 nanoseconds since epoch for the timestamps).
+    The buffers are twice the configured capacity: new bars are written at the
+    tail and, once the tail is reached, the live window is moved back to the
+    start of the buffer. Appending is therefore amortized O(1) and the live
+    window is always a contiguous slice. When more than `capacity` bars are
+    stored the oldest ones are dropped.
+
+    Bars with a timestamp that is already stored overwrite the existing bar,
+    so overlapping API responses do not create duplicates.
+
+    :param buffers: Optional preallocated (timestamps, columns) buffers of length
+        2 * capacity, used by BarStoreGroup to share 2-D storage between tickers.
+    """
+
+    def __init__(self, 
+                 capacity: int = 10000, 
+                 timezone=None, 
+                 buffers: Optional[tuple[np.ndarray, dict[str, np.ndarray]]] = None) -> None:
+        if capacity <= 0:
+            raise ValueError("Bar store capacity must be positive")
+
+        self._capacity = capacity
+        if buffers is not None:
+            self._timestamps, self._columns = buffers
+        else:
+            self._timestamps = np.empty(2 * capacity, dtype=np.int64)
+            self._columns = {field: np.empty(2 * capacity, dtype=np.float64) for field in BAR_FIELDS}
+        self._start = 0
+        self._end = 0
+        self.timezone = timezone
+
+    @property
+    def capacity(self) -> int:
+        return self._capacity
+
+    @property
+    def empty(self) -> bool:
+        return self._end == self._start
+
+    @property
+    def timestamps(self) -> np.ndarray:
+        """Stored timestamps as int64 nanoseconds since epoch (UTC), ascending."""
+        return self._timestamps[self._start:self._end]
+
+    @property
+    def latest_timestamp(self) -> Optional[pd.Timestamp]:
+        if self.empty:
+            return None
+
+        return self.timestamp_at(-1)
+
+    def __len__(self) -> int:
+        return self._end - self._start
+
+    def column(self, field: str) -> np.ndarray:
+        """Stored values of one OHLCV field, aligned with `timestamps`."""
+        return self._columns[field][self._start:self._end]
+
+    def window(self, field: str, n: int) -> np.ndarray:
+        """
+        Read-only view of the latest n values of a field, oldest first. No data is copied, 
+        the view is only valid until the next append.
+        """
+        view = self.column(field)[max(len(self) - n, 0):]
+        view.flags.writeable = False
+        return view
+
+    def append(self, timestamp: int, values: tuple[float, float, float, float, float]) -> None:
+        """
+        Append a single bar.
+
+        :param timestamp: Bar timestamp in nanoseconds since epoch (UTC).
+        :param values: (open, high, low, close, volume).
+        """
+        if not self.empty and timestamp <= self._timestamps[self._end - 1]:
+            position = self._find(timestamp)
+            if position is not None:
+                self._write(position, timestamp, values)
+            else:
+                self._insert(timestamp, values)
+            return None
+
+        if self._end == len(self._timestamps):
+            self._compact()
+
+        self._write(self._end, timestamp, values)
+        self._end += 1
+        if self._end - self._start > self._capacity:
+            self._start += 1
+
+    def append_frame(self, data: pd.DataFrame) -> None:
+        """
+        Append all bars of an OHLCV DataFrame indexed by timestamp. Column names
+        are matched case insensitively and the rows may be in any order.
+        """
+        if data is None or data.empty:
+            return None
+
+        index = pd.DatetimeIndex(data.index)
+        if self.timezone is None and index.tz is not None:
+            self.timezone = index.tz
+
+        if index.tz is not None:
+            index = index.tz_convert("UTC")
+        timestamps = index.as_unit("ns").asi8
+
+        columns = {str(column).lower(): column for column in data.columns}
+        values = np.full((len(BAR_FIELDS), len(data)), np.nan, dtype=np.float64)
+        for row, field in enumerate(BAR_FIELDS):
+            if field in columns:
+                values[row] = pd.to_numeric(data[columns[field]], errors="coerce").to_numpy(dtype=np.float64)
+
+        order = np.argsort(timestamps, kind="stable")
+        timestamps = timestamps[order]
+        values = values[:, order]
+
+        # Fast path: the whole block is newer than anything stored
+        if self.empty or timestamps[0] > self._timestamps[self._end - 1]:
+            unique = np.r_[timestamps[1:] != timestamps[:-1], True]
+            self._extend(timestamps[unique], values[:, unique])
+        else:
+            for i in range(len(timestamps)):
+                self.append(int(timestamps[i]), tuple(values[:, i]))
+
+    def locate(self, timestamp: pd.Timestamp) -> Optional[int]:
+        """Position of the bar with exactly the given timestamp, None if not stored. O(log n)."""
+        position = self._find(self._to_ns(timestamp))
+        return position - self._start if position is not None else None
+
+    def asof(self, timestamp: pd.Timestamp) -> Optional[int]:
+        """Position of the latest bar at or before the given timestamp, None if all bars are later. O(log n)."""
+        position = int(np.searchsorted(self.timestamps, self._to_ns(timestamp), side="right")) - 1
+        return position if position >= 0 else None
+
+    def between(self, start: pd.Timestamp, end: pd.Timestamp) -> slice:
+        """Positions of the bars between start and end, both included. O(log n)."""
+        timestamps = self.timestamps
+        return slice(int(np.searchsorted(timestamps, self._to_ns(start), side="left")),
+                     int(np.searchsorted(timestamps, self._to_ns(end), side="right")))
+
+    def bar(self, position: int) -> dict[str, float]:
+        """OHLCV values of the bar at a position. Negative positions count from the latest bar."""
+        if not -len(self) <= position < len(self):
+            raise IndexError(f"Bar position {position} out of range for {len(self)} bars")
+        position = position + self._end if position < 0 else position + self._start
+        return {field: float(self._columns[field][position]) for field in BAR_FIELDS}
+
+    def timestamp_at(self, position: int) -> pd.Timestamp:
+        timestamp = pd.Timestamp(int(self.timestamps[position]))
+        return timestamp.tz_localize("UTC").tz_convert(self.timezone) if self.timezone is not None else timestamp
+
+    def to_dataframe(self, rows: slice = slice(None)) -> pd.DataFrame:
+        """Return the stored bars, or the given positions, as an ascending OHLCV DataFrame."""
+        index = pd.DatetimeIndex(self.timestamps[rows].copy(), name="datetime")
+        if self.timezone is not None:
+            index = index.tz_localize("UTC").tz_convert(self.timezone)
+
+        return pd.DataFrame({field: self.column(field)[rows].copy() for field in BAR_FIELDS}, index=index)
+
+    def _to_ns(self, timestamp: pd.Timestamp) -> int:
+        """Converts a query timestamp to the stored representation"""
+        timestamp = pd.Timestamp(timestamp)
+        if self.timezone is None:
+            # Naive stores hold local time, compare wall clock times
+            return timestamp.tz_localize(None).value if timestamp.tz is not None else timestamp.value
+        if timestamp.tz is None:
+            timestamp = timestamp.tz_localize(self.timezone)
+        return timestamp.value
+
+    def _write(self, position: int, timestamp: int, values: tuple) -> None:
+        self._timestamps[position] = timestamp
+        for field, value in zip(BAR_FIELDS, values):
+            self._columns[field][position] = value
+
+    def _extend(self, timestamps: np.ndarray, values: np.ndarray) -> None:
+        """Block append of bars that are strictly newer than the stored ones."""
+        if len(timestamps) > self._capacity:
+            timestamps = timestamps[-self._capacity:]
+            values = values[:, -self._capacity:]
+
+        count = len(timestamps)
+        if self._end + count > len(self._timestamps):
+            self._compact()
+
+        self._timestamps[self._end:self._end + count] = timestamps
+        for row, field in enumerate(BAR_FIELDS):
+            self._columns[field][self._end:self._end + count] = values[row]
+        self._end += count
+        self._start = max(self._start, self._end - self._capacity)
+
+    def _compact(self) -> None:
+        """Move the live window back to the start of the buffers."""
+        size = len(self)
+        self._timestamps[:size] = self._timestamps[self._start:self._end]
+        for column in self._columns.values():
+            column[:size] = column[self._start:self._end]
+        self._start = 0
+        self._end = size
+
+    def _find(self, timestamp: int) -> Optional[int]:
+        position = self._start + int(np.searchsorted(self.timestamps, timestamp))
+        if position < self._end and self._timestamps[position] == timestamp:
+            return position
+        return None
+
+    def _insert(self, timestamp: int, values: tuple) -> None:
+        """Insert an out of order bar. O(n), only needed for late corrections."""
+        offset = int(np.searchsorted(self.timestamps, timestamp))
+        timestamps = np.insert(self.timestamps, offset, timestamp)
+        columns = {field: np.insert(self.column(field), offset, value) for field, value in zip(BAR_FIELDS, values)}
+
+        if len(timestamps) > self._capacity:
+            timestamps = timestamps[1:]
+            columns = {field: column[1:] for field, column in columns.items()}
+
+        size = len(timestamps)
+        self._timestamps[:size] = timestamps
+        for field, column in columns.items():
+            self._columns[field][:size] = column
+        self._start = 0
+        self._end = size
+
+
+class BarStoreGroup:
+    """BarStores of several tickers backed by shared tickers x time buffers.
+
+    Every ticker owns one row of a 2-D array per field. As long as the tickers
+    receive the same bars, their live windows sit at the same positions and a
+    block of consecutive tickers can be read as a single 2-D view without
+    copying, see panel.
+    """
+
+    def __init__(self, tickers: list[str], capacity: int = 10000, timezone=None) -> None:
+        self.tickers = list(tickers)
+        self._rows = {ticker: row for row, ticker in enumerate(self.tickers)}
+        self._timestamps = np.empty((len(self.tickers), 2 * capacity), dtype=np.int64)
+        self._columns = {field: np.empty((len(self.tickers), 2 * capacity), dtype=np.float64) for field in BAR_FIELDS}
+        self.stores = {
+            ticker: BarStore(
+                capacity, 
+                timezone, 
+                buffers=(self._timestamps[row], {field: column[row] for field, column in self._columns.items()})
+                )
+            for ticker, row in self._rows.items()
+        }
+
+    def panel(self, tickers: list[str], field: str, n: int) -> Optional[np.ndarray]:
+        """
+        Read-only tickers x time view of the latest n values of a field, without copying.
+
+        :return: None when the tickers are not consecutive rows of the group, in group order,
+            or when their latest n bars do not share the same positions and timestamps.
+        """
+        rows = [self._rows.get(ticker) for ticker in tickers]
+        if not rows or None in rows or rows != list(range(rows[0], rows[0] + len(rows))):
+            return None
+
+        stores = [self.stores[ticker] for ticker in tickers]
+        end = stores[0]._end
+        start = end - min(n, min(len(store) for store in stores))
+        if any(store._end != end for store in stores):
+            return None
+
+        timestamps = self._timestamps[rows[0]:rows[-1] + 1, start:end]
+        if not (timestamps == timestamps[0]).all():
+            return None
+
+        view = self._columns[field][rows[0]:rows[-1] + 1, start:end]
+        view.flags.writeable = False
+        return view
@@ -1,10 +1,22 @@
 import pandas as pd
 from src.readers.abstract_apis import AbstractMarketDataAPI
+from src.data_structures.bar_store import BarStore, BarStoreGroup
+import numpy as np
+from src.data_structures.bar_cache import BarCache
+from src.data_structures.bar_builder import BarBuilder
+from src.readers.abstract_streams import AbstractPriceStream
+from src.data_structures.news_store import NewsStore
+from src.utilities.fetch_engine import FetchEngine, FetchResult
+from src.utilities.rate_limiter import RateLimiterRegistry
 from src.execution.configuration import Configuration
-from src.utilities.utils import calc_intraday_time_points, timezone_from_calendar, shift_date_by_period
+from src.utilities.utils import calc_intraday_time_points, timezone_from_calendar, shift_date_by_period, chunked
 import time
 import logging
 import pytz
+import threading
+import asyncio
+from functools import partial
+from typing import Callable
 
 
 class MarketDataState:
@@ -14,12 +26,25 @@ class MarketDataState:
 
         Main responsibility: API management.
 
-        Notes: The MarketDataService layer controls the logic
+        Notes: The MarketDataService layer controls the logic. Bars are kept per API and ticker
+        in append-only BarStores, see get_dataframe for a DataFrame view.
     """
 
-    def __init__(self):
+    def __init__(self, 
+                 bar_store_capacity: int = 10000, 
+                 bar_cache: BarCache | None = None,
+                 fetch_engine: FetchEngine | None = None):
         self._apis: dict[str, AbstractMarketDataAPI] = {}
-        self._market_data = {}
+        self._market_data: dict[str, dict[str, BarStore]] = {}
+        self._groups: dict[str, BarStoreGroup] = {}
+        self._news: dict[str, NewsStore] = {}
+        self.bar_store_capacity = bar_store_capacity
+        self.bar_cache = bar_cache
+        self.fetch_engine = fetch_engine if fetch_engine is not None else FetchEngine()
+        self._price_stream: AbstractPriceStream | None = None
+        self._bar_builder: BarBuilder | None = None
+        # Streamed bars are appended from the stream threads
+        self._lock = threading.RLock()
 
     @property
     def apis(self) -> None:
@@ -37,35 +62,186 @@ class MarketDataState:
     def market_data(self, other) -> None:
         self._market_data = other
 
+    @property
+    def lock(self) -> threading.RLock:
+        """Held while bar stores are modified, hold it to read a store consistently"""
+        return self._lock
+
     def add_apis(self, apis: dict[str, AbstractMarketDataAPI]) -> None:
         for api_name, api_fun in apis.items():
             self.apis[api_name] = api_fun
 
+    def get_bar_store(self, api_name: str, ticker: str) -> BarStore | None:
+        return self._market_data.get(api_name, {}).get(ticker, None)
+
+    def get_dataframe(self, api_name: str, ticker: str) -> pd.DataFrame | None:
+        """Returns the stored bars for a ticker as an ascending DataFrame"""
+        with self._lock:
+            store = self.get_bar_store(api_name, ticker)
+            if store is None:
+                return None
+            return store.to_dataframe()
+
+    def get_panel(self, api_name: str, tickers: list[str], field: str, n: int) -> np.ndarray | None:
+        """Zero-copy tickers x time view when the tickers share aligned storage, see BarStoreGroup.panel"""
+        group = self._groups.get(api_name)
+        return group.panel(tickers, field, n) if group is not None else None
+
+    def _new_bar_store(self, data: pd.DataFrame) -> BarStore:
+        store = BarStore(self.bar_store_capacity)
+        store.append_frame(data)
+        return store
+
+    def _new_bar_store_group(self, api_name: str, data: dict[str, pd.DataFrame]) -> dict[str, BarStore]:
+        """Stores for the initial population of an API, in shared storage so panels can be read without copying"""
+        group = BarStoreGroup(list(data.keys()), self.bar_store_capacity)
+        for ticker, frame in data.items():
+            group.stores[ticker].append_frame(frame)
+        self._groups[api_name] = group
+        return dict(group.stores)
+
+    def get_news_store(self, api_name: str) -> NewsStore | None:
+        return self._news.get(api_name)
+
+    def populate_news(self, api_name: str, tickers: list[str], since: pd.Timestamp) -> None:
+        """
+        Fetches the news of the tickers into the in-memory news store of the API. Only the articles
+        published since the previous call are requested, articles older than since are dropped.
+        """
+        if api_name not in self._news:
+            self._news[api_name] = NewsStore(self.apis[api_name], self.fetch_engine)
+        self._news[api_name].refresh(tickers, since)
+
+    def attach_price_stream(self, api_name: str, stream: AbstractPriceStream, tickers: list[str], cfg: Configuration) -> None:
+        """
+        Builds intraday bars locally from a streaming price feed instead of polling the REST API.
+        Completed bars are appended to the bar stores of api_name and populate_state returns
+        as soon as a bar has closed. Bars are aligned to the session open like the REST bars, and
+        the first streamed bar of a ticker completes the partial bar loaded from the REST API.
+        """
+        timezone = timezone_from_calendar(cfg.market)
+        now = pd.Timestamp.now(tz=timezone)
+        session_open = pd.Timestamp(now.year, now.month, now.day, 9, 30, tz=timezone)
+        self._bar_builder = BarBuilder(
+            pd.Timedelta(str(cfg.intraday_interval)),
+            partial(self._append_streamed_bar, api_name, timezone),
+            cfg.stream_close_delay,
+            session_open.value,
+            partial(self._merge_streamed_bar, api_name, timezone)
+            )
+        self._price_stream = stream
+        stream.add_listener(self._bar_builder.on_tick)
+        stream.subscribe(tickers)
+        stream.start()
+        self._bar_builder.start()
+        logging.info(f"MarketDataState: streaming {cfg.intraday_interval} bars for {len(tickers)} tickers into {api_name}")
+
+    def detach_price_stream(self) -> None:
+        if self._price_stream is not None:
+            self._price_stream.stop()
+            self._bar_builder.stop()
+        self._price_stream = None
+        self._bar_builder = None
+
+    def get_streamed_prices(self, tickers: list[str]) -> dict[str, float]:
+        """Latest streamed prices. Tickers without a tick yet, or without a stream, are left out."""
+        if self._bar_builder is None:
+            return {}
+        prices = {ticker: self._bar_builder.last_price(ticker) for ticker in tickers}
+        return {ticker: price for ticker, price in prices.items() if price is not None}
+
+    def _append_streamed_bar(self, 
+                             api_name: str, 
+                             timezone: str, 
+                             ticker: str, 
+                             timestamp: int, 
+                             values: tuple[float, float, float, float, float]) -> None:
+        with self._lock:
+            store = self.get_bar_store(api_name, ticker)
+            if store is None:
+                store = self._market_data.setdefault(api_name, {})[ticker] = BarStore(self.bar_store_capacity, timezone)
+
+            if store.timezone is None:
+                # Stores built from naive provider data hold exchange local time
+                timestamp = pd.Timestamp(timestamp, tz="UTC").tz_convert(timezone).tz_localize(None).value
+            store.append(timestamp, values)
+
+    def _merge_streamed_bar(self, 
+                            api_name: str, 
+                            timezone: str, 
+                            ticker: str, 
+                            timestamp: int, 
+                            values: tuple[float, float, float, float, float]) -> None:
+        """
+        Merges the first streamed bar of a ticker, which misses the ticks before the stream started, into the
+        bar loaded from the REST API. Dropped when the REST data does not hold that bar.
+        """
+        with self._lock:
+            store = self.get_bar_store(api_name, ticker)
+            position = store.locate(self._stored_timestamp(store, timezone, timestamp)) if store is not None else None
+            if position is None:
+                logging.debug(f"MarketDataState: dropping partial first streamed bar of {ticker}")
+                return None
+
+            stored = store.bar(position)
+            open_, high, low, close, volume = values
+            # Ticks between the stream start and the REST backfill are in both volumes
+            merged = (stored["open"], max(stored["high"], high), min(stored["low"], low), close, stored["volume"] + volume)
+            self._append_streamed_bar(api_name, timezone, ticker, timestamp, merged)
+
+    @staticmethod
+    def _stored_timestamp(store: BarStore, timezone: str, timestamp: int) -> pd.Timestamp:
+        """Query timestamp of a UTC bar start for the store, see BarStore.locate"""
+        timestamp = pd.Timestamp(timestamp, tz="UTC")
+        return timestamp.tz_convert(timezone) if store.timezone is None else timestamp
+
     def populate_historical_data(self, tickers: list[str], cfg: Configuration) -> None:
-        for api_name, api in self.apis.items(): 
-            current_api_mkdata = {}
-            for ticker in tickers:
+        if cfg.market_data_api not in ("twelve_data", "alpha_vantage"):
+            raise ValueError("Market data API not recognized")
 
-                if cfg.market_data_api == "twelve_data":
-                    current_api_mkdata[ticker] = api.get_historical_prices(
-                        symbol=ticker,
-                        interval=cfg.historical_data_frequency,
-                        start_date= shift_date_by_period(cfg.historical_data_horizon, pd.Timestamp.today(), "-"),
-                        end_date=pd.Timestamp.today(),
-                        timezone=timezone_from_calendar(cfg.market)
-                        )
-                elif cfg.market_data_api == "alpha_vantage":
-                    current_api_mkdata[ticker] = api.get_historical_prices(
-                        symbol=ticker,
-                        interval=cfg.historical_data_frequency,
-                        start_date= shift_date_by_period(cfg.historical_data_horizon, pd.Timestamp.today(), "-"),
-                        end_date=pd.Timestamp.today(),
-                        timezone=timezone_from_calendar(cfg.market)
-                        )
-                else:
-                    raise ValueError("Market data API not recognized")
-            
-            self._market_data[api_name] = current_api_mkdata
+        for api_name, api in self.apis.items():
+            self._populate_historical_data_for_api(api_name, api, tickers, cfg)
+
+    def _populate_historical_data_for_api(self, 
+                                          api_name: str, 
+                                          api: AbstractMarketDataAPI, 
+                                          tickers: list[str], 
+                                          cfg: Configuration) -> None:
+        """Loads the history of one API, through the bar cache when configured, in batch requests"""
+        timezone = timezone_from_calendar(cfg.market)
+        end_date = pd.Timestamp.today()
+        start_date = shift_date_by_period(cfg.historical_data_horizon, end_date, "-")
+
+        tasks = {}
+        for chunk in chunked(tickers, api.max_batch_size):
+
+            if self.bar_cache is not None:
+                tasks[",".join(chunk)] = partial(
+                    self.bar_cache.get_historical_prices_batch,
+                    api,
+                    api_name,
+                    chunk,
+                    cfg.historical_data_frequency,
+                    start_date,
+                    end_date,
+                    timezone
+                    )
+            else:
+                tasks[",".join(chunk)] = partial(
+                    api.get_historical_prices_batch,
+                    chunk,
+                    interval=cfg.historical_data_frequency,
+                    start_date=start_date,
+                    end_date=end_date,
+                    timezone=timezone
+                    )
+
+        spread = self._spread_for_rate_limit(api_name, len(tasks), len(tickers))
+        fetched = self._merge_batches(self.fetch_engine.run(tasks, f"{api_name} historical data", spread))
+        with self._lock:
+            self._market_data[api_name] = self._new_bar_store_group(
+                api_name, {ticker: fetched[ticker] for ticker in tickers if fetched.get(ticker) is not None}
+                )
 
     def populate_intraday_data(self, tickers: list[str], cfg: Configuration) -> None:
         timezone=timezone_from_calendar(cfg.market)
@@ -77,34 +253,102 @@ class MarketDataState:
         """
         Appends the latest intraday candles to the existing state. Adds datapoints
         between the last existing timestamp in the state and the current time.
+        Called by the BarScheduler after each bar close, see wait_for_next_bar otherwise.
         """
         logging.info(f"Populating market data state")
 
-        #Get existing tickers in state
-        tickers = []
-        for api_mapping in self._market_data.values():
-            for ticker in api_mapping.keys():
-                tickers.append(ticker)
-        
-        # assumes all data has the same last timestamp
-        latest_timestamp = self._market_data.get(list(self._market_data.keys())[0]).get(tickers[0]).index[0]
+        now = pd.Timestamp.now(tz=timezone_from_calendar(cfg.market))
+        if self._bar_builder is not None:
+            # Bars are appended by the stream, make sure the bar that just ended has been closed
+            interval = pd.Timedelta(str(cfg.intraday_interval))
+            if not self._bar_builder.wait_for_close(now.floor(interval).value, interval.total_seconds()):
+                logging.warning(f"MarketDataState: price stream did not close the bar ending at {now.floor(interval)}")
+            logging.debug("Market data state updated from price stream")
+            return None
+
+        tickers = self._state_tickers()
+        latest_timestamp = self._latest_timestamp()
+        self._populate_intraday_between_dates(tickers, cfg, latest_timestamp, now)
+        logging.debug("Market data state updated")
+
+    def wait_for_next_bar(self, cfg: Configuration) -> None:
+        """Sleeps until one intraday interval has passed since the last timestamp in the state"""
+        latest_timestamp = self._latest_timestamp()
 
         now = pd.Timestamp.now(tz=timezone_from_calendar(cfg.market))
-        time_elapsed = (now - latest_timestamp).seconds
-        time_step = pd.Timedelta(str(cfg.intraday_interval)).seconds
+        time_elapsed = (now - latest_timestamp).total_seconds()
+        time_step = pd.Timedelta(str(cfg.intraday_interval)).total_seconds()
 
         if time_elapsed < time_step:
-            time_to_sleep = time_step - time_elapsed
+            time_to_sleep = time_step - max(time_elapsed, 0.0)
             message = f"MarketDataState: Current timestamp: {now}."
             message += f" Last market data timestamp: {latest_timestamp}."
-            message += f" Going to sleep for: {time_to_sleep} seconds"
+            message += f" Going to sleep for: {time_to_sleep:.1f} seconds"
             logging.warning(message)
             time.sleep(time_to_sleep)
 
+    async def populate_historical_data_async(self, tickers: list[str], cfg: Configuration) -> None:
+        """
+        Asynchronous version of populate_historical_data. The APIs are loaded concurrently, each
+        through the bar cache and in batch requests like populate_historical_data, so a slow
+        provider does not hold up the others.
+        """
+        if cfg.market_data_api not in ("twelve_data", "alpha_vantage"):
+            raise ValueError("Market data API not recognized")
+
+        await self._gather({
+            api_name: partial(self._populate_historical_data_for_api, api_name, api, tickers, cfg)
+            for api_name, api in self.apis.items()
+        }, "historical data")
+
+    async def populate_state_async(self, cfg: Configuration) -> None:
+        """
+        Asynchronous version of populate_state. The latest intraday candles of all providers are requested
+        concurrently, each through the cached batch requests of populate_state, so the refresh takes about
+        as long as the slowest provider.
+        """
+        logging.info(f"Populating market data state asynchronously")
+
         now = pd.Timestamp.now(tz=timezone_from_calendar(cfg.market))
-        self._populate_intraday_between_dates(tickers, cfg, latest_timestamp, now)
+        tickers = self._state_tickers()
+        start_date = self._latest_timestamp()
+        points_for_time_series = calc_intraday_time_points(str(cfg.intraday_interval), start_date, now)
+
+        if points_for_time_series <= 0:
+            logging.warning(f"Trying to populate market state with start date > end date. {start_date} > {now}")
+            return None
+
+        await self._gather({
+            api_name: partial(self._populate_intraday_for_api, api_name, api, tickers, cfg, points_for_time_series)
+            for api_name, api in self.apis.items()
+        }, "intraday data")
         logging.debug("Market data state updated")
 
+    @staticmethod
+    async def _gather(tasks: dict[str, Callable[[], None]], description: str) -> None:
+        """Runs the blocking task of every API in the default executor and awaits them concurrently"""
+        start = time.perf_counter()
+        loop = asyncio.get_running_loop()
+        responses = await asyncio.gather(*(loop.run_in_executor(None, task) for task in tasks.values()), return_exceptions=True)
+
+        for api_name, response in zip(tasks.keys(), responses):
+            if isinstance(response, Exception):
+                logging.error(f"MarketDataState: {api_name} {description} failed: {response}")
+        logging.info(f"MarketDataState: {description} of {len(tasks)} APIs took {time.perf_counter() - start:.2f}s")
+
+    def _state_tickers(self) -> list[str]:
+        """Existing tickers in state"""
+        tickers = []
+        for api_mapping in self._market_data.values():
+            for ticker in api_mapping.keys():
+                if ticker not in tickers:
+                    tickers.append(ticker)
+        return tickers
+
+    def _latest_timestamp(self) -> pd.Timestamp:
+        # assumes all data has the same last timestamp
+        return self._market_data.get(list(self._market_data.keys())[0]).get(self._state_tickers()[0]).latest_timestamp
+
     def _populate_intraday_between_dates(self, 
                                           tickers: list[str], 
                                           cfg: Configuration,
@@ -123,46 +367,56 @@ class MarketDataState:
             return None
 
         for api_name, api in self.apis.items():
+            self._populate_intraday_for_api(api_name, api, tickers, cfg, points_for_time_series)
+
+    def _populate_intraday_for_api(self, 
+                                   api_name: str, 
+                                   api: AbstractMarketDataAPI, 
+                                   tickers: list[str], 
+                                   cfg: Configuration,
+                                   points_for_time_series: int) -> None:
+        """Appends the latest intraday candles of one API, in batch requests"""
+        tasks = {
+            ",".join(chunk): partial(
+                api.get_intraday_prices_batch,
+                chunk,
+                cfg.intraday_interval,
+                points_for_time_series,
+                timezone=timezone_from_calendar(cfg.market)
+                )
+            for chunk in chunked(tickers, api.max_batch_size)
+        }
+        spread = self._spread_for_rate_limit(api_name, len(tasks), len(tickers))
+        fetched = self._merge_batches(self.fetch_engine.run(tasks, f"{api_name} intraday data", spread))
+
+        with self._lock:
+            current_api_mkdata = self._market_data.setdefault(api_name, {})
+            for ticker in tickers:
+                new_data = fetched.get(ticker)
+                if new_data is None:
+                    continue
 
-            if api_name in self._market_data:
-
-                current_api_mkdata = {}
-                for ticker in tickers:
-
-                    if ticker in self._market_data[api_name]:
-                        current_data = self._market_data[api_name][ticker]
-                        
-                        new_data = api.get_intraday_prices(
-                            ticker, 
-                            cfg.intraday_interval,
-                            points_for_time_series,
-                            timezone=timezone_from_calendar(cfg.market)
-                            )
-
-                        current_api_mkdata[ticker] = pd.concat([current_data, new_data], axis=0)
-                        current_api_mkdata[ticker].sort_index(ascending=False, inplace=True)
-
-                    else:
-                        current_api_mkdata[ticker] = api.get_time_series(ticker, cfg)
-
-                self._market_data[api_name] = current_api_mkdata
-
-            else:
-                current_api_mkdata = {}
-                for ticker in tickers:
-
-                    current_api_mkdata[ticker] = api.get_intraday_prices(
-                        ticker,
-                        cfg.intraday_interval,
-                        points_for_time_series,
-                        timezone=timezone_from_calendar(cfg.market)
-                        )
-                
-                self._market_data[api_name] = current_api_mkdata
-
-
-
-
-    
+                if ticker in current_api_mkdata:
+                    current_api_mkdata[ticker].append_frame(new_data)
+                else:
+                    current_api_mkdata[ticker] = self._new_bar_store(new_data)
 
-    
\ No newline at end of file
+    @staticmethod
+    def _spread_for_rate_limit(api_name: str, requests: int, credits: int) -> float:
+        """
+        Seconds over which the requests, together costing the given credits, should be submitted to fit
+        the rate limit budget. The FetchEngine spaces the submissions evenly, so the last request is submitted
+        once the credits of all of them are available. A single request is only queued by the rate limiter.
+        """
+        remaining = RateLimiterRegistry.remaining(api_name)
+        if remaining is None or requests <= 1:
+            return 0.0
+
+        spread = RateLimiterRegistry.wait_time(api_name, credits=credits) * requests / (requests - 1)
+        logging.debug(f"{api_name} has {remaining:.1f} credits left. Spreading {requests} requests of {credits} credits over {spread:.1f}s")
+        return spread
+
+    @staticmethod
+    def _merge_batches(fetched: FetchResult) -> dict[str, pd.DataFrame]:
+        """Flattens the per batch results of a fetch into a single mapping of ticker to data"""
+        return {ticker: data for batch in fetched.results.values() for ticker, data in batch.items()}
@@ -0,0 +1,125 @@
+from src.readers.abstract_apis import AbstractMarketDataAPI
+from src.utilities.fetch_engine import FetchEngine
+from functools import partial
+from typing import Any, Optional
+import pandas as pd
+import logging
+import bisect
+
+
+class NewsStore:
+    """News articles of a market data API, kept in memory and fetched incrementally.
+
+    The first refresh of a ticker fetches its articles since the requested start,
+    later refreshes only ask for articles published since the latest one seen. The
+    tickers are fetched concurrently on the fetch engine. Articles are deduplicated
+    by URL and indexed by publication time under the fetched ticker and every ticker
+    of their ticker_sentiment, so get_news is served from memory.
+
+    Naive publication times are taken to be in the timezone of the refresh start,
+    which is the timezone the provider query is formatted in.
+
+    :param api: Market data API providing get_news.
+    :param fetch_engine: Runs the per ticker requests concurrently.
+    """
+
+    def __init__(self, api: AbstractMarketDataAPI, fetch_engine: FetchEngine | None = None) -> None:
+        self.api = api
+        self.fetch_engine = fetch_engine if fetch_engine is not None else FetchEngine()
+        self.timezone = None
+        self._articles: dict[str, dict[str, Any]] = {}
+        # Per ticker, ascending publication times in ns and the URLs of the articles
+        self._times: dict[str, list[int]] = {}
+        self._urls: dict[str, list[str]] = {}
+        self._latest: dict[str, pd.Timestamp] = {}
+
+    def __len__(self) -> int:
+        return len(self._articles)
+
+    def tracks(self, ticker: str) -> bool:
+        """Whether the ticker's news has been fetched, only then get_news is complete"""
+        return ticker in self._latest
+
+    def refresh(self, tickers: list[str], since: pd.Timestamp) -> int:
+        """
+        Fetches the articles published since the last refresh, or since the given start for new tickers.
+        Articles published before the start are dropped.
+
+        :return: Number of new articles.
+        """
+        since = pd.Timestamp(since)
+        if since.tz is not None:
+            self.timezone = since.tz
+
+        tasks = {ticker: partial(self.api.get_news, ticker, max(self._latest.get(ticker, since), since), None) for ticker in tickers}
+        fetched = self.fetch_engine.run(tasks, "news")
+        for ticker, err in fetched.failures.items():
+            logging.warning(f"NewsStore: failed to fetch the news of {ticker}: {err}")
+
+        added = sum(self._add(ticker, news, since) for ticker, news in fetched.results.items())
+        self._prune(since)
+
+        logging.debug(f"NewsStore: {added} new articles for {len(fetched.results)} tickers, {len(self._articles)} in memory")
+        return added
+
+    def get_news(self, ticker: str, start: Optional[pd.Timestamp] = None, end: Optional[pd.Timestamp] = None) -> pd.DataFrame:
+        """Articles mentioning the ticker published between start and end (inclusive), oldest first"""
+        times = self._times.get(ticker, [])
+        lower = bisect.bisect_left(times, self._to_ns(start)) if start is not None else 0
+        upper = bisect.bisect_right(times, self._to_ns(end)) if end is not None else len(times)
+
+        articles = [self._articles[url] for url in self._urls.get(ticker, [])[lower:upper]]
+        if not articles:
+            return pd.DataFrame(columns=["title", "url", "time_published", "summary"])
+        return pd.DataFrame(articles)
+
+    def _add(self, ticker: str, news: pd.DataFrame, since: pd.Timestamp) -> int:
+        added = 0
+        latest = self._latest.get(ticker, since)
+        if news is not None and not news.empty:
+            for article in news.to_dict("records"):
+                url = article.get("url") or article.get("title")
+                published = self._localize(pd.Timestamp(article["time_published"]))
+                article["time_published"] = published
+                latest = max(latest, published)
+
+                if url not in self._articles:
+                    self._articles[url] = article
+                    added += 1
+                mentioned = [entry["ticker"] for entry in article.get("ticker_sentiment") or [] if isinstance(entry, dict)]
+                for name in {ticker, *mentioned}:
+                    self._index(name, published.value, url)
+
+        self._latest[ticker] = latest
+        return added
+
+    def _index(self, ticker: str, published: int, url: str) -> None:
+        times, urls = self._times.setdefault(ticker, []), self._urls.setdefault(ticker, [])
+        position = bisect.bisect_right(times, published)
+        # Articles already indexed under the ticker have the same publication time
+        if url in urls[bisect.bisect_left(times, published):position]:
+            return
+        times.insert(position, published)
+        urls.insert(position, url)
+
+    def _prune(self, since: pd.Timestamp) -> None:
+        cutoff = self._to_ns(since)
+        pruned = False
+        for ticker, times in self._times.items():
+            position = bisect.bisect_left(times, cutoff)
+            if position:
+                del times[:position]
+                del self._urls[ticker][:position]
+                pruned = True
+
+        if pruned:
+            indexed = {url for urls in self._urls.values() for url in urls}
+            self._articles = {url: article for url, article in self._articles.items() if url in indexed}
+
+    def _localize(self, timestamp: pd.Timestamp) -> pd.Timestamp:
+        if timestamp.tz is None and self.timezone is not None:
+            return timestamp.tz_localize(self.timezone)
+        return timestamp
+
+    def _to_ns(self, timestamp: pd.Timestamp) -> int:
+        return self._localize(pd.Timestamp(timestamp)).value
@@ -0,0 +1,97 @@
+from collections import OrderedDict
+from typing import Optional
+import hashlib
+import logging
+import sqlite3
+import threading
+import os
+
+
+class SentimentStore:
+    """Sentiment scores per article and model.
+
+    An article's sentiment never changes, so every article is scored once per
+    model. Scores are keyed by the article URL, or a hash of its text when it
+    has no URL, together with the model id. Recently used scores are kept in an
+    in-memory LRU in front of an optional SQLite database that persists them
+    across runs.
+
+    :param path: SQLite database file. None keeps the scores in memory only.
+    :param cache_size: Number of scores kept in the in-memory LRU.
+    """
+
+    def __init__(self, path: Optional[str] = None, cache_size: int = 10000) -> None:
+        self.path = path
+        self.cache_size = cache_size
+        self._cache: OrderedDict[tuple[str, str], float] = OrderedDict()
+        self._lock = threading.Lock()
+        self._db = None
+
+        if path is not None:
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS scores (model_id TEXT, article TEXT, score REAL, PRIMARY KEY (model_id, article))"
+                )
+            self._db.commit()
+
+    @staticmethod
+    def article_key(url: Optional[str], text: str) -> str:
+        """Identifies an article by its URL, or by the hash of its text"""
+        if url:
+            return url
+        return "sha256:" + hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+    def get_many(self, model_id: str, articles: list[str]) -> dict[str, float]:
+        """Stored scores of the articles, articles that were never scored are left out"""
+        scores, missing = {}, []
+        with self._lock:
+            for article in articles:
+                score = self._cache.get((model_id, article))
+                if score is None:
+                    missing.append(article)
+                else:
+                    self._cache.move_to_end((model_id, article))
+                    scores[article] = score
+
+            if self._db is not None and missing:
+                for article, score in self._select(model_id, missing):
+                    scores[article] = score
+                    self._remember(model_id, article, score)
+
+        return scores
+
+    def put_many(self, model_id: str, scores: dict[str, float]) -> None:
+        with self._lock:
+            for article, score in scores.items():
+                self._remember(model_id, article, float(score))
+
+            if self._db is not None and scores:
+                self._db.executemany(
+                    "INSERT OR REPLACE INTO scores (model_id, article, score) VALUES (?, ?, ?)",
+                    [(model_id, article, float(score)) for article, score in scores.items()]
+                    )
+                self._db.commit()
+
+    def close(self) -> None:
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+    def _select(self, model_id: str, articles: list[str]) -> list[tuple[str, float]]:
+        rows = []
+        # Stay below SQLite's limit on the number of query parameters
+        for offset in range(0, len(articles), 500):
+            chunk = articles[offset:offset + 500]
+            placeholders = ",".join("?" * len(chunk))
+            rows += self._db.execute(
+                f"SELECT article, score FROM scores WHERE model_id = ? AND article IN ({placeholders})", [model_id, *chunk]
+                ).fetchall()
+        return rows
+
+    def _remember(self, model_id: str, article: str, score: float) -> None:
+        """Must be called with the lock held"""
+        self._cache[(model_id, article)] = score
+        self._cache.move_to_end((model_id, article))
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
@@ -21,6 +21,8 @@ class Configuration:
         self.order_type = self._configure_order_type(config.get('Bot', 'order_type'))
         self.paper_trading = config.getboolean('Bot', 'paper_trading')
         self.market = config.get('Bot', 'market', fallback="NYSE")
+        self.publication_lag = config.getfloat('Bot', 'publication_lag', fallback=2.0)
+        self.strategy = config.get('Bot', 'strategy', fallback='bert_sentiment')
 
         # Risk management
         self.position_sizing = config.getfloat('Risk', 'position_sizing')
@@ -39,6 +41,55 @@ class Configuration:
         self.historical_data_frequency = Period(config.get('APIs', 'historical_data_frequency', fallback='1d')) # can be 1min, 5min, 10min, 1d, 1w etc
         self.historical_data_horizon = Period(config.get('APIs', 'historical_data_horizon', fallback='1M'))
         self.intraday_interval = Period(config.get('APIs', 'intraday_interval', fallback='5min'))
+        self.bar_store_capacity = config.getint('APIs', 'bar_store_capacity', fallback=10000)
+        self.bar_cache_dir = config.get('APIs', 'bar_cache_dir', fallback=None)
+        self.max_fetch_workers = config.getint('APIs', 'max_fetch_workers', fallback=8)
+        self.async_refresh = config.getboolean('APIs', 'async_refresh', fallback=False)
+        self.price_stream = config.get('APIs', 'price_stream', fallback=None)
+        self.stream_close_delay = config.getfloat('APIs', 'stream_close_delay', fallback=0.25)
+        self.rate_limits = self._parse_mapping(config.get('APIs', 'rate_limits', fallback=''))
+        self.response_cache_ttls = self._parse_mapping(config.get('APIs', 'response_cache_ttls', fallback=''))
+
+        # HTTP client
+        self.http_connect_timeout = config.getfloat('APIs', 'http_connect_timeout', fallback=3.05)
+        self.http_read_timeout = config.getfloat('APIs', 'http_read_timeout', fallback=30.0)
+        self.http_max_retries = config.getint('APIs', 'http_max_retries', fallback=3)
+        self.http_backoff_factor = config.getfloat('APIs', 'http_backoff_factor', fallback=0.5)
+
+        # Sentiment
+        self.warm_up_models = config.getboolean('Sentiment', 'warm_up_models', fallback=True)
+        self.sentiment_mode = config.get('Sentiment', 'mode', fallback='tiered').lower()
+        self.provider_sentiment_threshold = config.getfloat('Sentiment', 'provider_threshold', fallback=0.15)
+        self.min_ticker_relevance = config.getfloat('Sentiment', 'min_relevance', fallback=0.1)
+        self.sentiment_batch_size = config.getint('Sentiment', 'batch_size', fallback=32)
+        self.inference_threads = config.getint('Sentiment', 'inference_threads', fallback=0)
+        self.inference_backend = config.get('Sentiment', 'backend', fallback='pytorch')
+        self.onnx_dir = config.get('Sentiment', 'onnx_dir', fallback='cache/onnx')
+        self.sentiment_workers = config.getint('Sentiment', 'workers', fallback=1)
+        self.sentiment_deadline = config.getfloat('Sentiment', 'deadline', fallback=5.0)
+        self.sentiment_fallback = config.get('Sentiment', 'fallback', fallback='hold').lower()
+        self.sentiment_store_path = config.get('Sentiment', 'score_store', fallback=None)
+        self.sentiment_cache_size = config.getint('Sentiment', 'score_cache_size', fallback=10000)
+
+        # Simulated broker
+        self.initial_cash = config.getfloat('SimulatedBroker', 'initial_cash', fallback=100000.0)
+        self.slippage_bps = config.getfloat('SimulatedBroker', 'slippage_bps', fallback=0.0)
+        self.commission_per_share = config.getfloat('SimulatedBroker', 'commission_per_share', fallback=0.0)
+        self.commission_bps = config.getfloat('SimulatedBroker', 'commission_bps', fallback=0.0)
+        self.min_commission = config.getfloat('SimulatedBroker', 'min_commission', fallback=0.0)
+        self.fill_latency = config.getfloat('SimulatedBroker', 'fill_latency', fallback=0.0)
+
+        # Backtest
+        self.backtest_start = config.get('Backtest', 'start', fallback=None)
+        self.backtest_end = config.get('Backtest', 'end', fallback=None)
+        self.backtest_log_level = self._configure_log(config.get('Backtest', 'log_level', fallback='Warning'))
+        self.backtest_output_dir = config.get('Backtest', 'output_dir', fallback='output/backtest')
+        self.backtest_mode = config.get('Backtest', 'mode', fallback='event').lower()
+        # Risk parameters scanned by the vectorized backtest, the [Risk] values when empty
+        self.position_sizing_grid = self._parse_values(config.get('Backtest', 'position_sizing_grid', fallback=''))
+        self.stop_loss_grid = self._parse_values(config.get('Backtest', 'stop_loss_grid', fallback=''))
+        self.take_profit_grid = self._parse_values(config.get('Backtest', 'take_profit_grid', fallback=''))
+        self.max_exposure_grid = self._parse_values(config.get('Backtest', 'max_exposure_grid', fallback=''))
 
         # API keys
         load_dotenv()
@@ -56,6 +107,22 @@ class Configuration:
         else:
             raise ValueError("Log level not recognized")
         
+    def _parse_mapping(self, entries: str) -> dict[str, float]:
+        """Parses 'key:value, key:value' entries, e.g. rate limits in credits per minute by provider"""
+        mapping = {}
+        for entry in entries.split(','):
+            if not entry.strip():
+                continue
+            key, _, value = entry.partition(':')
+            if not value:
+                raise ValueError(f"Config entry not recognized: {entry}")
+            mapping[key.strip()] = float(value)
+        return mapping
+
+    def _parse_values(self, entries: str) -> list[float]:
+        """Parses 'value, value' entries, e.g. a grid of stop losses"""
+        return [float(entry) for entry in entries.split(',') if entry.strip()]
+
     def _configure_order_type(self, order_type: str) -> OrderType:
         if order_type.lower() == "market":
             return OrderType.MARKET
@@ -1,4 +1,4 @@
-from src.app.generic_bot_app import GenericBotApplication
+from src.utilities.plugin_registry import PluginRegistry
 from src.utilities.logger import Logger
 import logging
 from src.utilities.utils import load_config
@@ -6,17 +6,22 @@ from src.utilities.utils import load_config
 
 class ExecutionOrchestrator:
 
+    # Application per run_type
+    applications = PluginRegistry("run type", {
+        "GenericBot": "src.app.generic_bot_app:GenericBotApplication",
+        "Backtest": "src.app.backtest_app:BacktestApplication",
+        })
+
     @staticmethod
     def run(config_path: str) -> None:
         Logger()
         cfg = load_config(config_path)
 
         try:
-            app = GenericBotApplication()
+            app = ExecutionOrchestrator.applications.load(cfg.run_type)()
             app.execute(cfg)
 
         except Exception as err:
             logging.error(f"Error in ExecutionOrchestrator: {err}")
             raise
             
-
@@ -0,0 +1,19 @@
+"""
+JSON decoding for provider responses. Uses orjson when it is installed, which
+decodes large time series payloads several times faster than the standard
+library, and falls back to json otherwise.
+"""
+from typing import Any
+import json
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def loads(content: bytes | str) -> Any:
+    """Decodes a JSON document from bytes or text"""
+    if orjson is not None:
+        return orjson.loads(content)
+    return json.loads(content)
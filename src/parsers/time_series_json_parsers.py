@@ -1,6 +1,18 @@
 from abc import ABC, abstractmethod
-from typing import Any
+from typing import Any, BinaryIO, Optional
+from array import array
+import io
+import numpy as np
 import pandas as pd
+import logging
+
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+
+OHLCV_FIELDS = ("open", "high", "low", "close", "volume")
 
 
 class TimeSeriesJSONParser(ABC):
@@ -22,41 +34,151 @@ class TimeSeriesJSONParser(ABC):
         """
         pass
 
+    @staticmethod
+    def _to_frame(timestamps: list[str], 
+                  records: list[dict[str, str]], 
+                  keys: dict[str, str],
+                  timezone: str = None) -> pd.DataFrame:
+        """
+        Builds an ascending float64 OHLCV frame from newest first provider records.
+
+        Args:
+            timestamps (list[str]): Timestamp of every record, all in the same format.
+            records (list[dict[str, str]]): Values of every record as strings.
+            keys (dict[str, str]): Record key for every OHLCV field. Missing keys are filled with NaN.
+            timezone (str): Timezone to localize the naive timestamps to.
+
+        Returns:
+            pd.DataFrame: OHLCV data with lowercase columns and a "datetime" index.
+        """
+        count = len(records)
+        columns = {
+            field: np.fromiter((record.get(key, "nan") for record in records), dtype=np.float64, count=count)[::-1]
+            for field, key in keys.items()
+        }
+
+        # Dates and datetimes come in a fixed ISO format, parse them in one pass
+        fmt = "%Y-%m-%d" if timestamps and len(timestamps[0]) == 10 else "%Y-%m-%d %H:%M:%S"
+        index = pd.DatetimeIndex(pd.to_datetime(timestamps[::-1], format=fmt), name="datetime")
+        if timezone is not None:
+            index = index.tz_localize(timezone)
+
+        return pd.DataFrame(columns, index=index)
+
 
 class AlphaVantageTimeSeriesJSONParser(TimeSeriesJSONParser):
     """
     Parser for Alpha Vantage API data.
     """
+    KEYS = {field: f"{number}. {field}" for number, field in enumerate(OHLCV_FIELDS, start=1)}
+    READ_SIZE = 64 * 1024
+
     @staticmethod
-    def parse(data: dict[str, Any]) -> pd.DataFrame:
+    def parse(data: dict[str, Any],
+              start_date: Optional[pd.Timestamp] = None,
+              end_date: Optional[pd.Timestamp] = None,
+              number_points: Optional[int] = None) -> pd.DataFrame:
         """
         Parses Alpha Vantage JSON data.
 
         Args:
-            data (dict[str, Any]): The JSON data from Alpha Vantage API.
+            data (dict[str, Any]): The JSON data from Alpha Vantage API, None when the request failed.
+            start_date (pd.Timestamp): First bar to keep, inclusive.
+            end_date (pd.Timestamp): Last bar to keep, inclusive.
+            number_points (int): Number of latest bars to keep.
 
         Returns:
             pd.DataFrame: A DataFrame with OHLCV data.
         """
-        time_series_key = None
-        for key in data.keys():
-            if "Time Series" in key:
-                time_series_key = key
-                break
-
-        df = pd.DataFrame.from_dict(data[time_series_key], orient="index")
-        df.index = pd.to_datetime(df.index)
-        df = df.astype(float) 
-        df = df.rename(
-            columns={
-                "1. open": "Open",
-                "2. high": "High",
-                "3. low": "Low",
-                "4. close": "Close",
-                "5. volume": "Volume",
-            }
-        )
-        return df[["Open", "High", "Low", "Close", "Volume"]]
+        # Failed requests, errors and rate limit notes, like in parse_stream
+        if data is None:
+            logging.error("Alpha Vantage returned no response")
+            return AlphaVantageTimeSeriesJSONParser.empty()
+
+        time_series_key = next((key for key in data.keys() if "Time Series" in key), None)
+        if time_series_key is None:
+            logging.error(f"Alpha Vantage returned no time series: {data}")
+            return AlphaVantageTimeSeriesJSONParser.empty()
+
+        selected = dict(AlphaVantageTimeSeriesJSONParser._select(data[time_series_key].items(), start_date, end_date, number_points))
+        return TimeSeriesJSONParser._to_frame(list(selected.keys()), list(selected.values()), AlphaVantageTimeSeriesJSONParser.KEYS)
+
+    @staticmethod
+    def empty() -> pd.DataFrame:
+        """OHLCV frame without bars, returned when the response holds no time series"""
+        return TimeSeriesJSONParser._to_frame([], [], AlphaVantageTimeSeriesJSONParser.KEYS)
+
+    @staticmethod
+    def parse_stream(stream: BinaryIO,
+                     time_series_key: str,
+                     start_date: Optional[pd.Timestamp] = None,
+                     end_date: Optional[pd.Timestamp] = None,
+                     number_points: Optional[int] = None) -> pd.DataFrame:
+        """
+        Parses an Alpha Vantage time series while it is read, keeping only the requested bars.
+        Requires ijson.
+
+        The bars arrive newest first, so reading stops as soon as the window is complete and 
+        the rest of the payload is never downloaded. Values are written straight into typed 
+        arrays instead of building the whole document in memory.
+
+        Args:
+            stream (BinaryIO): File like response body.
+            time_series_key (str): Key of the time series in the response, e.g. "Time Series (Daily)".
+            start_date (pd.Timestamp): First bar to keep, inclusive.
+            end_date (pd.Timestamp): Last bar to keep, inclusive.
+            number_points (int): Number of latest bars to keep.
+
+        Returns:
+            pd.DataFrame: A DataFrame with OHLCV data, ascending.
+        """
+        if ijson is None:
+            raise ImportError("Streaming Alpha Vantage responses requires ijson")
+
+        timestamps = []
+        columns = [array("d") for _ in OHLCV_FIELDS]
+
+        # Errors and rate limit notes are small documents without meta data
+        reader = io.BufferedReader(stream, AlphaVantageTimeSeriesJSONParser.READ_SIZE)
+        if b'"Meta Data"' not in reader.peek(AlphaVantageTimeSeriesJSONParser.READ_SIZE)[:1024]:
+            logging.error(f"Alpha Vantage returned no time series: {reader.read().decode(errors='replace')}")
+            bars = []
+        else:
+            bars = ijson.kvitems(reader, time_series_key, buf_size=AlphaVantageTimeSeriesJSONParser.READ_SIZE)
+
+        for timestamp, bar in AlphaVantageTimeSeriesJSONParser._select(bars, start_date, end_date, number_points):
+            timestamps.append(timestamp)
+            for column, key in zip(columns, AlphaVantageTimeSeriesJSONParser.KEYS.values()):
+                column.append(float(bar.get(key, "nan")))
+
+        fmt = "%Y-%m-%d" if timestamps and len(timestamps[0]) == 10 else "%Y-%m-%d %H:%M:%S"
+        index = pd.DatetimeIndex(pd.to_datetime(timestamps[::-1], format=fmt), name="datetime")
+        return pd.DataFrame(
+            {field: np.frombuffer(column, dtype=np.float64)[::-1] for field, column in zip(OHLCV_FIELDS, columns)},
+            index=index
+            )
+
+    @staticmethod
+    def _select(bars, start_date=None, end_date=None, number_points=None):
+        """
+        Yields the (timestamp, bar) pairs of a newest first time series that fall in the window
+        and stops as soon as the window is complete.
+        """
+        # Timestamps are ISO strings, so bounds can be compared as text at the key's precision
+        start = pd.Timestamp(start_date).strftime("%Y-%m-%d %H:%M:%S") if start_date is not None else None
+        end = pd.Timestamp(end_date).strftime("%Y-%m-%d %H:%M:%S") if end_date is not None else None
+
+        count = 0
+        for timestamp, bar in bars:
+            if end is not None and timestamp > end[:len(timestamp)]:
+                continue
+            if start is not None and timestamp < start[:len(timestamp)]:
+                return None
+
+            yield timestamp, bar
+            count += 1
+            if number_points is not None and count >= number_points:
+                return None
 
 
 class yFinanceTimeSeriesJSONParser(TimeSeriesJSONParser):
@@ -82,23 +204,17 @@ class TwelveDataTimeSeriesJSONParser(TimeSeriesJSONParser):
     Parser for Twelve Data API time series data.
     """
     @staticmethod
-    def parse(data: dict[str, Any], timezone: str) -> pd.DataFrame:
-        # time_series = data["Time Series (Daily)"]
-        # df = pd.DataFrame.from_dict(time_series, orient="index")
-        # df.index = pd.to_datetime(df.index)
-        # df = df.astype(float) 
-        # df = df.rename(
-        #     columns={
-        #         "1. open": "Open",
-        #         "2. high": "High",
-        #         "3. low": "Low",
-        #         "4. close": "Close",
-        #         "5. volume": "Volume",
-        #     }
-        # )
-        # return df[["Open", "High", "Low", "Close", "Volume"]]
-
-        df = pd.DataFrame(data)
-        df.index = pd.to_datetime(df['datetime']).dt.tz_localize(timezone)
-        df.pop('datetime')
-        return df
\ No newline at end of file
+    def parse(data: list[dict[str, str]], timezone: str) -> pd.DataFrame:
+        """
+        Parses the values of a Twelve Data time series.
+
+        Args:
+            data (list[dict[str, str]]): The time series values, newest first.
+            timezone (str): Timezone of the requested time series.
+
+        Returns:
+            pd.DataFrame: A DataFrame with OHLCV data.
+        """
+        data = list(data)
+        keys = {field: field for field in OHLCV_FIELDS}
+        return TimeSeriesJSONParser._to_frame([record["datetime"] for record in data], data, keys, timezone)
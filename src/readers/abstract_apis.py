@@ -46,6 +46,13 @@ class AbstractBrokerAPI(ABC):
     def close_positions(self, ticker: list[str]) -> None:
         pass
 
+    def attach_market_data(self, mkdata_service, api_name: str | None = None) -> None:
+        """
+        Market data service of the bot. Brokers filling orders themselves, like the simulated
+        broker, price the orders and positions with it. Brokers with an exchange ignore it.
+        """
+        pass
+
     def place_orders(self, orders: list[Order]) -> None:
         """
         Place a trade order.
@@ -56,14 +63,14 @@ class AbstractBrokerAPI(ABC):
         for order in orders:
             if order.direction == Signal.HOLD:
                 logging.info(f"Order direction is HOLD, no order placed")
-                return None
+                continue
             
             if order.type == OrderType.MARKET:
                 self.place_market_order(order)
             elif order.type == OrderType.LIMIT:
                 self.place_limit_order(order)
             else:
-                raise ValueError(f"Unsupported order type: {order.order_type}")
+                raise ValueError(f"Unsupported order type: {order.type}")
         
 
 class AbstractMarketDataAPI(ABC):
@@ -102,6 +109,35 @@ class AbstractMarketDataAPI(ABC):
         """Fetch real-time price for a given symbol."""
         pass
 
+    # Batched market data. Providers supporting multi-symbol requests override these
+    # and set max_batch_size to the number of symbols accepted per request.
+    max_batch_size: int = 1
+
+    def get_historical_prices_batch(self, 
+                                    symbols: list[str], 
+                                    interval: Period, 
+                                    start_date: Optional[str] = None, 
+                                    end_date: Optional[str] = None,
+                                    number_points: Optional[int] = None,
+                                    timezone: str = None) -> dict[str, pd.DataFrame]:
+        """Fetch historical prices for several symbols, one request per symbol."""
+        return {
+            symbol: self.get_historical_prices(symbol, interval, start_date, end_date, number_points, timezone) 
+            for symbol in symbols
+        }
+
+    def get_intraday_prices_batch(self,
+                                  symbols: list[str], 
+                                  interval: Period,
+                                  number_points: int,
+                                  timezone: str = None) -> dict[str, pd.DataFrame]:
+        """Fetch intraday prices for several symbols, one request per symbol."""
+        return {symbol: self.get_intraday_prices(symbol, interval, number_points, timezone) for symbol in symbols}
+
+    def get_real_time_prices(self, symbols: list[str]) -> dict[str, float]:
+        """Fetch real-time prices for several symbols, one request per symbol."""
+        return {symbol: self.get_real_time_price(symbol) for symbol in symbols}
+
     # FX, Crypto
     @abstractmethod
     def get_crypto_prices(self, symbol: str, interval: str) -> pd.DataFrame:
@@ -0,0 +1,56 @@
+from abc import ABC, abstractmethod
+from typing import Callable
+import logging
+
+
+# Listener called for every trade or price update: (symbol, timestamp in ns since epoch (UTC), price, volume)
+TickListener = Callable[[str, int, float, float], None]
+
+
+class AbstractPriceStream(ABC):
+    """
+    Push based real-time price feed.
+
+    Implementations connect to a provider stream and forward every price update to the
+    registered listeners. Listeners are called from the stream's own thread.
+    """
+
+    def __init__(self) -> None:
+        self._listeners: list[TickListener] = []
+        self._symbols: list[str] = []
+
+    @property
+    def symbols(self) -> list[str]:
+        return self._symbols
+
+    def add_listener(self, listener: TickListener) -> None:
+        self._listeners.append(listener)
+
+    def subscribe(self, symbols: list[str]) -> None:
+        """Adds symbols to the subscription. Can be called before or after start."""
+        new_symbols = [symbol for symbol in symbols if symbol not in self._symbols]
+        self._symbols.extend(new_symbols)
+        if new_symbols:
+            self._send_subscription(new_symbols)
+
+    @abstractmethod
+    def start(self) -> None:
+        """Connect and start streaming in the background."""
+        pass
+
+    @abstractmethod
+    def stop(self) -> None:
+        """Disconnect the stream."""
+        pass
+
+    @abstractmethod
+    def _send_subscription(self, symbols: list[str]) -> None:
+        """Sends a subscription for the given symbols if the stream is connected."""
+        pass
+
+    def _publish(self, symbol: str, timestamp: int, price: float, volume: float) -> None:
+        for listener in self._listeners:
+            try:
+                listener(symbol, timestamp, price, volume)
+            except Exception as err:
+                logging.error(f"Error in price stream listener for {symbol}: {err}")
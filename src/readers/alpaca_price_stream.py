@@ -0,0 +1,65 @@
+from src.readers.abstract_streams import AbstractPriceStream
+import pandas as pd
+import websocket
+import threading
+import logging
+import json
+import os
+
+
+class AlpacaPriceStream(AbstractPriceStream):
+    """
+    Alpaca market data WebSocket trade stream.
+
+    :param feed: Alpaca data feed, 'iex' (free) or 'sip'.
+    """
+    URL = "wss://stream.data.alpaca.markets/v2/{feed}"
+
+    def __init__(self, feed: str = "iex") -> None:
+        super().__init__()
+        self.feed = feed
+        self._ws: websocket.WebSocketApp | None = None
+        self._authenticated = threading.Event()
+
+    def start(self) -> None:
+        self._ws = websocket.WebSocketApp(
+            self.URL.format(feed=self.feed),
+            on_open=self._on_open,
+            on_message=self._on_message,
+            on_error=lambda ws, err: logging.error(f"Alpaca stream error: {err}"),
+            on_close=self._on_close,
+        )
+        threading.Thread(target=self._ws.run_forever, kwargs={"reconnect": 5}, daemon=True, name="alpaca-stream").start()
+
+    def stop(self) -> None:
+        if self._ws is not None:
+            self._ws.close()
+
+    def _send_subscription(self, symbols: list[str]) -> None:
+        if self._authenticated.is_set():
+            self._ws.send(json.dumps({"action": "subscribe", "trades": symbols}))
+
+    def _on_open(self, ws) -> None:
+        ws.send(json.dumps({
+            "action": "auth",
+            "key": os.environ.get('ALPACA_KEY', 'WRONG-KEY'),
+            "secret": os.environ.get('ALPACA_SECRET', 'WRONG-KEY'),
+        }))
+
+    def _on_close(self, ws, status_code, message) -> None:
+        logging.warning(f"Alpaca price stream closed: {status_code} {message}")
+        self._authenticated.clear()
+
+    def _on_message(self, ws, message: str) -> None:
+        for event in json.loads(message):
+            event_type = event.get("T")
+
+            if event_type == "success" and event.get("msg") == "authenticated":
+                logging.info("Connected to Alpaca price stream")
+                self._authenticated.set()
+                if self.symbols:
+                    self._send_subscription(self.symbols)
+            elif event_type == "error":
+                logging.error(f"Alpaca stream error {event.get('code')}: {event.get('msg')}")
+            elif event_type == "t":
+                self._publish(event["S"], pd.Timestamp(event["t"]).value, float(event["p"]), float(event["s"]))
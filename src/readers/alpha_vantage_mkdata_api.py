@@ -5,58 +5,31 @@ import logging
 from src.execution.configuration import Configuration
 import os
 import datetime as dt
-from src.parsers.time_series_json_parsers import AlphaVantageTimeSeriesJSONParser
+from src.parsers.time_series_json_parsers import AlphaVantageTimeSeriesJSONParser, ijson
 from src.data_structures.time_series_inputs import TimeSeriesInputs, AlphaVantageTimeSeriesInputs
 from typing import Optional, Any
 from src.utilities.period import Period
 from src.utilities.utils import calc_intraday_time_points, shift_date_by_period
 
 
-class AlphaVantageAPI(AbstractMarketDataAPI, RestAPI):
+class AlphaVantageRequestBuilder:
     """
-    Interface for market data providers.
-
-    Provides methods for connecting to a data source, subscribing to tickers,
-    and retrieving the latest market data.
+    Builds Alpha Vantage query parameters and parses the responses. Shared by the 
+    synchronous and asynchronous Alpha Vantage APIs.
     """
-
-    def __init__(self):
-        RestAPI.__init__(self)
-        self.base_url = "https://www.alphavantage.co/query?"
-        self.access_key = os.environ.get('ALPHA_VANTAGE_KEY', 'WRONG-KEY')
-
-    def get_price(self, ticker: str) -> float:
-        """
-        Retrieve the latest market price for the given ticker.
-        I think this should be function=REALTIME_BULK_QUOTES in the API -> Premium service. 
-        We use GLOBAL_QUOTE instead, like for quote.
-
-        :param ticker: The ticker symbol to fetch data for.
-        :return: A dictionary containing market data.
-        """
-        price = self.get(params={"function": "GLOBAL_QUOTE", 
-                                 "symbol": ticker,
-                                 "apikey": self.access_key})	
-        return float(price['Global Quote']['05. price'])
-
-    def get_quote(self, ticker: str) -> dict:
-        """
-        Retrieve the latest historical eod quote for the given ticker.
-
-        :param ticker: The ticker symbol to fetch data for.
-        :return: A dictionary containing quote data.
-        """
-        return {'close': self.get_price(ticker)}
-    
-
-    def get_historical_prices(self, 
-                              symbol: str, 
-                              interval: Period, 
-                              start_date: Optional[str] = None, 
-                              end_date: Optional[str] = None,
-                              number_points: Optional[int] = None,
-                              timezone: str = None) -> pd.DataFrame:
-        # to do - set correct timezone in returned data
+    access_key: str
+
+    def _endpoint_class(self, endpoint: str = None, params: Optional[dict[str, Any]] = None) -> Optional[str]:
+        """Alpha Vantage has a single endpoint, requests are classified by their function"""
+        return params.get("function").lower() if params and params.get("function") else None
+
+    def _historical_prices_params(self, 
+                                  symbol: str, 
+                                  interval: Period, 
+                                  start_date: Optional[str] = None, 
+                                  end_date: Optional[str] = None,
+                                  number_points: Optional[int] = None) -> dict[str, Any]:
+        """Query parameters of the time series function matching the requested interval and horizon"""
         time_series_params={"function": None, 
                             "symbol": symbol,
                             "apikey": self.access_key,
@@ -110,10 +83,130 @@ class AlphaVantageAPI(AbstractMarketDataAPI, RestAPI):
             time_series_params["interval"] = "1m"
         else:
             raise ValueError("Only D/W/M supported for Alpha Vantage time series")
-        
+
+        return time_series_params
+
+    @staticmethod
+    def _time_series_key(params: dict[str, Any]) -> str:
+        """Key of the time series in the response of a time series function"""
+        return {"TIME_SERIES_DAILY": "Time Series (Daily)",
+                "TIME_SERIES_WEEKLY": "Weekly Time Series",
+                "TIME_SERIES_MONTHLY": "Monthly Time Series"}.get(params["function"], f"Time Series ({params.get('interval')})")
+
+    @staticmethod
+    def _parse_historical_prices(time_series: dict[str, Any], 
+                                 number_points: Optional[int] = None,
+                                 start_date: Optional[str] = None,
+                                 end_date: Optional[str] = None) -> pd.DataFrame:
+        return AlphaVantageTimeSeriesJSONParser.parse(time_series, start_date, end_date, number_points)
+
+    def _real_time_price_params(self, ticker: str) -> dict[str, Any]:
+        return {"function": "GLOBAL_QUOTE", 
+                "symbol": ticker,
+                "apikey": self.access_key}
+
+    @staticmethod
+    def _parse_real_time_price(price: dict[str, Any]) -> float:
+        return float(price['Global Quote']['05. price'])
+
+    def _news_params(self, 
+                     ticker: str,
+                     start_date: Optional[pd.Timestamp] = None, 
+                     end_date: Optional[pd.Timestamp] = None) -> dict[str, Any]:
+        fmt_start_date = start_date.strftime('%Y%m%dT%H%M') if start_date is not None else None
+        fmt_end_date = end_date.strftime('%Y%m%dT%H%M') if end_date is not None else None
+
+        # A comma separated tickers list matches the articles mentioning all of them, not any of them
+        return {"function": "NEWS_SENTIMENT", 
+                "tickers": ticker,
+                "apikey": self.access_key,
+                "time_from": fmt_start_date,
+                "time_to": fmt_end_date,
+                "sort": "LATEST",
+                "limit": 1000}
+
+    @staticmethod
+    def _parse_news(data: dict[str, Any]) -> pd.DataFrame:
+        if not data or not data.get('feed'):
+            # No articles in the window, or an information note e.g. about the rate limit
+            if data and 'feed' not in data:
+                logging.warning(f"No news feed in the Alpha Vantage response: {data}")
+            return pd.DataFrame(columns=['title', 'url', 'time_published', 'summary'])
+
+        df = pd.DataFrame(data['feed'])
+        df['time_published'] = pd.to_datetime(df['time_published'], format='%Y%m%dT%H%M%S')
+        return df
+
+
+class AlphaVantageAPI(AbstractMarketDataAPI, AlphaVantageRequestBuilder, RestAPI):
+    """
+    Interface for market data providers.
+
+    Provides methods for connecting to a data source, subscribing to tickers,
+    and retrieving the latest market data.
+    """
+
+    def __init__(self, cfg: Optional[Configuration] = None):
+        if cfg is not None:
+            RestAPI.__init__(self, 
+                             cfg.http_connect_timeout, 
+                             cfg.http_read_timeout, 
+                             cfg.http_max_retries, 
+                             cfg.http_backoff_factor,
+                             cfg.max_fetch_workers)
+        else:
+            RestAPI.__init__(self)
+        self.base_url = "https://www.alphavantage.co/query?"
+        self.access_key = os.environ.get('ALPHA_VANTAGE_KEY', 'WRONG-KEY')
+        self.rate_limit_key = "alpha_vantage"
+
+    def get_price(self, ticker: str) -> float:
+        """
+        Retrieve the latest market price for the given ticker.
+        I think this should be function=REALTIME_BULK_QUOTES in the API -> Premium service. 
+        We use GLOBAL_QUOTE instead, like for quote.
+
+        :param ticker: The ticker symbol to fetch data for.
+        :return: A dictionary containing market data.
+        """
+        price = self.get(params={"function": "GLOBAL_QUOTE", 
+                                 "symbol": ticker,
+                                 "apikey": self.access_key})	
+        return float(price['Global Quote']['05. price'])
+
+    def get_quote(self, ticker: str) -> dict:
+        """
+        Retrieve the latest historical eod quote for the given ticker.
+
+        :param ticker: The ticker symbol to fetch data for.
+        :return: A dictionary containing quote data.
+        """
+        return {'close': self.get_price(ticker)}
+    
+
+    def get_historical_prices(self, 
+                              symbol: str, 
+                              interval: Period, 
+                              start_date: Optional[str] = None, 
+                              end_date: Optional[str] = None,
+                              number_points: Optional[int] = None,
+                              timezone: str = None) -> pd.DataFrame:
+        # to do - set correct timezone in returned data
+        time_series_params = self._historical_prices_params(symbol, interval, start_date, end_date, number_points)
+
+        if time_series_params["outputsize"] == "full" and ijson is not None:
+            # Full output holds up to 20 years of bars, decode it while it arrives and keep the window only
+            response = self.get_stream(params=time_series_params)
+            if response is None:
+                logging.error(f"Alpha Vantage returned no response for {symbol}")
+                return AlphaVantageTimeSeriesJSONParser.empty()
+            with response:
+                return AlphaVantageTimeSeriesJSONParser.parse_stream(
+                    response.raw, self._time_series_key(time_series_params), start_date, end_date, number_points
+                    )
+
         time_series = self.get(params=time_series_params)	
-        return AlphaVantageTimeSeriesJSONParser.parse(time_series).iloc[:number_points] \
-            if number_points is not None else AlphaVantageTimeSeriesJSONParser.parse(time_series)
+        return self._parse_historical_prices(time_series, number_points, start_date, end_date)
 
     
     def get_intraday_prices(self,
@@ -138,10 +231,8 @@ class AlphaVantageAPI(AbstractMarketDataAPI, RestAPI):
         :param symbol: The stock/crypto/forex symbol.
         :return: Real-time price as a dictionary.
         """
-        price = self.get(params={"function": "GLOBAL_QUOTE", 
-                                 "symbol": ticker,
-                                 "apikey": self.access_key})	
-        return float(price['Global Quote']['05. price'])
+        price = self.get(params=self._real_time_price_params(ticker))	
+        return self._parse_real_time_price(price)
 
     def get_crypto_prices(self, symbol: str, interval: str) -> pd.DataFrame:
         """
@@ -235,23 +326,14 @@ class AlphaVantageAPI(AbstractMarketDataAPI, RestAPI):
                  start_date: Optional[pd.Timestamp] = None, 
                  end_date: Optional[pd.Timestamp] = None) -> pd.DataFrame:
         """
-        Fetch news articles for a given symbol.
-        (Not supported by Alpha Vantage.)
+        Fetch news articles for a given symbol, the latest 1000 at most.
 
-        :param symbol: The stock symbol.
-        :raises NotImplementedError: Always raises as this feature is unsupported.
+        :param ticker: The stock symbol.
+        :param start_date: Earliest publication time, minute precision.
+        :param end_date: Latest publication time, minute precision.
         """
-        fmt_start_date = start_date.strftime('%Y%m%dT%H%M') if start_date is not None else None
-        fmt_end_date = end_date.strftime('%Y%m%dT%H%M') if end_date is not None else None
-
-        data = self.get(params={"function": "NEWS_SENTIMENT", 
-                                 "symbol": ticker,
-                                 "apikey": self.access_key,
-                                 "time_from": fmt_start_date,
-                                 "time_to": fmt_end_date})
-        df = pd.DataFrame(data['feed'])
-        df['time_published'] = pd.to_datetime(df['time_published'], format='%Y%m%dT%H%M%S')
-        return df
+        data = self.get(params=self._news_params(ticker, start_date, end_date))
+        return self._parse_news(data)
 
     def get_sentiment(self, symbol: str) -> None:
         """
@@ -1,28 +1,61 @@
 from src.readers.abstract_apis import AbstractBrokerAPI, AbstractMarketDataAPI
-from src.readers.alpaca_broker_api import AlpacaAPI
-from src.readers.twelvedata_mkdata_api import TwelveDataAPI
-from src.readers.yfinance_mkdata_api import yFinanceAPI
-from src.readers.alpha_vantage_mkdata_api import AlphaVantageAPI
+from src.readers.async_abstract_apis import AsyncAbstractMarketDataAPI
+from src.readers.abstract_streams import AbstractPriceStream
+from src.utilities.plugin_registry import PluginRegistry
+from src.execution.configuration import Configuration
+
+# Providers are imported when they are first created, so only the SDKs of the configured ones are loaded
 
 class BrokerAPIFactory:
 
+    registry = PluginRegistry("broker API", {
+        "alpaca": "src.readers.alpaca_broker_api:AlpacaAPI",
+        "simulated": "src.readers.simulated_broker_api:SimulatedBrokerAPI",
+        })
+
     @staticmethod
     def create_instance(api_type: str) -> AbstractBrokerAPI:
-        if api_type.lower() == "alpaca":
-            return AlpacaAPI()
-        else:
-            ValueError(f"Unsupported API type: {api_type}")	
+        return BrokerAPIFactory.registry.load(api_type)()
 
 
 class MarketDataAPIFactory:
 
+    registry = PluginRegistry("market data API", {
+        "twelve_data": "src.readers.twelvedata_mkdata_api:TwelveDataAPI",
+        "yfinance": "src.readers.yfinance_mkdata_api:yFinanceAPI",
+        "alpha_vantage": "src.readers.alpha_vantage_mkdata_api:AlphaVantageAPI",
+        })
+    # APIs configured through their constructor
+    CONFIGURED = {"alpha_vantage"}
+
+    @staticmethod
+    def create_instance(api_type: str, cfg: Configuration = None) -> AbstractMarketDataAPI:
+        api_class = MarketDataAPIFactory.registry.load(api_type)
+        return api_class(cfg) if api_type.lower() in MarketDataAPIFactory.CONFIGURED else api_class()
+
+
+class AsyncMarketDataAPIFactory:
+
+    # aiohttp is only required when asynchronous refreshes are enabled
+    registry = PluginRegistry("async market data API", {
+        "twelve_data": "src.readers.async_twelvedata_mkdata_api:AsyncTwelveDataAPI",
+        "alpha_vantage": "src.readers.async_alpha_vantage_mkdata_api:AsyncAlphaVantageAPI",
+        })
+
+    @staticmethod
+    def create_instance(api_type: str, cfg: Configuration = None) -> AsyncAbstractMarketDataAPI:
+        return AsyncMarketDataAPIFactory.registry.load(api_type)(cfg)
+
+
+class PriceStreamFactory:
+
+    # websocket-client is only required when streaming is enabled
+    registry = PluginRegistry("price stream", {
+        "twelve_data": "src.readers.twelvedata_price_stream:TwelveDataPriceStream",
+        "alpaca": "src.readers.alpaca_price_stream:AlpacaPriceStream",
+        "fake": "src.readers.fake_price_stream:FakePriceStream",
+        })
+
     @staticmethod
-    def create_instance(api_type: str) -> AbstractMarketDataAPI:
-        if api_type.lower() == "twelve_data":
-            return TwelveDataAPI()
-        elif api_type.lower() == "yfinance":
-            return yFinanceAPI()
-        elif api_type.lower() == "alpha_vantage":
-            return AlphaVantageAPI()
-        else:
-            ValueError(f"Unsupported API type: {api_type}")	
\ No newline at end of file
+    def create_instance(stream_type: str) -> AbstractPriceStream:
+        return PriceStreamFactory.registry.load(stream_type)()
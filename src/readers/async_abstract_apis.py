@@ -0,0 +1,53 @@
+from abc import ABC, abstractmethod
+import pandas as pd
+from typing import Optional
+from src.utilities.period import Period
+
+
+class AsyncAbstractMarketDataAPI(ABC):
+    """
+    Asynchronous reader for market data providers.
+
+    Coroutine versions of the core AbstractMarketDataAPI methods, so requests to
+    several tickers and providers can be awaited concurrently on one event loop.
+    """
+    __slots__ = ('api_key')
+
+    @abstractmethod
+    async def get_historical_prices(self,
+                                    symbol: str,
+                                    interval: Period,
+                                    start_date: Optional[str] = None,
+                                    end_date: Optional[str] = None,
+                                    number_points: Optional[int] = None,
+                                    timezone: str = None) -> pd.DataFrame:
+        """Fetch historical prices for a given symbol.
+        :param number_points: Needed for intraday data"""
+        pass
+
+    @abstractmethod
+    async def get_intraday_prices(self,
+                                  symbol: str,
+                                  interval: Period,
+                                  number_points: int,
+                                  timezone: str = None) -> pd.DataFrame:
+        """Fetch intraday prices for a given symbol."""
+        pass
+
+    @abstractmethod
+    async def get_real_time_price(self, symbol: str) -> float:
+        """Fetch real-time price for a given symbol."""
+        pass
+
+    @abstractmethod
+    async def get_news(self,
+                       symbol: str,
+                       start_date: Optional[pd.Timestamp] = None,
+                       end_date: Optional[pd.Timestamp] = None) -> pd.DataFrame:
+        """Fetch news articles for a given symbol."""
+        pass
+
+    @abstractmethod
+    async def close(self) -> None:
+        """Release the connections held by the API."""
+        pass
@@ -0,0 +1,77 @@
+from src.readers.async_abstract_apis import AsyncAbstractMarketDataAPI
+from src.readers.async_rest_api import AsyncRestAPI
+from src.readers.alpha_vantage_mkdata_api import AlphaVantageRequestBuilder
+from src.execution.configuration import Configuration
+import pandas as pd
+import os
+from typing import Optional
+from src.utilities.period import Period
+
+
+class AsyncAlphaVantageAPI(AsyncAbstractMarketDataAPI, AlphaVantageRequestBuilder, AsyncRestAPI):
+    """
+    Asynchronous Alpha Vantage market data API. Builds the same queries as AlphaVantageAPI
+    and awaits them on the event loop.
+    """
+
+    def __init__(self, cfg: Optional[Configuration] = None):
+        if cfg is not None:
+            AsyncRestAPI.__init__(self, 
+                                  cfg.http_connect_timeout, 
+                                  cfg.http_read_timeout, 
+                                  cfg.http_max_retries, 
+                                  cfg.http_backoff_factor,
+                                  cfg.max_fetch_workers)
+        else:
+            AsyncRestAPI.__init__(self)
+        self.base_url = "https://www.alphavantage.co/query?"
+        self.access_key = os.environ.get('ALPHA_VANTAGE_KEY', 'WRONG-KEY')
+        self.rate_limit_key = "alpha_vantage"
+
+    async def get_historical_prices(self, 
+                                    symbol: str, 
+                                    interval: Period, 
+                                    start_date: Optional[str] = None, 
+                                    end_date: Optional[str] = None,
+                                    number_points: Optional[int] = None,
+                                    timezone: str = None) -> pd.DataFrame:
+        time_series_params = self._historical_prices_params(symbol, interval, start_date, end_date, number_points)
+        time_series = await self.get_async(params=time_series_params)
+        return self._parse_historical_prices(time_series, number_points, start_date, end_date)
+
+    async def get_intraday_prices(self,
+                                  symbol: str, 
+                                  interval: Period,
+                                  number_points: int,
+                                  timezone: str = None) -> pd.DataFrame:
+        """
+        Fetch intraday prices for a given symbol.
+
+        :param symbol: The stock/crypto/forex symbol.
+        :param interval: The data interval (e.g., '1min').
+        """
+        return await self.get_historical_prices(symbol, interval, None, None, number_points, timezone)
+
+    async def get_real_time_price(self, ticker: str) -> float:
+        """
+        Fetch real-time price for a given symbol.
+
+        :param symbol: The stock/crypto/forex symbol.
+        """
+        price = await self.get_async(params=self._real_time_price_params(ticker))
+        return self._parse_real_time_price(price)
+
+    async def get_news(self, 
+                       ticker: str,
+                       start_date: Optional[pd.Timestamp] = None, 
+                       end_date: Optional[pd.Timestamp] = None) -> pd.DataFrame:
+        """
+        Fetch news articles for a given symbol.
+
+        :param ticker: The stock symbol.
+        """
+        data = await self.get_async(params=self._news_params(ticker, start_date, end_date))
+        return self._parse_news(data)
+
+    async def close(self) -> None:
+        await self.close_async()
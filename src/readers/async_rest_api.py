@@ -0,0 +1,92 @@
+import aiohttp
+import asyncio
+import logging
+import random
+from typing import Optional, Any
+from src.readers.rest_api import RestAPI
+from src.parsers.json_decoder import loads
+from src.utilities.rate_limiter import RateLimiterRegistry
+
+
+class AsyncRestAPI(RestAPI):
+    """
+    Asynchronous counterpart of RestAPI built on aiohttp. Shares the base URL, access key,
+    headers, timeouts, retry policy and rate limiting of RestAPI, and adds coroutine
+    versions of the requests. Requires aiohttp.
+    """
+
+    def __init__(self,
+                 connect_timeout: float = 3.05,
+                 read_timeout: float = 30.0,
+                 max_retries: int = 3,
+                 backoff_factor: float = 0.5,
+                 pool_size: int = 10) -> None:
+        super().__init__(connect_timeout, read_timeout, max_retries, backoff_factor, pool_size)
+        self._async_session: Optional[aiohttp.ClientSession] = None
+
+    async def get_async(self,
+                        endpoint: str = None,
+                        headers: Optional[dict[str, str]] = None,
+                        params: Optional[dict[str, Any]] = None) -> Optional[dict[str, Any]]:
+        """
+        Perform a GET request without blocking the event loop.
+        :param endpoint: The API endpoint (e.g., "/resource").
+        :param headers: Optional additional headers for the request.
+        :param params: Optional query parameters for the request.
+        :return: Parsed JSON response if successful, None otherwise.
+        """
+        url = f"{self.base_url}/{endpoint.lstrip('/')}" if endpoint else self.base_url
+        if self.rate_limit_key is not None:
+            await RateLimiterRegistry.acquire_async(self.rate_limit_key, self._endpoint_class(endpoint, params))
+
+        try:
+            combined_headers = {**self.default_headers, **(headers or {})}
+            # aiohttp does not accept None query values, requests drops them
+            params = {key: value for key, value in (params or {}).items() if value is not None}
+            return await self._request_async("GET", url, headers=combined_headers, params=params)
+        except (aiohttp.ClientError, asyncio.TimeoutError, ValueError) as e:
+            logging.error(f"Async GET request failed: {e}")
+            return None
+
+    async def close_async(self) -> None:
+        """Close the pooled asynchronous connections"""
+        if self._async_session is not None and not self._async_session.closed:
+            await self._async_session.close()
+        self._async_session = None
+
+    async def _request_async(self, method: str, url: str, **kwargs: Any) -> Optional[dict[str, Any]]:
+        session = self._get_async_session()
+
+        for attempt in range(self.max_retries + 1):
+            can_retry = attempt < self.max_retries
+            try:
+                async with session.request(method, url, **kwargs) as response:
+                    if response.status in self.RETRY_STATUSES and method in self.IDEMPOTENT_METHODS and can_retry:
+                        logging.warning(f"{method} {url} returned {response.status}. Retry {attempt + 1}/{self.max_retries}")
+                        await asyncio.sleep(self._backoff(attempt))
+                        continue
+
+                    response.raise_for_status()
+                    return loads(await response.read())
+
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as err:
+                # Requests that never reached the server can always be retried
+                retryable = method in self.IDEMPOTENT_METHODS or isinstance(err, aiohttp.ClientConnectorError)
+                if not (retryable and can_retry):
+                    raise
+                logging.warning(f"{method} {url} failed: {err}. Retry {attempt + 1}/{self.max_retries}")
+                await asyncio.sleep(self._backoff(attempt))
+
+    def _get_async_session(self) -> aiohttp.ClientSession:
+        """The session is created lazily because it must belong to the running event loop"""
+        if self._async_session is None or self._async_session.closed:
+            connect_timeout, read_timeout = self.timeout
+            self._async_session = aiohttp.ClientSession(
+                timeout=aiohttp.ClientTimeout(sock_connect=connect_timeout, sock_read=read_timeout),
+                connector=aiohttp.TCPConnector(limit_per_host=self.pool_size),
+                headers={"Accept-Encoding": "gzip, deflate"},
+            )
+        return self._async_session
+
+    def _backoff(self, attempt: int) -> float:
+        return self.backoff_factor * 2 ** attempt + random.uniform(0, self.backoff_factor)
@@ -0,0 +1,103 @@
+from src.readers.async_abstract_apis import AsyncAbstractMarketDataAPI
+from src.readers.async_rest_api import AsyncRestAPI
+from src.readers.twelvedata_mkdata_api import TwelveDataAPI
+from src.execution.configuration import Configuration
+from src.parsers.time_series_json_parsers import TwelveDataTimeSeriesJSONParser
+import pandas as pd
+import logging
+import os
+from typing import Optional, Any
+from src.utilities.period import Period
+
+
+class AsyncTwelveDataAPI(AsyncAbstractMarketDataAPI, AsyncRestAPI):
+    """
+    Asynchronous Twelve Data market data API. The Twelve Data SDK is synchronous, 
+    so the REST endpoints it wraps are called directly.
+    """
+
+    def __init__(self, cfg: Optional[Configuration] = None):
+        if cfg is not None:
+            AsyncRestAPI.__init__(self, 
+                                  cfg.http_connect_timeout, 
+                                  cfg.http_read_timeout, 
+                                  cfg.http_max_retries, 
+                                  cfg.http_backoff_factor,
+                                  cfg.max_fetch_workers)
+        else:
+            AsyncRestAPI.__init__(self)
+        self.base_url = "https://api.twelvedata.com"
+        self.access_key = os.environ.get('TWELVE_DATA_KEY', 'WRONG-KEY')
+        self.rate_limit_key = TwelveDataAPI.rate_limit_key
+
+    async def get_historical_prices(self, 
+                                    symbol: str, 
+                                    interval: Period, 
+                                    start_date: Optional[str] = None, 
+                                    end_date: Optional[str] = None,
+                                    number_points: Optional[int] = None,
+                                    timezone: str = None) -> pd.DataFrame:
+        data = await self.get_async("time_series", params={
+            "symbol": symbol,
+            "interval": TwelveDataAPI._format_interval(interval),
+            "start_date": self._format_date(start_date),
+            "end_date": self._format_date(end_date),
+            "outputsize": number_points,
+            "timezone": str(timezone) if timezone is not None else None,
+            "apikey": self.access_key,
+        })
+        self._raise_for_error(data, symbol)
+
+        return TwelveDataTimeSeriesJSONParser.parse(data['values'], timezone)
+
+    async def get_intraday_prices(self,
+                                  symbol: str, 
+                                  interval: Period,
+                                  number_points: int,
+                                  timezone: str = None) -> pd.DataFrame:
+        """
+        Fetch intraday prices for a given symbol.
+
+        :param symbol: The stock/crypto/forex symbol.
+        :param interval: The data interval (e.g., '1min').
+        """
+        return await self.get_historical_prices(symbol, interval, None, None, number_points, timezone)
+
+    async def get_real_time_price(self, symbol: str) -> float:
+        """
+        Fetch real-time price for a given symbol.
+
+        :param symbol: The stock/crypto/forex symbol.
+        """
+        price = await self.get_async("price", params={"symbol": symbol, "apikey": self.access_key})
+        self._raise_for_error(price, symbol)
+        return float(price['price'])
+
+    async def get_news(self, 
+                       symbol: str, 
+                       start_date: Optional[pd.Timestamp] = None, 
+                       end_date: Optional[pd.Timestamp] = None) -> None:
+        """
+        Fetch news articles for a given symbol.
+        (Not supported by Twelve Data.)
+
+        :raises NotImplementedError: Always raises as this feature is unsupported.
+        """
+        raise NotImplementedError("Twelve Data does not provide news data.")
+
+    async def close(self) -> None:
+        await self.close_async()
+
+    @staticmethod
+    def _format_date(date: Any) -> Optional[str]:
+        if date is None:
+            return None
+        return pd.Timestamp(date).strftime('%Y-%m-%d %H:%M:%S')
+
+    @staticmethod
+    def _raise_for_error(data: Optional[dict[str, Any]], symbol: str) -> None:
+        if data is None:
+            raise ConnectionError(f"No response from Twelve Data for {symbol}")
+        if data.get('status') == 'error':
+            logging.error(f"Twelve Data error for {symbol}: {data.get('message')}")
+            raise ValueError(f"Twelve Data error for {symbol}: {data.get('message')}")
@@ -0,0 +1,300 @@
+from concurrent.futures import Future
+from dataclasses import dataclass
+from src.readers.abstract_apis import AbstractMarketDataAPI
+from typing import Any, Callable, Hashable, Optional
+from src.utilities.period import Period
+import pandas as pd
+import logging
+import threading
+import time
+
+
+@dataclass
+class _CacheEntry:
+    value: Any
+    expires: Optional[float]  # None never expires
+
+
+class CachedMarketDataAPI(AbstractMarketDataAPI):
+    """
+    Caching layer in front of a market data API.
+
+    Responses are cached with a time to live per endpoint (real_time_price, historical_prices,
+    intraday_prices, news). Historical bars and news for a window that ended before today
+    cannot change anymore and are cached forever. A TTL of 0 disables caching for an endpoint.
+    Identical requests made concurrently are coalesced into a single provider call.
+    Missing and empty responses, typically provider errors, are not cached. Expired
+    entries are swept out at most every SWEEP_INTERVAL seconds.
+    Hit, miss and coalesced counters per endpoint are available through stats().
+    """
+
+    DEFAULT_TTLS = {"real_time_price": 5.0, "historical_prices": 60.0, "intraday_prices": 0.0, "news": 60.0}
+    SWEEP_INTERVAL = 60.0
+
+    def __init__(self, api: AbstractMarketDataAPI, ttls: Optional[dict[str, float]] = None) -> None:
+        self.api = api
+        self.ttls = {**self.DEFAULT_TTLS, **(ttls or {})}
+        self._entries: dict[Hashable, _CacheEntry] = {}
+        self._in_flight: dict[Hashable, Future] = {}
+        self._lock = threading.Lock()
+        self._next_sweep = time.monotonic() + self.SWEEP_INTERVAL
+        self._stats = {endpoint: {"hits": 0, "misses": 0, "coalesced": 0} for endpoint in self.ttls}
+
+    def __getattr__(self, name: str) -> Any:
+        # Provider specific methods and attributes are served by the wrapped API
+        if name == "api":
+            raise AttributeError(name)
+        return getattr(self.api, name)
+
+    @property
+    def max_batch_size(self) -> int:
+        return self.api.max_batch_size
+
+    def stats(self) -> dict[str, dict[str, int]]:
+        with self._lock:
+            return {endpoint: dict(counters) for endpoint, counters in self._stats.items()}
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    # Cached endpoints
+    def get_historical_prices(self,
+                              symbol: str,
+                              interval: Period,
+                              start_date: Optional[str] = None,
+                              end_date: Optional[str] = None,
+                              number_points: Optional[int] = None,
+                              timezone: str = None) -> pd.DataFrame:
+        key = ("historical_prices", symbol, str(interval), start_date, end_date, number_points, str(timezone))
+        return self._cached(
+            key,
+            self._window_ttl("historical_prices", end_date),
+            lambda: self.api.get_historical_prices(symbol, interval, start_date, end_date, number_points, timezone)
+            )
+
+    def get_historical_prices_batch(self,
+                                    symbols: list[str],
+                                    interval: Period,
+                                    start_date: Optional[str] = None,
+                                    end_date: Optional[str] = None,
+                                    number_points: Optional[int] = None,
+                                    timezone: str = None) -> dict[str, pd.DataFrame]:
+        return self._cached_batch(
+            symbols,
+            lambda symbol: ("historical_prices", symbol, str(interval), start_date, end_date, number_points, str(timezone)),
+            self._window_ttl("historical_prices", end_date),
+            lambda missing: self.api.get_historical_prices_batch(missing, interval, start_date, end_date, number_points, timezone)
+            )
+
+    def get_intraday_prices(self,
+                            symbol: str,
+                            interval: Period,
+                            number_points: int,
+                            timezone: str = None) -> pd.DataFrame:
+        key = ("intraday_prices", symbol, str(interval), number_points, str(timezone))
+        return self._cached(
+            key,
+            self.ttls["intraday_prices"],
+            lambda: self.api.get_intraday_prices(symbol, interval, number_points, timezone)
+            )
+
+    def get_intraday_prices_batch(self,
+                                  symbols: list[str],
+                                  interval: Period,
+                                  number_points: int,
+                                  timezone: str = None) -> dict[str, pd.DataFrame]:
+        return self._cached_batch(
+            symbols,
+            lambda symbol: ("intraday_prices", symbol, str(interval), number_points, str(timezone)),
+            self.ttls["intraday_prices"],
+            lambda missing: self.api.get_intraday_prices_batch(missing, interval, number_points, timezone)
+            )
+
+    def get_real_time_price(self, symbol: str) -> float:
+        return self._cached(
+            ("real_time_price", symbol),
+            self.ttls["real_time_price"],
+            lambda: self.api.get_real_time_price(symbol)
+            )
+
+    def get_real_time_prices(self, symbols: list[str]) -> dict[str, float]:
+        return self._cached_batch(
+            symbols,
+            lambda symbol: ("real_time_price", symbol),
+            self.ttls["real_time_price"],
+            self.api.get_real_time_prices
+            )
+
+    def get_news(self,
+                 symbol: str,
+                 start_date: Optional[pd.Timestamp] = None,
+                 end_date: Optional[pd.Timestamp] = None) -> pd.DataFrame:
+        return self._cached(
+            ("news", symbol, start_date, end_date),
+            self._window_ttl("news", end_date),
+            lambda: self.api.get_news(symbol, start_date, end_date)
+            )
+
+    # Not cached
+    def get_crypto_prices(self, symbol: str, interval: str) -> pd.DataFrame:
+        return self.api.get_crypto_prices(symbol, interval)
+
+    def get_forex_prices(self, currency_pair: str, interval: str) -> pd.DataFrame:
+        return self.api.get_forex_prices(currency_pair, interval)
+
+    def get_technical_indicator(self, symbol: str, indicator: str, interval: str, **kwargs):
+        return self.api.get_technical_indicator(symbol, indicator, interval, **kwargs)
+
+    def get_company_profile(self, symbol: str):
+        return self.api.get_company_profile(symbol)
+
+    def get_financial_statements(self, symbol: str, statement_type: str):
+        return self.api.get_financial_statements(symbol, statement_type)
+
+    def get_earning(self, symbol: str, statement_type: str):
+        return self.api.get_earning(symbol, statement_type)
+
+    def get_sentiment(self, symbol: str):
+        return self.api.get_sentiment(symbol)
+
+    def get_economic_indicator(self, indicator: str):
+        return self.api.get_economic_indicator(indicator)
+
+    def _window_ttl(self, endpoint: str, end_date: Optional[pd.Timestamp]) -> Optional[float]:
+        """Data for a window that ended before today is final and never expires"""
+        if end_date is not None:
+            end_date = pd.Timestamp(end_date)
+            if end_date < pd.Timestamp.now(tz=end_date.tz).normalize():
+                return None
+        return self.ttls[endpoint]
+
+    def _cached(self, key: tuple, ttl: Optional[float], fetch: Callable[[], Any]) -> Any:
+        endpoint = key[0]
+        if ttl == 0:
+            return fetch()
+
+        with self._lock:
+            value, found = self._lookup(key)
+            if found:
+                self._stats[endpoint]["hits"] += 1
+                return self._copy(value)
+
+            future = self._in_flight.get(key)
+            owner = future is None
+            if owner:
+                future = Future()
+                self._in_flight[key] = future
+                self._stats[endpoint]["misses"] += 1
+            else:
+                self._stats[endpoint]["coalesced"] += 1
+
+        if not owner:
+            return self._copy(future.result())
+
+        try:
+            value = fetch()
+        except Exception as err:
+            self._resolve({key: future}, exception=err)
+            raise
+
+        self._resolve({key: future}, {key: value}, ttl)
+        return self._copy(value)
+
+    def _cached_batch(self,
+                      symbols: list[str],
+                      key_for: Callable[[str], tuple],
+                      ttl: Optional[float],
+                      fetch: Callable[[list[str]], dict[str, Any]]) -> dict[str, Any]:
+        """Serves the cached symbols and fetches all others with a single batch call"""
+        if ttl == 0:
+            return fetch(symbols)
+
+        results, waiting, owned = {}, {}, {}
+        with self._lock:
+            for symbol in symbols:
+                key = key_for(symbol)
+                counters = self._stats[key[0]]
+                value, found = self._lookup(key)
+
+                if found:
+                    counters["hits"] += 1
+                    results[symbol] = value
+                elif key in self._in_flight:
+                    counters["coalesced"] += 1
+                    waiting[symbol] = self._in_flight[key]
+                else:
+                    counters["misses"] += 1
+                    owned[symbol] = self._in_flight[key] = Future()
+
+        if owned:
+            futures = {key_for(symbol): future for symbol, future in owned.items()}
+            try:
+                fetched = fetch(list(owned.keys()))
+            except Exception as err:
+                self._resolve(futures, exception=err)
+                raise
+
+            self._resolve(futures, {key_for(symbol): value for symbol, value in fetched.items()}, ttl)
+            results.update(fetched)
+
+        for symbol, future in waiting.items():
+            value = future.result()
+            if value is not None:
+                results[symbol] = value
+
+        return {symbol: self._copy(results[symbol]) for symbol in symbols if symbol in results}
+
+    def _lookup(self, key: tuple) -> tuple[Any, bool]:
+        """Must be called with the lock held"""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None, False
+        if entry.expires is not None and entry.expires <= time.monotonic():
+            del self._entries[key]
+            return None, False
+        return entry.value, True
+
+    def _resolve(self,
+                 futures: dict[tuple, Future],
+                 values: Optional[dict[tuple, Any]] = None,
+                 ttl: Optional[float] = None,
+                 exception: Optional[Exception] = None) -> None:
+        """Stores the fetched values and wakes up the coalesced callers"""
+        values = values or {}
+        now = time.monotonic()
+        expires = now + ttl if ttl is not None else None
+        with self._lock:
+            for key, future in futures.items():
+                self._in_flight.pop(key, None)
+                if exception is not None:
+                    future.set_exception(exception)
+                    continue
+
+                if self._is_missing(values.get(key)):
+                    # Failed requests are retried by the next call instead of being served from the cache
+                    logging.debug(f"CachedMarketDataAPI: no value returned for {key}")
+                else:
+                    self._entries[key] = _CacheEntry(values[key], expires)
+                future.set_result(values.get(key))
+
+            if now >= self._next_sweep:
+                self._sweep(now)
+
+    def _sweep(self, now: float) -> None:
+        """Drops the expired entries, keys with moving end dates are never looked up again. Must be called with the lock held"""
+        expired = [key for key, entry in self._entries.items() if entry.expires is not None and entry.expires <= now]
+        for key in expired:
+            del self._entries[key]
+        self._next_sweep = now + self.SWEEP_INTERVAL
+        if expired:
+            logging.debug(f"CachedMarketDataAPI: swept {len(expired)} expired entries, {len(self._entries)} left")
+
+    @staticmethod
+    def _is_missing(value: Any) -> bool:
+        return value is None or (isinstance(value, (pd.DataFrame, pd.Series)) and value.empty)
+
+    @staticmethod
+    def _copy(value: Any) -> Any:
+        # Callers may modify returned frames, e.g. by adding columns
+        return value.copy() if isinstance(value, (pd.DataFrame, pd.Series)) else value
@@ -0,0 +1,27 @@
+from src.readers.abstract_streams import AbstractPriceStream
+import pandas as pd
+
+
+class FakePriceStream(AbstractPriceStream):
+    """
+    In-process price stream for tests and dry runs. Ticks are pushed by the caller 
+    and delivered synchronously to the listeners.
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.running = False
+
+    def start(self) -> None:
+        self.running = True
+
+    def stop(self) -> None:
+        self.running = False
+
+    def push(self, symbol: str, timestamp: pd.Timestamp, price: float, volume: float = 0.0) -> None:
+        """Publishes a tick for a subscribed symbol"""
+        if self.running and symbol in self.symbols:
+            self._publish(symbol, pd.Timestamp(timestamp).value, price, volume)
+
+    def _send_subscription(self, symbols: list[str]) -> None:
+        pass
@@ -0,0 +1,152 @@
+from src.readers.abstract_apis import AbstractMarketDataAPI
+from src.data_structures.marketdata_state import MarketDataState
+from src.utilities.period import Period
+from typing import Callable, Optional
+import pandas as pd
+import threading
+import logging
+import time
+
+
+class HistoricalMarketDataAPI(AbstractMarketDataAPI):
+    """
+    Market data API replaying historical data, used by the backtest engine.
+
+    Prices are served from the bar stores of the market data state, which the
+    engine fills bar by bar: the real time price of a symbol is the close of its
+    latest bar, so nothing after the simulated time is visible. News is fetched
+    once per symbol for the whole backtest from the source API and only the articles
+    published before the clock are returned. The remaining endpoints are served by
+    the source API.
+
+    :param state: Market data state holding the replayed bars.
+    :param api_name: Name the bars are stored under in the state.
+    :param clock: Returns the simulated time in seconds since epoch.
+    :param source: Provider API for news and fundamentals, None to replay prices only.
+    :param news_range: Start and end of the news fetched from the source.
+    :param timezone: Timezone of naive publication times.
+    """
+
+    def __init__(self,
+                 state: MarketDataState,
+                 api_name: str,
+                 clock: Callable[[], float] = time.time,
+                 source: Optional[AbstractMarketDataAPI] = None,
+                 news_range: Optional[tuple[pd.Timestamp, pd.Timestamp]] = None,
+                 timezone=None) -> None:
+        self.state = state
+        self.api_name = api_name
+        self.clock = clock
+        self.source = source
+        self.news_range = news_range
+        self.timezone = timezone
+        self._news: dict[str, pd.DataFrame] = {}
+        self._lock = threading.Lock()
+
+    def get_historical_prices(self,
+                              symbol: str,
+                              interval: Period,
+                              start_date: Optional[str] = None,
+                              end_date: Optional[str] = None,
+                              number_points: Optional[int] = None,
+                              timezone: str = None) -> pd.DataFrame:
+        with self.state.lock:
+            store = self.state.get_bar_store(self.api_name, symbol)
+            if store is None or store.empty:
+                return pd.DataFrame()
+
+            start = start_date if start_date is not None else store.timestamp_at(0)
+            end = end_date if end_date is not None else store.latest_timestamp
+            data = store.to_dataframe(store.between(start, end))
+        return data.iloc[-number_points:] if number_points else data
+
+    def get_intraday_prices(self,
+                            symbol: str,
+                            interval: Period,
+                            number_points: int,
+                            timezone: str = None) -> pd.DataFrame:
+        return self.get_historical_prices(symbol, interval, number_points=number_points, timezone=timezone)
+
+    def get_real_time_price(self, symbol: str) -> float:
+        with self.state.lock:
+            store = self.state.get_bar_store(self.api_name, symbol)
+            if store is None or store.empty:
+                return None
+            return float(store.column("close")[-1])
+
+    def get_real_time_prices(self, symbols: list[str]) -> dict[str, float]:
+        """Latest close per symbol, symbols without bars yet are left out"""
+        prices = {symbol: self.get_real_time_price(symbol) for symbol in symbols}
+        return {symbol: price for symbol, price in prices.items() if price is not None}
+
+    def get_news(self,
+                 symbol: str,
+                 start_date: Optional[pd.Timestamp] = None,
+                 end_date: Optional[pd.Timestamp] = None) -> pd.DataFrame:
+        news = self._get_all_news(symbol)
+        if news.empty:
+            return news
+
+        now = pd.Timestamp(self.clock(), unit="s", tz="UTC")
+        end = min(self._localize(end_date), now) if end_date is not None else now
+        published = news["time_published"]
+        selected = published <= end
+        if start_date is not None:
+            selected &= published >= self._localize(start_date)
+        return news[selected]
+
+    def _get_all_news(self, symbol: str) -> pd.DataFrame:
+        with self._lock:
+            if symbol not in self._news:
+                news = None
+                if self.source is not None:
+                    start, end = self.news_range if self.news_range is not None else (None, None)
+                    try:
+                        news = self.source.get_news(symbol, start, end)
+                    except Exception as err:
+                        logging.warning(f"HistoricalMarketDataAPI: failed to fetch the news of {symbol}: {err}")
+
+                if news is None or news.empty:
+                    news = pd.DataFrame(columns=["title", "url", "time_published", "summary"])
+                else:
+                    news = news.copy()
+                    news["time_published"] = [self._localize(published) for published in news["time_published"]]
+                    news = news.sort_values("time_published")
+                self._news[symbol] = news
+            return self._news[symbol]
+
+    def _localize(self, timestamp: pd.Timestamp) -> pd.Timestamp:
+        timestamp = pd.Timestamp(timestamp)
+        if timestamp.tz is None:
+            timestamp = timestamp.tz_localize(self.timezone if self.timezone is not None else "UTC")
+        return timestamp
+
+    # Not replayed, served by the source API
+    def get_crypto_prices(self, symbol: str, interval: str) -> pd.DataFrame:
+        return self._source().get_crypto_prices(symbol, interval)
+
+    def get_forex_prices(self, currency_pair: str, interval: str) -> pd.DataFrame:
+        return self._source().get_forex_prices(currency_pair, interval)
+
+    def get_technical_indicator(self, symbol: str, indicator: str, interval: str, **kwargs):
+        return self._source().get_technical_indicator(symbol, indicator, interval, **kwargs)
+
+    def get_company_profile(self, symbol: str):
+        return self._source().get_company_profile(symbol)
+
+    def get_financial_statements(self, symbol: str, statement_type: str):
+        return self._source().get_financial_statements(symbol, statement_type)
+
+    def get_earning(self, symbol: str, statement_type: str):
+        return self._source().get_earning(symbol, statement_type)
+
+    def get_sentiment(self, symbol: str):
+        return self._source().get_sentiment(symbol)
+
+    def get_economic_indicator(self, indicator: str):
+        return self._source().get_economic_indicator(indicator)
+
+    def _source(self) -> AbstractMarketDataAPI:
+        if self.source is None:
+            raise NotImplementedError("HistoricalMarketDataAPI only replays prices without a source API")
+        return self.source
@@ -1,22 +1,70 @@
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import logging
 from typing import Optional, Any
+from src.utilities.rate_limiter import RateLimiterRegistry
+from src.parsers.json_decoder import loads
 
 
 class RestAPI:
 
-    def __init__(self) -> None:
+    # Requests that can safely be sent again after a read error or a retryable status
+    IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+    RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+    def __init__(self,
+                 connect_timeout: float = 3.05,
+                 read_timeout: float = 30.0,
+                 max_retries: int = 3,
+                 backoff_factor: float = 0.5,
+                 pool_size: int = 10) -> None:
         """
-        Initialize the RestAPI class with a base URL and access key.
-        :param base_url: The base URL for the API.
-        :param access_key: The access key for authentication.
+        Initialize the RestAPI class with a pooled keep-alive HTTP session.
+        The base URL and access key are set by the provider subclasses.
+
+        :param connect_timeout: Seconds to wait for a connection to be established.
+        :param read_timeout: Seconds to wait for the server to send a response.
+        :param max_retries: Retries for failed connections and, for idempotent requests, 
+                            read errors and retryable statuses.
+        :param backoff_factor: Base of the jittered exponential backoff between retries, in seconds.
+        :param pool_size: Number of connections kept alive per host.
         """
         self._base_url: str = None
         self._access_key: str = None
+        # Provider name used for rate limiting, see RateLimiterRegistry. None disables throttling.
+        self.rate_limit_key: str = None
         self._default_headers: dict[str, str] = {
             "Authorization": f"Bearer {self.access_key}",
             "Content-Type": "application/json",
         }
+        self.timeout: tuple[float, float] = (connect_timeout, read_timeout)
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.pool_size = pool_size
+        self._session = self._create_session(max_retries, backoff_factor, pool_size)
+
+    def _create_session(self, max_retries: int, backoff_factor: float, pool_size: int) -> requests.Session:
+        retry = Retry(
+            total=max_retries,
+            backoff_factor=backoff_factor,
+            backoff_jitter=backoff_factor,
+            status_forcelist=self.RETRY_STATUSES,
+            allowed_methods=self.IDEMPOTENT_METHODS,
+            respect_retry_after_header=True,
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+
+        session = requests.Session()
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        session.headers.update({"Accept-Encoding": "gzip, deflate", "Connection": "keep-alive"})
+        return session
+
+    def close(self) -> None:
+        """Close the pooled connections"""
+        self._session.close()
 
     @property
     def base_url(self) -> str:
@@ -48,12 +96,35 @@ class RestAPI:
         :return: Parsed JSON response if successful, None otherwise.
         """
         url = f"{self.base_url}/{endpoint.lstrip('/')}" if endpoint else self.base_url
+        self._throttle(endpoint, params)
         try:
             combined_headers = {**self.default_headers, **(headers or {})}
-            response = requests.get(url, headers=combined_headers, params=params)
+            response = self._session.get(url, headers=combined_headers, params=params, timeout=self.timeout)
             response.raise_for_status()
             
-            return response.json()
+            return loads(response.content)
+        except (requests.exceptions.RequestException, ValueError) as e:
+            logging.error(f"GET request failed: {e}")
+            return None
+
+    def get_stream(self,
+                   endpoint: str = None,
+                   headers: Optional[dict[str, str]] = None,
+                   params: Optional[dict[str, Any]] = None) -> Optional[requests.Response]:
+        """
+        Perform a GET request without reading the body, so it can be decoded while it arrives.
+        The caller reads response.raw and must close the response.
+        :return: The open response if successful, None otherwise.
+        """
+        url = f"{self.base_url}/{endpoint.lstrip('/')}" if endpoint else self.base_url
+        self._throttle(endpoint, params)
+        try:
+            combined_headers = {**self.default_headers, **(headers or {})}
+            response = self._session.get(url, headers=combined_headers, params=params, timeout=self.timeout, stream=True)
+            response.raise_for_status()
+            # Let urllib3 undo the gzip encoding while the body is read
+            response.raw.decode_content = True
+            return response
         except requests.exceptions.RequestException as e:
             logging.error(f"GET request failed: {e}")
             return None
@@ -67,9 +138,10 @@ class RestAPI:
         :return: Parsed JSON response if successful, None otherwise.
         """
         url = f"{self.base_url}/{endpoint.lstrip('/')}"
+        self._throttle(endpoint)
         try:
             combined_headers = {**self.default_headers, **(headers or {})}
-            response = requests.post(url, json=data, headers=combined_headers)
+            response = self._session.post(url, json=data, headers=combined_headers, timeout=self.timeout)
             response.raise_for_status()
             return response.json()
         except requests.exceptions.RequestException as e:
@@ -85,9 +157,10 @@ class RestAPI:
         :return: Parsed JSON response if successful, None otherwise.
         """
         url = f"{self.base_url}/{endpoint.lstrip('/')}"
+        self._throttle(endpoint)
         try:
             combined_headers = {**self.default_headers, **(headers or {})}
-            response = requests.put(url, json=data, headers=combined_headers)
+            response = self._session.put(url, json=data, headers=combined_headers, timeout=self.timeout)
             response.raise_for_status()
             return response.json()
         except requests.exceptions.RequestException as e:
@@ -102,9 +175,10 @@ class RestAPI:
         :return: Parsed JSON response or a success message if successful, None otherwise.
         """
         url = f"{self.base_url}/{endpoint.lstrip('/')}"
+        self._throttle(endpoint)
         try:
             combined_headers = {**self.default_headers, **(headers or {})}
-            response = requests.delete(url, headers=combined_headers)
+            response = self._session.delete(url, headers=combined_headers, timeout=self.timeout)
             response.raise_for_status()
             if response.status_code == 204:
                 return {"message": "Resource deleted successfully"}
@@ -113,5 +187,14 @@ class RestAPI:
             logging.error(f"DELETE request failed: {e}")
             return None
         
+    def _throttle(self, endpoint: str = None, params: Optional[dict[str, Any]] = None) -> None:
+        """Waits for the provider's rate limit before a request is sent"""
+        if self.rate_limit_key is not None:
+            RateLimiterRegistry.acquire(self.rate_limit_key, self._endpoint_class(endpoint, params))
+
+    def _endpoint_class(self, endpoint: str = None, params: Optional[dict[str, Any]] = None) -> Optional[str]:
+        """Name of the endpoint class a request is rate limited under. Override for query style APIs."""
+        return endpoint.strip('/') if endpoint else None
+
     # def batch_get()
     # fun to make one api call with multiple endpoints and multiple arguments
\ No newline at end of file
@@ -0,0 +1,264 @@
+from dataclasses import dataclass
+from src.readers.abstract_apis import AbstractBrokerAPI
+from src.services.market_data_service import MarketDataService
+from src.execution.configuration import Configuration
+from src.data_structures.order import Order
+from src.data_structures.position import Position
+from src.utilities.enums import Signal, PositionDirection
+from src.utilities.utils import timezone_from_calendar
+import numpy as np
+import pandas as pd
+import logging
+
+
+@dataclass
+class _PendingOrder:
+    ticker: str
+    quantity: float  # signed, negative sells
+    limit: float | None
+    reason: str
+    due: float  # seconds since epoch the order reaches the market
+    expires: float  # seconds since epoch, end of the day the order was placed
+    checked: int | None  # timestamp of the latest bar the order was checked against
+
+
+class SimulatedBrokerAPI(AbstractBrokerAPI):
+    """
+    In-memory broker filling orders against the bar stores of a MarketDataService.
+
+    Positions, cash and equity are kept in memory, so the pipeline runs without a
+    broker account, e.g. for backtests, load tests and benchmarks. Orders are filled
+    with a configurable fill model:
+
+    - Market orders are filled at the close of the latest bar, moved against the
+      order by the slippage.
+    - Limit orders are filled like market orders when the latest close is at or better
+      than the limit, never at a worse price than the limit. Otherwise they rest until
+      the end of the day and are filled by the first later bar trading through the
+      limit, at its open or the limit, whichever is better.
+    - With a fill latency, orders only reach the market that many seconds after
+      they are placed and are filled against the bars of that time.
+    - Every fill pays a commission per share plus a rate of its notional, at least
+      the minimum commission.
+
+    The clock is the one of the MarketDataService. Like Alpaca, short positions have
+    a negative quantity and market value. Every fill is recorded, see trades.
+    """
+
+    def __init__(self,
+                 initial_cash: float = 100000.0,
+                 slippage_bps: float = 0.0,
+                 commission_per_share: float = 0.0,
+                 commission_bps: float = 0.0,
+                 min_commission: float = 0.0,
+                 fill_latency: float = 0.0) -> None:
+        super().__init__()
+        self.client_api = None
+        self.initial_cash = initial_cash
+        self.slippage_bps = slippage_bps
+        self.commission_per_share = commission_per_share
+        self.commission_bps = commission_bps
+        self.min_commission = min_commission
+        self.fill_latency = fill_latency
+        self.timezone = "UTC"
+        self.mkdata_service: MarketDataService | None = None
+        self.api_name: str | None = None
+        self._cash = initial_cash
+        # Signed quantity and average entry price per ticker
+        self._holdings: dict[str, tuple[float, float]] = {}
+        self._pending: list[_PendingOrder] = []
+        self._trades: list[dict] = []
+
+    def connect(self, config: Configuration) -> None:
+        self.initial_cash = config.initial_cash
+        self.slippage_bps = config.slippage_bps
+        self.commission_per_share = config.commission_per_share
+        self.commission_bps = config.commission_bps
+        self.min_commission = config.min_commission
+        self.fill_latency = config.fill_latency
+        self.timezone = timezone_from_calendar(config.market)
+        self.api_name = config.market_data_api
+        self._cash = config.initial_cash
+        logging.info(f"Simulated broker started with {self._cash} cash")
+
+    def attach_market_data(self, mkdata_service: MarketDataService, api_name: str | None = None) -> None:
+        self.mkdata_service = mkdata_service
+        if api_name is not None:
+            self.api_name = api_name
+
+    @property
+    def trades(self) -> pd.DataFrame:
+        """Fills so far: time, ticker, quantity (signed), price, commission and reason"""
+        return pd.DataFrame(self._trades, columns=["time", "ticker", "quantity", "price", "commission", "reason"])
+
+    @property
+    def pending_orders(self) -> int:
+        return len(self._pending)
+
+    def place_market_order(self, order: Order) -> None:
+        quantity = self._signed_quantity(order)
+        if quantity is not None:
+            self._submit(order.ticker, quantity, None, "market")
+
+    def place_limit_order(self, order: Order) -> None:
+        quantity = self._signed_quantity(order)
+        if quantity is not None:
+            self._submit(order.ticker, quantity, order.price, "limit")
+
+    def get_all_positions(self) -> list[Position]:
+        self._process_pending()
+        positions = []
+        for ticker, (quantity, average_price) in self._holdings.items():
+            price = self._price(ticker)
+            price = average_price if price is None else price
+            positions.append(Position(
+                ticker,
+                PositionDirection.LONG if quantity > 0 else PositionDirection.SHORT,
+                quantity,
+                average_price,
+                None,
+                quantity * price,
+                price,
+                quantity * (price - average_price)
+                ))
+        return positions
+
+    def get_cash(self) -> float:
+        self._process_pending()
+        return self._cash
+
+    def get_equity(self) -> float:
+        self._process_pending()
+        equity = self._cash
+        for ticker, (quantity, average_price) in self._holdings.items():
+            price = self._price(ticker)
+            equity += quantity * (average_price if price is None else price)
+        return equity
+
+    def close_all_positions(self) -> None:
+        # Like Alpaca, the open orders are cancelled first
+        self._pending = []
+        self.close_positions(list(self._holdings))
+
+    def close_positions(self, tickers: list[str]) -> None:
+        self._process_pending()
+        closing = {order.ticker for order in self._pending if order.reason == "close"}
+        for ticker in tickers:
+            if ticker in self._holdings and ticker not in closing:
+                self._submit(ticker, -self._holdings[ticker][0], None, "close")
+
+    def _signed_quantity(self, order: Order) -> float | None:
+        if order.direction == Signal.BUY:
+            return order.quantity
+        elif order.direction == Signal.SELL:
+            return -order.quantity
+        elif order.direction == Signal.HOLD:
+            logging.debug(f"Order direction is HOLD, no order placed")
+            return None
+        raise ValueError(f"Invalid order direction: {order.direction}")
+
+    def _submit(self, ticker: str, quantity: float, limit: float | None, reason: str) -> None:
+        now = self.mkdata_service.now(self.timezone)
+        expires = (now.normalize() + pd.Timedelta(days=1)).timestamp()
+        order = _PendingOrder(ticker, quantity, limit, reason, now.timestamp() + self.fill_latency, expires, self._latest_bar(ticker))
+
+        if self.fill_latency > 0 or not self._execute(order):
+            self._pending.append(order)
+
+    def _process_pending(self) -> None:
+        """Fills the orders that reached the market by now, or expires them at the end of their day"""
+        if not self._pending:
+            return None
+
+        now = self.mkdata_service.clock()
+        remaining = []
+        for order in self._pending:
+            if order.due > now:
+                remaining.append(order)
+            elif self._execute(order):
+                continue
+            elif now < order.expires:
+                remaining.append(order)
+            else:
+                logging.debug(f"Simulated broker: {order.reason} order for {order.quantity} {order.ticker} expired")
+        self._pending = remaining
+
+    def _execute(self, order: _PendingOrder) -> bool:
+        """Fills the order if the bars allow it, returns whether it was filled"""
+        price = self._fill_price(order)
+        if price is None:
+            return False
+        self._fill(order.ticker, order.quantity, price, order.reason)
+        return True
+
+    def _fill_price(self, order: _PendingOrder) -> float | None:
+        buy = order.quantity > 0
+        with self.mkdata_service.state.lock:
+            store = self.mkdata_service.state.get_bar_store(self.api_name, order.ticker)
+            if store is None or store.empty:
+                logging.warning(f"Simulated broker: no bars for {order.ticker}, {order.reason} order not filled")
+                return None
+
+            latest = int(store.timestamps[-1])
+            if order.limit is None:
+                return self._slipped(float(store.column("close")[-1]), order.quantity)
+
+            if order.checked == latest:
+                # No new bar since the order was placed or last checked, compare the limit with the latest close
+                close = float(store.column("close")[-1])
+                if (close > order.limit) if buy else (close < order.limit):
+                    return None
+                price = self._slipped(close, order.quantity)
+            else:
+                # The first bar trading through the limit since the last check fills the order
+                start = 0 if order.checked is None else int(np.searchsorted(store.timestamps, order.checked, side="right"))
+                touched = store.column("low")[start:] <= order.limit if buy else store.column("high")[start:] >= order.limit
+                order.checked = latest
+                if not touched.any():
+                    return None
+                price = self._slipped(float(store.column("open")[start + int(np.argmax(touched))]), order.quantity)
+
+        return min(price, order.limit) if buy else max(price, order.limit)
+
+    def _slipped(self, price: float, quantity: float) -> float:
+        """Price moved against the order by the slippage"""
+        return price * (1.0 + self.slippage_bps * 1e-4) if quantity > 0 else price * (1.0 - self.slippage_bps * 1e-4)
+
+    def _commission(self, quantity: float, price: float) -> float:
+        commission = abs(quantity) * (self.commission_per_share + price * self.commission_bps * 1e-4)
+        return max(commission, self.min_commission)
+
+    def _price(self, ticker: str) -> float | None:
+        return self.mkdata_service.get_latest_price(self.api_name, ticker, "close")
+
+    def _latest_bar(self, ticker: str) -> int | None:
+        with self.mkdata_service.state.lock:
+            store = self.mkdata_service.state.get_bar_store(self.api_name, ticker)
+            return int(store.timestamps[-1]) if store is not None and not store.empty else None
+
+    def _fill(self, ticker: str, quantity: float, price: float, reason: str) -> None:
+        held, average_price = self._holdings.get(ticker, (0.0, 0.0))
+        total = held + quantity
+
+        if abs(total) < 1e-12:
+            self._holdings.pop(ticker, None)
+        elif held == 0.0 or (held > 0) == (quantity > 0):
+            self._holdings[ticker] = (total, (held * average_price + quantity * price) / total)
+        elif (held > 0) == (total > 0):
+            # Reduced, the remaining units keep their entry price
+            self._holdings[ticker] = (total, average_price)
+        else:
+            # Reversed, the new position is entered at the fill price
+            self._holdings[ticker] = (total, price)
+
+        commission = self._commission(quantity, price)
+        self._cash -= quantity * price + commission
+        self._trades.append({
+            "time": self.mkdata_service.now(),
+            "ticker": ticker,
+            "quantity": quantity,
+            "price": price,
+            "commission": commission,
+            "reason": reason
+            })
+        logging.debug(f"Simulated broker: filled {quantity} {ticker} at {price} ({reason}), commission {commission}")
@@ -8,9 +8,10 @@ from src.execution.configuration import Configuration
 import os
 from src.parsers.time_series_json_parsers import TwelveDataTimeSeriesJSONParser
 from src.data_structures.time_series_inputs import TimeSeriesInputs, TwelveDataTimeSeriesInputs
-from src.utilities.utils import split_tenor_string
+from src.utilities.utils import split_tenor_string, chunked
 from typing import Optional, Any
 from src.utilities.period import Period
+from src.utilities.rate_limiter import RateLimiterRegistry
 
 
 class TwelveDataAPI(AbstractMarketDataAPI):
@@ -33,6 +34,10 @@ class TwelveDataAPI(AbstractMarketDataAPI):
         
         logging.info("Successfully connected to Twelve Data")
 
+    # Maximum number of comma separated symbols sent in a single batch request
+    max_batch_size = 120
+    rate_limit_key = "twelve_data"
+
     def get_historical_prices(self, 
                               symbol: str, 
                               interval: Period, 
@@ -40,12 +45,10 @@ class TwelveDataAPI(AbstractMarketDataAPI):
                               end_date: Optional[str] = None,
                               number_points: Optional[int] = None,
                               timezone: str = None) -> pd.DataFrame:
-        if interval.tenor == "d":
-            interval = str(interval.units) + "day"
-
+        RateLimiterRegistry.acquire(self.rate_limit_key, "time_series")
         data = self.client_api.time_series(
             symbol=symbol,
-            interval=interval,
+            interval=self._format_interval(interval),
             start_date=start_date,
             end_date=end_date,
             outputsize=number_points,
@@ -54,6 +57,43 @@ class TwelveDataAPI(AbstractMarketDataAPI):
 
         return TwelveDataTimeSeriesJSONParser.parse(data, timezone)
 
+    def get_historical_prices_batch(self, 
+                                    symbols: list[str], 
+                                    interval: Period, 
+                                    start_date: Optional[str] = None, 
+                                    end_date: Optional[str] = None,
+                                    number_points: Optional[int] = None,
+                                    timezone: str = None) -> dict[str, pd.DataFrame]:
+        """
+        Fetch historical prices for several symbols with multi-symbol time series requests.
+        Symbols the provider returns an error for are logged and left out of the result.
+        """
+        prices = {}
+        for chunk in chunked(symbols, self.max_batch_size):
+            # Twelve Data charges one credit per symbol in a batch
+            RateLimiterRegistry.acquire(self.rate_limit_key, "time_series", len(chunk))
+            data = self.client_api.time_series(
+                symbol=",".join(chunk),
+                interval=self._format_interval(interval),
+                start_date=start_date,
+                end_date=end_date,
+                outputsize=number_points,
+                timezone=timezone
+            ).as_json()
+
+            if len(chunk) == 1:
+                data = {chunk[0]: data}
+
+            for symbol, values in data.items():
+                prices[symbol] = TwelveDataTimeSeriesJSONParser.parse(values, timezone)
+
+            # The SDK drops the symbols of a batch the provider returned an error for
+            missing = [symbol for symbol in chunk if symbol not in data]
+            if missing:
+                logging.error(f"Twelve Data returned no time series for {', '.join(missing)}")
+
+        return prices
+
     def get_intraday_prices(self,
                             symbol: str, 
                             interval: Period,
@@ -68,6 +108,13 @@ class TwelveDataAPI(AbstractMarketDataAPI):
         """
         return self.get_historical_prices(symbol, interval, None, None, number_points, timezone)
 
+    def get_intraday_prices_batch(self,
+                                  symbols: list[str], 
+                                  interval: Period,
+                                  number_points: int,
+                                  timezone: str = None) -> dict[str, pd.DataFrame]:
+        return self.get_historical_prices_batch(symbols, interval, None, None, number_points, timezone)
+
     def get_real_time_price(self, symbol: str) -> float:
         """
         Fetch real-time price for a given symbol.
@@ -75,8 +122,40 @@ class TwelveDataAPI(AbstractMarketDataAPI):
         :param symbol: The stock/crypto/forex symbol.
         :return: Real-time price as a dictionary.
         """
+        RateLimiterRegistry.acquire(self.rate_limit_key, "price")
         price = self.client_api.price(symbol=symbol).as_json()
         return float(price['price'])
+
+    def get_real_time_prices(self, symbols: list[str]) -> dict[str, float]:
+        """
+        Fetch real-time prices for several symbols with multi-symbol price requests.
+
+        :param symbols: The stock/crypto/forex symbols.
+        :return: Real-time price per symbol.
+        """
+        prices = {}
+        for chunk in chunked(symbols, self.max_batch_size):
+            RateLimiterRegistry.acquire(self.rate_limit_key, "price", len(chunk))
+            data = self.client_api.price(symbol=",".join(chunk)).as_json()
+
+            if len(chunk) == 1:
+                data = {chunk[0]: data}
+
+            for symbol, price in data.items():
+                if 'price' not in price:
+                    logging.error(f"Twelve Data price error for {symbol}: {price.get('message')}")
+                    continue
+
+                prices[symbol] = float(price['price'])
+
+        return prices
+
+    @staticmethod
+    def _format_interval(interval: Period) -> str:
+        """Converts a Period to the Twelve Data interval format"""
+        if interval.tenor == "d":
+            return str(interval.units) + "day"
+        return str(interval)
     
     def quote(self, symbol, interval):
         return self.client_api.quote(symbol=symbol, interval=interval).as_json()
@@ -0,0 +1,76 @@
+from src.readers.abstract_streams import AbstractPriceStream
+import websocket
+import threading
+import logging
+import json
+import os
+
+
+class TwelveDataPriceStream(AbstractPriceStream):
+    """
+    Twelve Data WebSocket price stream. Price events carry the cumulative day volume,
+    which is converted to the volume traded since the previous event.
+    """
+    URL = "wss://ws.twelvedata.com/v1/quotes/price?apikey={api_key}"
+    HEARTBEAT_SECONDS = 10
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.api_key = os.environ.get('TWELVE_DATA_KEY', 'WRONG-KEY')
+        self._ws: websocket.WebSocketApp | None = None
+        self._connected = threading.Event()
+        self._stopped = threading.Event()
+        self._day_volumes: dict[str, float] = {}
+
+    def start(self) -> None:
+        self._stopped.clear()
+        self._ws = websocket.WebSocketApp(
+            self.URL.format(api_key=self.api_key),
+            on_open=self._on_open,
+            on_message=self._on_message,
+            on_error=lambda ws, err: logging.error(f"Twelve Data stream error: {err}"),
+            on_close=self._on_close,
+        )
+        threading.Thread(target=self._ws.run_forever, kwargs={"reconnect": 5}, daemon=True, name="td-stream").start()
+        threading.Thread(target=self._heartbeat, daemon=True, name="td-stream-heartbeat").start()
+
+    def stop(self) -> None:
+        self._stopped.set()
+        if self._ws is not None:
+            self._ws.close()
+
+    def _send_subscription(self, symbols: list[str]) -> None:
+        if self._connected.is_set():
+            self._ws.send(json.dumps({"action": "subscribe", "params": {"symbols": ",".join(symbols)}}))
+
+    def _on_open(self, ws) -> None:
+        logging.info("Connected to Twelve Data price stream")
+        self._connected.set()
+        if self.symbols:
+            self._send_subscription(self.symbols)
+
+    def _on_close(self, ws, status_code, message) -> None:
+        logging.warning(f"Twelve Data price stream closed: {status_code} {message}")
+        self._connected.clear()
+
+    def _on_message(self, ws, message: str) -> None:
+        event = json.loads(message)
+        if event.get("event") == "subscribe-status" and event.get("fails"):
+            logging.error(f"Twelve Data stream subscription failed for: {event['fails']}")
+        if event.get("event") != "price":
+            return None
+
+        symbol = event["symbol"]
+        day_volume = float(event.get("day_volume") or 0.0)
+        volume = max(0.0, day_volume - self._day_volumes.get(symbol, day_volume))
+        self._day_volumes[symbol] = day_volume
+
+        self._publish(symbol, int(event["timestamp"]) * 1_000_000_000, float(event["price"]), volume)
+
+    def _heartbeat(self) -> None:
+        while not self._stopped.wait(self.HEARTBEAT_SECONDS):
+            if self._connected.is_set():
+                try:
+                    self._ws.send(json.dumps({"action": "heartbeat"}))
+                except websocket.WebSocketException as err:
+                    logging.warning(f"Twelve Data stream heartbeat failed: {err}")
@@ -1,50 +1,149 @@
 from src.data_structures.marketdata_state import MarketDataState
 import pandas as pd
-from typing import Optional
+import numpy as np
+from typing import Callable, Optional
+import time
 
 
 class MarketDataService:
     """The market data service layer focuses on reusable business logic, 
-    operating on the market data state."""
+    operating on the market data state.
 
-    def __init__(self, state: MarketDataState) -> None:
+    :param clock: Returns the current time in seconds since epoch. Replaced by a simulated clock in backtests.
+    """
+
+    def __init__(self, state: MarketDataState, clock: Callable[[], float] = time.time) -> None:
         self.state = state
+        self.clock = clock
+
+    def now(self, timezone=None) -> pd.Timestamp:
+        """Current time of the service's clock, strategies use it instead of the wall clock"""
+        now = pd.Timestamp(self.clock(), unit="s", tz="UTC")
+        return now.tz_convert(timezone) if timezone is not None else now
 
     def get_latest_price(self, api_name: str, ticker: str, price_type: str = 'close') -> float:
-        """Retrieve the latest price for a given ticker from the market data."""
-        return self.get_latest_entry(api_name, ticker)[price_type]
+        """Retrieve the latest price for a given ticker from the market data. O(1)."""
+        with self.state.lock:
+            store = self.state.get_bar_store(api_name, ticker)
+            if store is None or store.empty:
+                return None
+            return float(store.column(price_type)[-1])
     
-    def get_latest_entry(self, api_name: str, ticker: str) -> float:
-        """Retrieve the latest price for a given ticker from the market data."""
-        data = self.state.market_data.get(api_name, {}).get(ticker, None)
-        if data is None or data.empty:
-            return None
-        
-        return data.iloc[0]
+    def get_latest_entry(self, api_name: str, ticker: str) -> pd.Series:
+        """Retrieve the latest bar for a given ticker from the market data. O(1)."""
+        with self.state.lock:
+            store = self.state.get_bar_store(api_name, ticker)
+            if store is None or store.empty:
+                return None
+            return pd.Series(store.bar(-1), name=store.latest_timestamp)
     
     def get_price(self, api_name: str, ticker: str, date: pd.Timestamp, price_type: str = 'close') -> float:
-        data = self.state.market_data.get(api_name, {}).get(ticker, None)
-        if data is None or data.empty:
-            return None
-        
-        return float(data.loc[date][price_type])
+        """Price of the bar at exactly the given timestamp. Raises a KeyError if there is no such bar."""
+        with self.state.lock:
+            store = self.state.get_bar_store(api_name, ticker)
+            if store is None or store.empty:
+                return None
+
+            position = store.locate(date)
+            if position is None:
+                raise KeyError(f"No {ticker} bar at {date}")
+            return float(store.column(price_type)[position])
+
+    def get_price_asof(self, api_name: str, ticker: str, date: pd.Timestamp, price_type: str = 'close') -> float:
+        """Price of the latest bar at or before the given timestamp, None if there is none"""
+        with self.state.lock:
+            store = self.state.get_bar_store(api_name, ticker)
+            if store is None or store.empty:
+                return None
+
+            position = store.asof(date)
+            return float(store.column(price_type)[position]) if position is not None else None
     
+    def get_first_price(self, api_name: str, ticker: str, date: pd.Timestamp, price_type: str = 'close') -> float:
+        """Price of the first bar at or after the given timestamp, None if there is none"""
+        with self.state.lock:
+            store = self.state.get_bar_store(api_name, ticker)
+            if store is None or store.empty:
+                return None
+
+            position = store.between(date, date).start
+            return float(store.column(price_type)[position]) if position < len(store) else None
+
     def get_real_time_price(self, symbol: str, api_name: str = "twelve_data") -> float:
         return self.state.apis[api_name].get_real_time_price(symbol)
 
+    def get_real_time_prices(self, symbols: list[str], api_name: str = "twelve_data") -> dict[str, float]:
+        """Latest prices from the price stream when available, only the missing symbols are polled"""
+        prices = self.state.get_streamed_prices(symbols)
+        missing = [symbol for symbol in symbols if symbol not in prices]
+        if missing:
+            prices.update(self.state.apis[api_name].get_real_time_prices(missing))
+        return prices
+
     def filter_data_by_date(self, api_name: str, ticker: str, start_date: pd.Timestamp, end_date: pd.Timestamp) -> pd.DataFrame:
         """Filter market data for a specific ticker by date range."""
-        data = self.state.market_data.get(api_name, {}).get(ticker, None)
-        if data is None or data.empty:
-            return pd.DataFrame()
-        return data.loc[start_date:end_date]
+        with self.state.lock:
+            store = self.state.get_bar_store(api_name, ticker)
+            if store is None or store.empty:
+                return pd.DataFrame()
+            return store.to_dataframe(store.between(start_date, end_date))
     
+    def window(self, ticker: str, field: str, n: int, api_name: str = "twelve_data") -> np.ndarray:
+        """
+        Read-only view of the latest n values of a field for a ticker, oldest first.
+        The data is not copied, so the view must not be kept across state refreshes.
+        """
+        with self.state.lock:
+            store = self.state.get_bar_store(api_name, ticker)
+            if store is None:
+                return np.empty(0, dtype=np.float64)
+            return store.window(field, n)
+
+    def panel(self, tickers: list[str], field: str, n: int, api_name: str = "twelve_data") -> np.ndarray:
+        """
+        Read-only tickers x time array of the latest n values of a field, oldest first.
+
+        Tickers populated together are stored in shared buffers and returned as a view without
+        copying. Otherwise the rows are gathered once and aligned on the latest n timestamps of
+        all tickers, with NaN for missing bars. Like window, the result must not be kept across
+        state refreshes.
+        """
+        with self.state.lock:
+            view = self.state.get_panel(api_name, tickers, field, n)
+            if view is not None:
+                return view
+
+            stores = [self.state.get_bar_store(api_name, ticker) for ticker in tickers]
+            stores = [store if store is not None and not store.empty else None for store in stores]
+            latest = [store.timestamps[max(len(store) - n, 0):] for store in stores if store is not None]
+            timestamps = np.unique(np.concatenate(latest)) if latest else np.empty(0, dtype=np.int64)
+            timestamps = timestamps[max(len(timestamps) - n, 0):]
+
+            panel = np.full((len(tickers), len(timestamps)), np.nan)
+            for row, store in enumerate(stores):
+                if store is None:
+                    continue
+                positions = np.minimum(np.searchsorted(store.timestamps, timestamps), len(store) - 1)
+                found = store.timestamps[positions] == timestamps
+                panel[row, found] = store.column(field)[positions[found]]
+
+        panel.flags.writeable = False
+        return panel
+
     def get_news(self, 
                  api_name: str, 
                  ticker: str, 
                  from_date: Optional[pd.Timestamp] = None, 
                  to_date: Optional[pd.Timestamp] = None) -> pd.DataFrame:
+        """News of the ticker from the news store when it was populated, see refresh_news. Otherwise from the API."""
+        news_store = self.state.get_news_store(api_name)
+        if news_store is not None and news_store.tracks(ticker):
+            return news_store.get_news(ticker, from_date, to_date)
         return self.state.apis[api_name].get_news(ticker, from_date, to_date)
 
+    def refresh_news(self, api_name: str, tickers: list[str], since: pd.Timestamp) -> None:
+        """Fetches the articles published since the previous refresh for all tickers, see MarketDataState.populate_news"""
+        self.state.populate_news(api_name, tickers, since)
+
             
 
@@ -22,3 +22,18 @@ class AbstractStrategy(ABC):
         :return: dict of Signals
         """
         pass
+
+    @staticmethod
+    def start(cfg: Configuration) -> None:
+        """Prepares the strategy before the first iteration, e.g. loads models"""
+        pass
+
+    @staticmethod
+    def shutdown() -> None:
+        """Releases the resources of the strategy at the end of the session"""
+        pass
+
+    @staticmethod
+    def statistics() -> dict[str, dict[str, int]]:
+        """Counters per ticker of the latest iteration, accumulated by the StatisticsGatherer"""
+        return {}
@@ -14,12 +14,22 @@ class MarketOpenMomentumStrategy(AbstractStrategy):
         logging.info(f"Generating signals using {__class__.__name__}")
         signals = {}
 
-        now = pd.Timestamp.now(tz=timezone_from_calendar(cfg.market))
+        now = mkdata_service.now(timezone_from_calendar(cfg.market))
         today = now.normalize()
 
+        current_prices = mkdata_service.get_real_time_prices(tickers, cfg.market_data_api)
+
         for ticker in tickers:
-            current_price = mkdata_service.get_real_time_price(ticker, cfg.market_data_api)
-            open_price = mkdata_service.get_price(cfg.market_data_api, ticker, today, 'open')
+            current_price = current_prices.get(ticker)
+            if current_price is None:
+                logging.warning(f"No real time price for {ticker}. Skipping signal.")
+                continue
+
+            # Open of the first bar of the day, the daily bar when the state holds one for today
+            open_price = mkdata_service.get_first_price(cfg.market_data_api, ticker, today, 'open')
+            if open_price is None:
+                logging.warning(f"No bar for {ticker} today. Skipping signal.")
+                continue
 
             message_str = f"{ticker} open price: {open_price}.  Current price: {current_price}"
             logging.debug(message_str)
@@ -34,5 +44,6 @@ class MarketOpenMomentumStrategy(AbstractStrategy):
             signals[ticker] = signal
 
             logging.info(f"Signal for {ticker}: {signal}")
-            return signals
+
+        return signals
     
\ No newline at end of file
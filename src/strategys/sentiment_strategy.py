@@ -1,79 +1,249 @@
 from src.strategys.abstract_strategy import AbstractStrategy
 from src.services.market_data_service import MarketDataService
 from src.execution.configuration import Configuration
-from transformers import AutoTokenizer, AutoModelForSequenceClassification, pipeline
-import torch
-import requests
-from bs4 import BeautifulSoup
-import re
+from src.utilities.sentiment_scorer import SentimentScorer
+from src.utilities.model_registry import ModelRegistry
+from src.data_structures.sentiment_store import SentimentStore
+from src.utilities.sentiment_workers import SentimentWorkerPool
+from concurrent.futures import Future, wait
+from dataclasses import dataclass
+import numpy as np
+import time
 import logging
 from src.utilities.enums import Signal
 import pandas as pd
 from src.utilities.utils import timezone_from_calendar
-from src.readers.alpha_vantage_mkdata_api import AlphaVantageAPI
+
+
+@dataclass
+class SentimentJob:
+    """
+    Sentiment of a ticker's articles of today and yesterday, the first today_count articles are today's.
+
+    Attributes:
+        future (Future): Model predictions of the escalated articles, see SentimentWorkerPool.submit.
+        today_count (int): Number of articles of today.
+        positive (np.ndarray): Positive share per article from the provider scores, NaN for the escalated articles.
+        weights (np.ndarray): Weight of every article in the average, its relevance to the ticker.
+        escalated (np.ndarray): Positions of the articles scored by the models.
+    """
+    future: Future
+    today_count: int
+    positive: np.ndarray
+    weights: np.ndarray
+    escalated: np.ndarray
 
 
 class BERTBasedSentimentStrategy(AbstractStrategy):
+    # Default model of the transformers sentiment-analysis pipeline
+    DISTILBERT_MODEL = 'distilbert/distilbert-base-uncased-finetuned-sst-2-english'
+    BERT_MODEL = 'nlptown/bert-base-multilingual-uncased-sentiment'
+    MODEL_IDS = [DISTILBERT_MODEL, BERT_MODEL]
+
+    # Scores of articles seen in earlier iterations, created on first use
+    _score_store: SentimentStore | None = None
+
+    # Sentiment workers, the scoring job still running per ticker and the last signal computed per ticker
+    _worker_pool: SentimentWorkerPool | None = None
+    _pending: dict[str, SentimentJob] = {}
+    _last_signals: dict[str, Signal] = {}
+    _positive_label: int = 1
+
+    # Number of articles per ticker scored from the provider scores and by the models in the latest iteration
+    _tier_counts: dict[str, dict[str, int]] = {}
 
     @staticmethod
     def generate_signals(mkdata_service: MarketDataService, tickers: list[str], cfg: Configuration) -> dict[str, Signal]:     
-        """We compare whether the news today was better than yesterday. If so buy, if not sell. Hold if no change."""   
+        """We compare whether the news today was better than yesterday. If so buy, if not sell. Hold if no change.
+
+        In the tiered mode an article's sentiment is the provider score for the ticker, articles weighted by 
+        their relevance to the ticker. Only articles with a missing, weak (low relevance) or ambiguous (close 
+        to neutral) provider score are scored by the models. In the model mode every article is scored by the models.
+        """   
         logging.info(f"Generating signals using {__class__.__name__}")
+        started = time.monotonic()
         signals = {}
 
-        now = pd.Timestamp.now(tz=timezone_from_calendar(cfg.market))
+        now = mkdata_service.now(timezone_from_calendar(cfg.market))
         today = now.normalize()
-        yesterday = now - pd.Timedelta(days=1)
+        yesterday = (now - pd.Timedelta(days=1)).normalize()
         yesterday_eod = pd.Timestamp(yesterday.year, yesterday.month, yesterday.day, 16, 0, tz=timezone_from_calendar(cfg.market))
 
+        # News of both days is scored in one job per ticker, tickers still scored from an earlier iteration are not resubmitted
+        pool = BERTBasedSentimentStrategy._get_worker_pool(cfg)
+        pending = BERTBasedSentimentStrategy._pending
+        BERTBasedSentimentStrategy._collect_pending()
+
+        # One incremental fetch for all tickers, the news of both days is then read from memory
+        submitted = [ticker for ticker in tickers if ticker not in pending]
+        if submitted:
+            mkdata_service.refresh_news(cfg.market_data_api, submitted, yesterday)
+
+        jobs, tiers = {}, {}
+        BERTBasedSentimentStrategy._tier_counts = {}
+        for ticker in submitted:
+            today_news = mkdata_service.get_news(cfg.market_data_api, ticker, today, now)
+            yesterday_news = mkdata_service.get_news(cfg.market_data_api, ticker, yesterday, yesterday_eod)
+            articles = [article for news in (today_news, yesterday_news) for article in news.to_dict("records")]
+
+            if cfg.sentiment_mode == "tiered":
+                positive, weights = BERTBasedSentimentStrategy._provider_sentiment(ticker, articles, cfg)
+            else:
+                positive, weights = np.full(len(articles), np.nan), np.ones(len(articles))
+            escalated = np.flatnonzero(np.isnan(positive))
+
+            summaries = [articles[i]['summary'] for i in escalated]
+            keys = [SentimentStore.article_key(articles[i].get('url'), articles[i]['summary']) for i in escalated]
+            jobs[ticker] = (summaries, keys)
+            tiers[ticker] = (len(today_news), positive, weights, escalated)
+            BERTBasedSentimentStrategy._tier_counts[ticker] = {"provider": len(articles) - len(escalated), "model": len(escalated)}
+
+        futures = pool.submit(BERTBasedSentimentStrategy.MODEL_IDS, jobs)
+        for ticker, future in futures.items():
+            pending[ticker] = SentimentJob(future, *tiers[ticker])
+
+        if submitted:
+            provider_count = sum(counts["provider"] for counts in BERTBasedSentimentStrategy._tier_counts.values())
+            model_count = sum(counts["model"] for counts in BERTBasedSentimentStrategy._tier_counts.values())
+            logging.info(f"Sentiment tiers: {provider_count} articles scored by the provider, {model_count} by the models")
+
+        # Wait for the scores until the deadline, the trading loop never blocks longer on the models
+        remaining = cfg.sentiment_deadline - (time.monotonic() - started)
+        wait([job.future for job in pending.values()], timeout=max(remaining, 0.0))
+        scored = BERTBasedSentimentStrategy._collect_pending()
+
+        last_signals = BERTBasedSentimentStrategy._last_signals
         for ticker in tickers:
+            if ticker in scored:
+                signal = last_signals[ticker]
+            else:
+                signal = last_signals.get(ticker, Signal.HOLD) if cfg.sentiment_fallback == "last" else Signal.HOLD
+                logging.warning(f"No sentiment scores for {ticker} within {cfg.sentiment_deadline}s. Falling back to {signal}")
 
-            news = mkdata_service.get_news(cfg.market_data_api, "TSLA", today, now)
-            yesterdays_news = mkdata_service.get_news(cfg.market_data_api, "TSLA", yesterday, yesterday_eod)
-
-            classifier = pipeline('sentiment-analysis')
-            news['DistilBERT_sentiment'] = news['summary'].apply(lambda x: classifier(x)[0]['label'])
-            yesterdays_news['DistilBERT_sentiment'] = yesterdays_news['summary'].apply(lambda x: classifier(x)[0]['label'])
-
-            tokenizer = AutoTokenizer.from_pretrained('nlptown/bert-base-multilingual-uncased-sentiment')
-            model = AutoModelForSequenceClassification.from_pretrained('nlptown/bert-base-multilingual-uncased-sentiment')
-
-            def get_pt_score(review):
-                tokens = tokenizer.encode(review, return_tensors='pt')
-                result = model(tokens)
-                return int(torch.argmax(result.logits))+1
+            logging.info(f"Sentiment signal for {ticker}: {signal}")
+            signals[ticker] = signal
 
-            news['BERT_pt_sentiment'] = news['summary'].apply(lambda x: get_pt_score(x))
-            yesterdays_news['BERT_pt_sentiment'] = yesterdays_news['summary'].apply(lambda x: get_pt_score(x))
+        return signals
 
-            # today avg
-            nrows = news.shape[0]
-            positive_count = news['DistilBERT_sentiment'].value_counts().get('POSITIVE', 0)
-            values_above_3_count = (news['BERT_pt_sentiment'] > 3).sum()
-            avg_positive = (positive_count + values_above_3_count) / (2 * nrows)
+    @staticmethod
+    def _collect_pending() -> set[str]:
+        """Turns the completed scoring jobs into the last known signals of their tickers, returns those tickers"""
+        scored = set()
+        positive_label = BERTBasedSentimentStrategy._positive_label
+        pending = BERTBasedSentimentStrategy._pending
+        for ticker, job in list(pending.items()):
+            if not job.future.done():
+                continue
+            del pending[ticker]
+
+            try:
+                predictions = job.future.result()
+            except Exception as err:
+                logging.error(f"Sentiment scoring failed for {ticker}: {err}")
+                continue
+
+            # An escalated article counts as half positive per model
+            positive = job.positive.copy()
+            positive[job.escalated] = (predictions[BERTBasedSentimentStrategy.DISTILBERT_MODEL] == positive_label).astype(float) / 2 \
+                + (predictions[BERTBasedSentimentStrategy.BERT_MODEL] + 1 > 3).astype(float) / 2
+            BERTBasedSentimentStrategy._last_signals[ticker] = BERTBasedSentimentStrategy._signal(
+                ticker, 
+                positive[:job.today_count], 
+                job.weights[:job.today_count], 
+                positive[job.today_count:], 
+                job.weights[job.today_count:]
+                )
+            scored.add(ticker)
+
+        return scored
 
-            msg = f"{ticker} has {(positive_count + values_above_3_count) / 2} out of {nrows} articles with positive sentiment"
-            logging.debug(msg)
+    @staticmethod
+    def _provider_sentiment(ticker: str, articles: list[dict], cfg: Configuration) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Positive share of the articles from the provider's sentiment scores, and their relevance to the ticker.
+        NaN for articles whose score is missing, weak or ambiguous, those are left to the models.
+        """
+        positive, weights = np.full(len(articles), np.nan), np.ones(len(articles))
+        for i, article in enumerate(articles):
+            entries = [entry for entry in article.get('ticker_sentiment') or [] if entry.get('ticker') == ticker]
+            if entries:
+                score, relevance = float(entries[0]['ticker_sentiment_score']), float(entries[0]['relevance_score'])
+            else:
+                score, relevance = float(article.get('overall_sentiment_score', np.nan)), np.nan
 
-            # yesterday avg
-            yesterday_nrows = yesterdays_news.shape[0]
-            yesterday_positive_count = yesterdays_news['DistilBERT_sentiment'].value_counts().get('POSITIVE', 0)
-            yesterday_values_above_3_count = (yesterdays_news['BERT_pt_sentiment'] > 3).sum()
-            yesterday_avg_positive = (yesterday_positive_count + yesterday_values_above_3_count) / (2 * yesterday_nrows)
+            # Articles barely about the ticker are weak, scores close to neutral are ambiguous
+            if not np.isnan(relevance):
+                weights[i] = relevance
+                if relevance < cfg.min_ticker_relevance:
+                    continue
+            if np.isnan(score) or abs(score) < cfg.provider_sentiment_threshold:
+                continue
+            positive[i] = float(score > 0)
 
-            msg = f"Yesterday {ticker} had {(positive_count + values_above_3_count) / 2} out of {nrows} articles with positive sentiment"
-            logging.debug(msg)
+        return positive, weights
 
-            if avg_positive > yesterday_avg_positive:
-                signal = Signal.BUY
-            elif avg_positive < yesterday_avg_positive:
-                signal = Signal.SELL
-            else:
-                signal = Signal.HOLD
+    @staticmethod
+    def _signal(ticker: str, 
+                positive_today: np.ndarray, 
+                weights_today: np.ndarray, 
+                positive_yesterday: np.ndarray, 
+                weights_yesterday: np.ndarray) -> Signal:
+        # Relevance weighted share of articles with a positive sentiment, NaN without news leads to a HOLD
+        nrows = len(positive_today)
+        avg_positive = (positive_today * weights_today).sum() / weights_today.sum() if nrows and weights_today.sum() > 0 else np.nan
+        logging.debug(f"{ticker} has {positive_today.sum()} out of {nrows} articles with positive sentiment")
+
+        yesterday_nrows = len(positive_yesterday)
+        yesterday_avg_positive = (positive_yesterday * weights_yesterday).sum() / weights_yesterday.sum() \
+            if yesterday_nrows and weights_yesterday.sum() > 0 else np.nan
+        msg = f"Yesterday {ticker} had {positive_yesterday.sum()} out of {yesterday_nrows} articles with positive sentiment"
+        logging.debug(msg)
+
+        if avg_positive > yesterday_avg_positive:
+            return Signal.BUY
+        elif avg_positive < yesterday_avg_positive:
+            return Signal.SELL
+        return Signal.HOLD
 
-            logging.info(f"Sentiment signal for {ticker}: {signal}")
-            signals[ticker] = signal
+    @staticmethod
+    def _get_worker_pool(cfg: Configuration) -> SentimentWorkerPool:
+        if BERTBasedSentimentStrategy._worker_pool is None:
+            scorer = SentimentScorer(cfg.sentiment_batch_size, 
+                                     cfg.inference_threads, 
+                                     BERTBasedSentimentStrategy._get_score_store(cfg), 
+                                     cfg.inference_backend, 
+                                     cfg.onnx_dir)
+            model_ids = BERTBasedSentimentStrategy.MODEL_IDS if cfg.warm_up_models else None
+            BERTBasedSentimentStrategy._worker_pool = SentimentWorkerPool(cfg.sentiment_workers, scorer, model_ids)
+            BERTBasedSentimentStrategy._positive_label = scorer.label_id(BERTBasedSentimentStrategy.DISTILBERT_MODEL, 'POSITIVE')
+        return BERTBasedSentimentStrategy._worker_pool
 
+    @staticmethod
+    def statistics() -> dict[str, dict[str, int]]:
+        """Articles per ticker scored from the provider scores and by the models in the latest iteration"""
+        return {
+            ticker: {f"{tier}_sentiment": count for tier, count in counts.items()} 
+            for ticker, counts in BERTBasedSentimentStrategy._tier_counts.items()
+        }
 
+    @staticmethod
+    def start(cfg: Configuration) -> None:
+        """Loads the models ahead of the first iteration. Sentiment workers load the models themselves."""
+        if cfg.sentiment_workers > 0:
+            BERTBasedSentimentStrategy._get_worker_pool(cfg).start()
+        elif cfg.warm_up_models:
+            ModelRegistry.warm_up(BERTBasedSentimentStrategy.MODEL_IDS, cfg.inference_backend, cfg.onnx_dir)
 
+    @staticmethod
+    def shutdown() -> None:
+        """Stops the sentiment workers, scoring jobs still running are abandoned"""
+        if BERTBasedSentimentStrategy._worker_pool is not None:
+            BERTBasedSentimentStrategy._worker_pool.shutdown()
+            BERTBasedSentimentStrategy._worker_pool = None
+        BERTBasedSentimentStrategy._pending.clear()
 
+    @staticmethod
+    def _get_score_store(cfg: Configuration) -> SentimentStore:
+        if BERTBasedSentimentStrategy._score_store is None:
+            BERTBasedSentimentStrategy._score_store = SentimentStore(cfg.sentiment_store_path, cfg.sentiment_cache_size)
+        return BERTBasedSentimentStrategy._score_store
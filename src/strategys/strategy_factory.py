@@ -0,0 +1,15 @@
+from src.strategys.abstract_strategy import AbstractStrategy
+from src.utilities.plugin_registry import PluginRegistry
+
+
+class StrategyFactory:
+
+    # The sentiment strategy imports torch and transformers, only when it is selected
+    registry = PluginRegistry("strategy", {
+        "market_open_momentum": "src.strategys.market_open_momentum_strategy:MarketOpenMomentumStrategy",
+        "bert_sentiment": "src.strategys.sentiment_strategy:BERTBasedSentimentStrategy",
+        })
+
+    @staticmethod
+    def create_instance(strategy_type: str) -> AbstractStrategy:
+        return StrategyFactory.registry.load(strategy_type)()
@@ -0,0 +1,139 @@
+from dataclasses import dataclass
+from typing import Callable, Iterator, Optional
+from src.utilities.period import Period
+from src.utilities.utils import trading_session
+import pandas as pd
+import logging
+import time
+
+
+@dataclass
+class TickMetrics:
+    """
+    Timing of one scheduled iteration.
+
+    Attributes:
+        bar_close (pd.Timestamp): Close of the bar the iteration processed.
+        jitter (float): Seconds between the scheduled and the actual start.
+        duration (float): Seconds the iteration took.
+        overrun (float): Seconds the iteration ran past the next scheduled start, 0 if it finished in time.
+        skipped (int): Earlier bar closes that were already due and folded into this iteration.
+    """
+    bar_close: pd.Timestamp
+    jitter: float
+    duration: float
+    overrun: float
+    skipped: int
+
+
+class BarScheduler:
+    """Runs the trading pipeline on a fixed schedule aligned to bar closes.
+
+    Iterating over the scheduler yields every bar close of the session at
+    `bar close + publication_lag`, the time the provider needs to publish the
+    bar. The schedule is precomputed, so iterations stay evenly spaced however
+    long each one takes, and every bar close is yielded at most once. When an
+    iteration overruns by more than one interval, the bar closes that became due
+    in the meantime are folded into a single iteration for the latest one; the
+    market data refresh appends all bars since the previous iteration, so no
+    bar is lost.
+
+    :param bar_closes: Ascending, timezone aware bar close instants.
+    :param publication_lag: Seconds to wait after a bar close before yielding it.
+    :param clock: Returns the current time in seconds since epoch. Replaced by a simulated clock in tests.
+    :param sleep: Sleeps for the given number of seconds.
+    """
+
+    def __init__(self,
+                 bar_closes: list[pd.Timestamp],
+                 publication_lag: float = 0.0,
+                 clock: Callable[[], float] = time.time,
+                 sleep: Callable[[float], None] = time.sleep) -> None:
+        self.bar_closes = list(bar_closes)
+        self.publication_lag = publication_lag
+        self.clock = clock
+        self.sleep = sleep
+        self._metrics: list[TickMetrics] = []
+
+    @classmethod
+    def for_session(cls,
+                    market_calendar: str,
+                    interval: Period,
+                    publication_lag: float = 0.0,
+                    now: Optional[pd.Timestamp] = None,
+                    **kwargs) -> "BarScheduler":
+        """
+        Schedule of the bar closes of today's session that are still to be published.
+        The bar closing with the session is left out, it would only be published after
+        the close, when orders can no longer be filled. Empty on weekends, holidays and after the close.
+        """
+        now = pd.Timestamp.now(tz="UTC") if now is None else now
+        session = trading_session(market_calendar, now)
+        if session is None:
+            return cls([], publication_lag, **kwargs)
+
+        session_open, session_close = session
+        bar_closes = pd.date_range(session_open + pd.Timedelta(str(interval)), session_close, freq=pd.Timedelta(str(interval)), inclusive="left")
+        lag = pd.Timedelta(seconds=publication_lag)
+        return cls([close for close in bar_closes if close + lag > now], publication_lag, **kwargs)
+
+    @property
+    def metrics(self) -> list[TickMetrics]:
+        return self._metrics
+
+    def __iter__(self) -> Iterator[pd.Timestamp]:
+        fire_times = [close.timestamp() + self.publication_lag for close in self.bar_closes]
+        position = 0
+
+        while position < len(fire_times):
+            wait = fire_times[position] - self.clock()
+            if wait > 0:
+                self.sleep(wait)
+
+            # Fold closes that are already due into the latest one
+            started = self.clock()
+            latest = position
+            while latest + 1 < len(fire_times) and fire_times[latest + 1] <= started:
+                latest += 1
+
+            yield self.bar_closes[latest]
+
+            finished = self.clock()
+            next_fire = fire_times[latest + 1] if latest + 1 < len(fire_times) else finished
+            metrics = TickMetrics(
+                bar_close=self.bar_closes[latest],
+                jitter=started - fire_times[latest],
+                duration=finished - started,
+                overrun=max(0.0, finished - next_fire),
+                skipped=latest - position
+            )
+            self._metrics.append(metrics)
+            self._log(metrics)
+            position = latest + 1
+
+    def summary(self) -> dict[str, float]:
+        """Aggregated timing of the iterations so far"""
+        if not self._metrics:
+            return {"iterations": 0}
+
+        jitters = [metrics.jitter for metrics in self._metrics]
+        durations = [metrics.duration for metrics in self._metrics]
+        return {
+            "iterations": len(self._metrics),
+            "mean_jitter": sum(jitters) / len(jitters),
+            "max_jitter": max(jitters),
+            "mean_duration": sum(durations) / len(durations),
+            "max_duration": max(durations),
+            "overruns": sum(metrics.overrun > 0 for metrics in self._metrics),
+            "skipped": sum(metrics.skipped for metrics in self._metrics),
+        }
+
+    @staticmethod
+    def _log(metrics: TickMetrics) -> None:
+        message = f"BarScheduler: bar {metrics.bar_close} processed in {metrics.duration:.2f}s"
+        message += f" (jitter {metrics.jitter * 1e3:.0f}ms)"
+        if metrics.overrun > 0 or metrics.skipped > 0:
+            message += f". Overran the next bar by {metrics.overrun:.2f}s, {metrics.skipped} bar closes folded"
+            logging.warning(message)
+        else:
+            logging.debug(message)
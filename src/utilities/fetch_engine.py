@@ -0,0 +1,91 @@
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from typing import Any, Callable
+import logging
+import time
+
+
+@dataclass
+class FetchResult:
+    """
+    Outcome of a concurrent fetch.
+
+    Attributes:
+        results (dict[str, Any]): Return value per key for the requests that succeeded.
+        failures (dict[str, Exception]): Exception per key for the requests that failed.
+        timings (dict[str, float]): Wall clock duration in seconds per key.
+    """
+    results: dict[str, Any] = field(default_factory=dict)
+    failures: dict[str, Exception] = field(default_factory=dict)
+    timings: dict[str, float] = field(default_factory=dict)
+
+
+class FetchEngine:
+    """Runs market data requests, typically one per ticker, concurrently on a bounded thread pool.
+
+    A failing request does not abort the others: its exception is collected in
+    the FetchResult and the caller decides how to handle the missing data.
+    """
+
+    def __init__(self, max_workers: int = 8) -> None:
+        if max_workers < 1:
+            raise ValueError("FetchEngine needs at least one worker")
+
+        self.max_workers = max_workers
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="fetch")
+
+    def run(self, tasks: dict[str, Callable[[], Any]], description: str = "fetch", spread_over: float = 0.0) -> FetchResult:
+        """
+        Execute the tasks concurrently and wait for all of them to finish.
+
+        :param tasks: Mapping of key (e.g. ticker) to a callable without arguments.
+        :param description: Label used in the log messages.
+        :param spread_over: Seconds over which the task submissions are evenly spaced, 
+                            e.g. to stay within a rate limit budget. Default submits all at once.
+        :return: FetchResult with results, failures and timings per key.
+        """
+        fetch_result = FetchResult()
+        start = time.perf_counter()
+        step = spread_over / len(tasks) if tasks and spread_over > 0 else 0.0
+
+        futures = {}
+        for i, (key, task) in enumerate(tasks.items()):
+            delay = start + i * step - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            futures[self._executor.submit(self._timed, task)] = key
+
+        for future in as_completed(futures):
+            key = futures[future]
+            result, error, duration = future.result()
+            fetch_result.timings[key] = duration
+
+            if error is None:
+                fetch_result.results[key] = result
+            else:
+                logging.error(f"FetchEngine: {description} failed for {key} after {duration:.2f}s: {error}")
+                fetch_result.failures[key] = error
+
+        self._log_summary(fetch_result, description, time.perf_counter() - start)
+        return fetch_result
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=True)
+
+    @staticmethod
+    def _timed(task: Callable[[], Any]) -> tuple[Any, Exception | None, float]:
+        start = time.perf_counter()
+        try:
+            result = task()
+            return result, None, time.perf_counter() - start
+        except Exception as err:
+            return None, err, time.perf_counter() - start
+
+    def _log_summary(self, fetch_result: FetchResult, description: str, elapsed: float) -> None:
+        total = len(fetch_result.timings)
+        message = f"FetchEngine: {description} of {total} requests took {elapsed:.2f}s"
+        message += f" with {self.max_workers} workers. {len(fetch_result.failures)} failed."
+        logging.info(message)
+
+        for key, duration in sorted(fetch_result.timings.items(), key=lambda item: item[1], reverse=True):
+            logging.debug(f"FetchEngine: {description} {key} took {duration:.3f}s")
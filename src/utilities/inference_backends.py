@@ -0,0 +1,120 @@
+from abc import ABC, abstractmethod
+from src.utilities.model_registry import LoadedModel
+import numpy as np
+import inspect
+import logging
+import torch
+import io
+import os
+
+
+class InferenceBackend(ABC):
+    """
+    Runs a sequence classification model on tokenized batches. Backends trade 
+    exactness for speed and memory on CPU, see benchmarks/sentiment_backends_benchmark.py.
+    """
+
+    @abstractmethod
+    def logits(self, batch: dict[str, np.ndarray]) -> np.ndarray:
+        """
+        :param batch: Padded tokenizer output, e.g. input_ids and attention_mask.
+        :return: float32 logits, one row per text.
+        """
+        pass
+
+    @property
+    @abstractmethod
+    def memory_bytes(self) -> int:
+        """Size of the model weights used by the backend"""
+        pass
+
+
+class PyTorchBackend(InferenceBackend):
+    """The full precision model as loaded by the ModelRegistry"""
+
+    def __init__(self, loaded: LoadedModel) -> None:
+        self.model = loaded.model
+        self._memory_bytes = loaded.memory_bytes
+
+    def logits(self, batch: dict[str, np.ndarray]) -> np.ndarray:
+        with torch.inference_mode():
+            return self.model(**{key: torch.from_numpy(values) for key, values in batch.items()}).logits.numpy()
+
+    @property
+    def memory_bytes(self) -> int:
+        return self._memory_bytes
+
+
+class QuantizedBackend(PyTorchBackend):
+    """Copy of the model with its linear layers dynamically quantized to int8"""
+
+    def __init__(self, loaded: LoadedModel) -> None:
+        self.model = torch.ao.quantization.quantize_dynamic(loaded.model, {torch.nn.Linear}, dtype=torch.qint8)
+
+        # Quantized weights are packed and not listed as parameters, measure the serialized size
+        buffer = io.BytesIO()
+        torch.save(self.model.state_dict(), buffer)
+        self._memory_bytes = buffer.getbuffer().nbytes
+
+
+class OnnxBackend(InferenceBackend):
+    """
+    The model exported to ONNX and run with ONNX Runtime. The export is done once and
+    kept in the cache directory. Requires onnxruntime.
+    """
+
+    def __init__(self, loaded: LoadedModel, cache_dir: str = "cache/onnx") -> None:
+        import onnxruntime
+
+        # Graph inputs follow the order of the forward arguments, not of the tokenizer outputs
+        parameters = inspect.signature(loaded.model.forward).parameters
+        self.input_names = [name for name in parameters if name in loaded.tokenizer.model_input_names]
+        self.path = os.path.join(cache_dir, f"{loaded.model_id.replace('/', '_')}.onnx")
+        if not os.path.exists(self.path):
+            self._export(loaded)
+
+        options = onnxruntime.SessionOptions()
+        options.intra_op_num_threads = torch.get_num_threads()
+        self.session = onnxruntime.InferenceSession(self.path, options, providers=["CPUExecutionProvider"])
+
+    def logits(self, batch: dict[str, np.ndarray]) -> np.ndarray:
+        return self.session.run(["logits"], {name: batch[name].astype(np.int64) for name in self.input_names})[0]
+
+    @property
+    def memory_bytes(self) -> int:
+        return os.path.getsize(self.path)
+
+    def _export(self, loaded: LoadedModel) -> None:
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        # Exported under a temporary name, sentiment workers may export the same model concurrently
+        exported = f"{self.path}.{os.getpid()}.tmp"
+        sample = loaded.tokenizer(["sample text", "a longer sample text"], padding=True, return_tensors="pt")
+        dynamic_axes = {name: {0: "batch", 1: "sequence"} for name in self.input_names}
+
+        with torch.inference_mode():
+            torch.onnx.export(
+                loaded.model,
+                ({name: sample[name] for name in self.input_names},),
+                exported,
+                input_names=self.input_names,
+                output_names=["logits"],
+                dynamic_axes={**dynamic_axes, "logits": {0: "batch"}},
+                opset_version=17,
+                dynamo=False
+                )
+        os.replace(exported, self.path)
+        logging.info(f"OnnxBackend: exported {loaded.model_id} to {self.path}")
+
+
+class InferenceBackendFactory:
+
+    @staticmethod
+    def create_instance(backend_type: str, loaded: LoadedModel, cache_dir: str = "cache/onnx") -> InferenceBackend:
+        if backend_type.lower() == "pytorch":
+            return PyTorchBackend(loaded)
+        elif backend_type.lower() == "quantized":
+            return QuantizedBackend(loaded)
+        elif backend_type.lower() == "onnx":
+            return OnnxBackend(loaded, cache_dir)
+        else:
+            raise ValueError(f"Unsupported inference backend: {backend_type}")
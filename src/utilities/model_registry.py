@@ -0,0 +1,119 @@
+from dataclasses import dataclass
+from transformers import AutoConfig, AutoTokenizer, AutoModelForSequenceClassification, pipeline
+from typing import Any
+import logging
+import threading
+import time
+
+
+@dataclass
+class LoadedModel:
+    """
+    A model and tokenizer loaded by the ModelRegistry.
+
+    Attributes:
+        model_id (str): Hugging Face model id.
+        model (Any): The model, in eval mode.
+        tokenizer (Any): The matching tokenizer.
+        load_time (float): Seconds it took to load the model.
+        memory_bytes (int): Size of the model parameters and buffers.
+    """
+    model_id: str
+    model: Any
+    tokenizer: Any
+    load_time: float
+    memory_bytes: int
+
+
+class ModelRegistry:
+    """Process wide registry of sentiment models.
+
+    Every model is loaded once, either at warm-up or on first use, put in eval
+    mode and shared by all tickers, strategies and iterations. Pipelines built
+    around a registered model reuse its weights.
+    """
+
+    _models: dict[str, LoadedModel] = {}
+    _pipelines: dict[tuple[str, str], Any] = {}
+    _backends: dict[tuple[str, str], Any] = {}
+    _configs: dict[str, Any] = {}
+    _lock = threading.Lock()
+
+    @classmethod
+    def get(cls, model_id: str) -> LoadedModel:
+        """Returns the model, loading it on first use"""
+        with cls._lock:
+            if model_id not in cls._models:
+                cls._models[model_id] = cls._load(model_id)
+            return cls._models[model_id]
+
+    @classmethod
+    def get_config(cls, model_id: str) -> Any:
+        """The model configuration, e.g. its labels, without loading the weights"""
+        with cls._lock:
+            if model_id in cls._models:
+                return cls._models[model_id].model.config
+            if model_id not in cls._configs:
+                cls._configs[model_id] = AutoConfig.from_pretrained(model_id)
+            return cls._configs[model_id]
+
+    @classmethod
+    def get_pipeline(cls, task: str, model_id: str) -> Any:
+        """A transformers pipeline for the task around the registered model"""
+        loaded = cls.get(model_id)
+        with cls._lock:
+            if (task, model_id) not in cls._pipelines:
+                cls._pipelines[(task, model_id)] = pipeline(task, model=loaded.model, tokenizer=loaded.tokenizer)
+            return cls._pipelines[(task, model_id)]
+
+    @classmethod
+    def get_backend(cls, model_id: str, backend_type: str = "pytorch", cache_dir: str = "cache/onnx") -> Any:
+        """The model wrapped in an inference backend (pytorch, quantized or onnx), created once"""
+        loaded = cls.get(model_id)
+        with cls._lock:
+            if (model_id, backend_type) not in cls._backends:
+                # Imported here, the backends depend on the registry's LoadedModel
+                from src.utilities.inference_backends import InferenceBackendFactory
+                
+                start = time.perf_counter()
+                backend = InferenceBackendFactory.create_instance(backend_type, loaded, cache_dir)
+                logging.info(f"ModelRegistry: {backend_type} backend for {model_id} ready in {time.perf_counter() - start:.2f}s"
+                             f" ({backend.memory_bytes / 1e6:.1f}MB)")
+                cls._backends[(model_id, backend_type)] = backend
+            return cls._backends[(model_id, backend_type)]
+
+    @classmethod
+    def warm_up(cls, model_ids: list[str], backend_type: str = "pytorch", cache_dir: str = "cache/onnx") -> None:
+        """Loads the models up front so the first trading iteration does not pay for it"""
+        for model_id in model_ids:
+            cls.get_backend(model_id, backend_type, cache_dir)
+        logging.info(f"ModelRegistry: warmed up {len(model_ids)} models. {cls.report()}")
+
+    @classmethod
+    def report(cls) -> dict[str, dict[str, float]]:
+        """Load time in seconds and memory footprint in MB per loaded model"""
+        with cls._lock:
+            return {
+                model_id: {"load_time": round(loaded.load_time, 2), "memory_mb": round(loaded.memory_bytes / 1e6, 1)}
+                for model_id, loaded in cls._models.items()
+            }
+
+    @classmethod
+    def clear(cls) -> None:
+        with cls._lock:
+            cls._models.clear()
+            cls._pipelines.clear()
+            cls._backends.clear()
+            cls._configs.clear()
+
+    @staticmethod
+    def _load(model_id: str) -> LoadedModel:
+        start = time.perf_counter()
+        tokenizer = AutoTokenizer.from_pretrained(model_id)
+        model = AutoModelForSequenceClassification.from_pretrained(model_id)
+        model.eval()
+        load_time = time.perf_counter() - start
+
+        memory_bytes = sum(tensor.numel() * tensor.element_size() for tensor in [*model.parameters(), *model.buffers()])
+        logging.info(f"ModelRegistry: loaded {model_id} in {load_time:.2f}s ({memory_bytes / 1e6:.1f}MB)")
+        return LoadedModel(model_id, model, tokenizer, load_time, memory_bytes)
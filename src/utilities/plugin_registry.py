@@ -0,0 +1,50 @@
+from typing import Any
+import importlib
+import logging
+import threading
+
+
+class PluginRegistry:
+    """Registry of named implementations, e.g. market data APIs or strategies.
+
+    Names map to "module:attribute" paths and a module is only imported once its
+    name is requested, so heavy dependencies (torch, provider SDKs) are only loaded
+    when they are selected in run.cfg. A "module:attribute" path can also be
+    requested directly, to use an implementation that is not registered.
+
+    :param kind: Description of the implementations, used in error messages.
+    :param paths: Path per name. Names are case insensitive.
+    """
+
+    def __init__(self, kind: str, paths: dict[str, str]) -> None:
+        self.kind = kind
+        self._paths = {name.lower(): path for name, path in paths.items()}
+        self._loaded: dict[str, Any] = {}
+        self._lock = threading.Lock()
+
+    def register(self, name: str, path: str) -> None:
+        with self._lock:
+            self._paths[name.lower()] = path
+            self._loaded.pop(name.lower(), None)
+
+    def names(self) -> list[str]:
+        return list(self._paths)
+
+    def loaded(self) -> list[str]:
+        """Names whose module has been imported"""
+        with self._lock:
+            return list(self._loaded)
+
+    def load(self, name: str) -> Any:
+        """Imports the module of the name on first use and returns the attribute"""
+        key = name.lower() if ":" not in name else name
+        with self._lock:
+            if key not in self._loaded:
+                path = self._paths.get(key, name if ":" in name else None)
+                if path is None:
+                    raise ValueError(f"Unsupported {self.kind}: {name}. Registered: {', '.join(self._paths)}")
+
+                module_name, _, attribute = path.partition(":")
+                self._loaded[key] = getattr(importlib.import_module(module_name), attribute)
+                logging.debug(f"PluginRegistry: loaded {self.kind} {name} from {path}")
+            return self._loaded[key]
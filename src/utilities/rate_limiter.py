@@ -0,0 +1,155 @@
+import asyncio
+import logging
+import threading
+import time
+
+
+class TokenBucket:
+    """Thread safe token bucket.
+
+    Holds at most `capacity` tokens and refills at `rate` tokens per `period`
+    seconds. Callers that need more tokens than available are queued until the
+    bucket has refilled instead of being rejected.
+    """
+
+    def __init__(self, rate: float, period: float = 60.0, capacity: float | None = None) -> None:
+        if rate <= 0 or period <= 0:
+            raise ValueError("Token bucket rate and period must be positive")
+
+        self.rate = rate
+        self.period = period
+        self.capacity = capacity if capacity is not None else rate
+        self._fill_rate = rate / period
+        self._tokens = self.capacity
+        self._last_refill = time.monotonic()
+        self._state_lock = threading.Lock()
+        self._queue_lock = threading.Lock()
+
+    def acquire(self, tokens: float = 1) -> float:
+        """
+        Take tokens from the bucket, blocking until they are available. Requests
+        larger than the capacity are served in several installments.
+
+        :param tokens: Number of tokens (credits) to take.
+        :return: Time in seconds spent waiting.
+        """
+        waited = 0.0
+        with self._queue_lock:
+            while tokens > 0:
+                take = min(tokens, self.capacity)
+                wait = self._try_take(take)
+                if wait == 0:
+                    tokens -= take
+                else:
+                    time.sleep(wait)
+                    waited += wait
+        return waited
+
+    async def acquire_async(self, tokens: float = 1) -> float:
+        """
+        Asynchronous version of acquire that does not block the event loop. Callers that have to
+        wait are queued behind the waiting threads, in the default executor.
+        """
+        if tokens <= self.capacity and self._queue_lock.acquire(blocking=False):
+            # Nobody is waiting, take the tokens right away if available
+            try:
+                if self._try_take(tokens) == 0:
+                    return 0.0
+            finally:
+                self._queue_lock.release()
+        return await asyncio.get_running_loop().run_in_executor(None, self.acquire, tokens)
+
+    def remaining(self) -> float:
+        """Number of tokens currently available"""
+        with self._state_lock:
+            self._refill()
+            return self._tokens
+
+    def wait_time(self, tokens: float = 1) -> float:
+        """Seconds until the given number of tokens is available, ignoring queued callers"""
+        with self._state_lock:
+            self._refill()
+            return max(0.0, (tokens - self._tokens) / self._fill_rate)
+
+    def _try_take(self, tokens: float) -> float:
+        """Takes the tokens if available and returns 0, otherwise returns the time to wait"""
+        with self._state_lock:
+            self._refill()
+            if self._tokens >= tokens:
+                self._tokens -= tokens
+                return 0.0
+            return (tokens - self._tokens) / self._fill_rate
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._last_refill) * self._fill_rate)
+        self._last_refill = now
+
+
+class RateLimiterRegistry:
+    """Process wide registry of token buckets per provider and endpoint class.
+
+    Limits are keyed by provider ("twelve_data") or by provider and endpoint
+    class ("twelve_data.price"). A call is charged against both its endpoint
+    bucket and its provider bucket when they are configured. Providers without
+    a configured limit are not throttled.
+    """
+
+    _buckets: dict[str, TokenBucket] = {}
+
+    @classmethod
+    def configure(cls, limits: dict[str, float], period: float = 60.0) -> None:
+        """
+        :param limits: Credits per period keyed by provider or provider.endpoint.
+        :param period: Length of the period in seconds. Default one minute.
+        """
+        cls._buckets = {key: TokenBucket(rate, period) for key, rate in limits.items()}
+        for key, rate in limits.items():
+            logging.debug(f"RateLimiter: {key} limited to {rate} credits per {period} seconds")
+
+    @classmethod
+    def acquire(cls, provider: str, endpoint: str | None = None, credits: float = 1) -> None:
+        """Blocks until the call can be made within the configured limits"""
+        waited = 0.0
+        for bucket in cls._buckets_for(provider, endpoint):
+            waited += bucket.acquire(credits)
+
+        if waited > 0:
+            logging.debug(f"RateLimiter: {provider} {endpoint or ''} call queued for {waited:.2f}s")
+
+    @classmethod
+    async def acquire_async(cls, provider: str, endpoint: str | None = None, credits: float = 1) -> None:
+        """Waits without blocking the event loop until the call can be made within the configured limits"""
+        waited = 0.0
+        for bucket in cls._buckets_for(provider, endpoint):
+            waited += await bucket.acquire_async(credits)
+
+        if waited > 0:
+            logging.debug(f"RateLimiter: {provider} {endpoint or ''} call queued for {waited:.2f}s")
+
+    @classmethod
+    def remaining(cls, provider: str, endpoint: str | None = None) -> float | None:
+        """Credits currently available for a call, None if the provider is not limited"""
+        buckets = cls._buckets_for(provider, endpoint)
+        if not buckets:
+            return None
+        return min(bucket.remaining() for bucket in buckets)
+
+    @classmethod
+    def wait_time(cls, provider: str, endpoint: str | None = None, credits: float = 1) -> float:
+        """Seconds until the given number of credits is available"""
+        buckets = cls._buckets_for(provider, endpoint)
+        if not buckets:
+            return 0.0
+
+        # Credits above the capacity are only available after full refills
+        return max(
+            bucket.wait_time(min(credits, bucket.capacity))
+            + max(0.0, credits - bucket.capacity) / bucket.rate * bucket.period
+            for bucket in buckets
+        )
+
+    @classmethod
+    def _buckets_for(cls, provider: str, endpoint: str | None) -> list[TokenBucket]:
+        keys = [f"{provider}.{endpoint}", provider] if endpoint else [provider]
+        return [cls._buckets[key] for key in keys if key in cls._buckets]
@@ -0,0 +1,104 @@
+from src.utilities.model_registry import ModelRegistry
+from src.data_structures.sentiment_store import SentimentStore
+from typing import Optional
+import numpy as np
+import logging
+import torch
+import time
+
+
+class SentimentScorer:
+    """Batched text classification with the models of the ModelRegistry.
+
+    All texts are tokenized once and sorted by length, so every batch is only
+    padded to its own longest text. Batches run on the configured inference
+    backend and the predictions are returned as a single array in the order
+    of the input.
+
+    :param batch_size: Number of texts per forward pass.
+    :param num_threads: Number of intra-op CPU threads for torch. 0 keeps the torch default.
+    :param store: Optional store of earlier scores. Texts with a stored score are not scored again.
+    :param backend: Inference backend, pytorch, quantized (int8) or onnx.
+    :param onnx_dir: Directory the ONNX exports are kept in.
+    """
+
+    def __init__(self, 
+                 batch_size: int = 32, 
+                 num_threads: int = 0, 
+                 store: Optional[SentimentStore] = None,
+                 backend: str = "pytorch",
+                 onnx_dir: str = "cache/onnx") -> None:
+        if batch_size < 1:
+            raise ValueError("Sentiment batch size must be positive")
+
+        self.batch_size = batch_size
+        self.store = store
+        self.backend = backend
+        self.onnx_dir = onnx_dir
+        self.num_threads = num_threads
+        if num_threads > 0 and torch.get_num_threads() != num_threads:
+            torch.set_num_threads(num_threads)
+
+    def predict(self, model_id: str, texts: list[str], articles: Optional[list[str]] = None) -> np.ndarray:
+        """
+        Predicted class index of every text.
+
+        :param model_id: Hugging Face id of a sequence classification model.
+        :param texts: Texts to classify.
+        :param articles: Article keys of the texts, see SentimentStore.article_key. Needed to use the store.
+        :return: int64 array with one class index per text.
+        """
+        if self.store is None or articles is None:
+            return self._predict(model_id, texts)
+
+        predictions, new = self.lookup(model_id, articles)
+        if new:
+            predictions[new] = self._predict(model_id, [texts[i] for i in new])
+            self.remember(model_id, articles, predictions, new)
+        return predictions
+
+    def lookup(self, model_id: str, articles: list[str]) -> tuple[np.ndarray, list[int]]:
+        """
+        Stored predictions of the articles.
+
+        :return: Predictions with -1 for the articles without a stored score, and the positions of those articles.
+        """
+        stored = self.store.get_many(self._store_id(model_id), articles)
+        new = [i for i, article in enumerate(articles) if article not in stored]
+        logging.debug(f"SentimentScorer: {model_id} {len(articles) - len(new)} stored scores, {len(new)} new articles")
+        return np.array([stored.get(article, -1) for article in articles], dtype=np.int64), new
+
+    def remember(self, model_id: str, articles: list[str], predictions: np.ndarray, new: list[int]) -> None:
+        """Stores the predictions of the new articles"""
+        self.store.put_many(self._store_id(model_id), {articles[i]: int(predictions[i]) for i in new})
+
+    def _predict(self, model_id: str, texts: list[str]) -> np.ndarray:
+        predictions = np.empty(len(texts), dtype=np.int64)
+        if not texts:
+            return predictions
+
+        start = time.perf_counter()
+        loaded = ModelRegistry.get(model_id)
+        backend = ModelRegistry.get_backend(model_id, self.backend, self.onnx_dir)
+        max_length = min(loaded.tokenizer.model_max_length, 512)
+        encoded = loaded.tokenizer(list(texts), truncation=True, max_length=max_length)
+
+        # Length bucketing: batches of similar lengths need little padding
+        order = np.argsort([len(ids) for ids in encoded["input_ids"]], kind="stable")
+        for offset in range(0, len(order), self.batch_size):
+            rows = order[offset:offset + self.batch_size]
+            batch = loaded.tokenizer.pad({key: [values[row] for row in rows] for key, values in encoded.items()}, return_tensors="np")
+            predictions[rows] = backend.logits(dict(batch)).argmax(axis=-1)
+
+        elapsed = time.perf_counter() - start
+        logging.debug(f"SentimentScorer: {model_id} scored {len(texts)} texts in {elapsed:.2f}s ({len(texts) / elapsed:.1f}/s)")
+        return predictions
+
+    def _store_id(self, model_id: str) -> str:
+        # Scores of the approximate backends are stored separately
+        return model_id if self.backend == "pytorch" else f"{model_id}@{self.backend}"
+
+    @staticmethod
+    def label_id(model_id: str, label: str) -> int:
+        """Class index of a label of the model, e.g. POSITIVE"""
+        return ModelRegistry.get_config(model_id).label2id[label]
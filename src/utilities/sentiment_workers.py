@@ -0,0 +1,139 @@
+from concurrent.futures import Future, ProcessPoolExecutor, wait
+from src.utilities.sentiment_scorer import SentimentScorer
+from typing import Hashable, Optional
+import multiprocessing
+import numpy as np
+import logging
+import os
+
+
+# Scorer of a worker process, created by the pool initializer
+_worker_scorer: Optional[SentimentScorer] = None
+
+
+def _init_worker(batch_size: int, num_threads: int, backend: str, onnx_dir: str, model_ids: tuple[str, ...]) -> None:
+    global _worker_scorer
+    _worker_scorer = SentimentScorer(batch_size, num_threads, None, backend, onnx_dir)
+
+    if model_ids:
+        from src.utilities.model_registry import ModelRegistry
+        ModelRegistry.warm_up(list(model_ids), backend, onnx_dir)
+
+
+def _score(texts: dict[str, list[str]]) -> dict[str, np.ndarray]:
+    """Runs in a worker process: predictions per model id"""
+    return {model_id: _worker_scorer.predict(model_id, model_texts) for model_id, model_texts in texts.items()}
+
+
+def _ready() -> int:
+    return os.getpid()
+
+
+class SentimentWorkerPool:
+    """Scores texts with the sentiment models outside of the trading loop.
+
+    Jobs run in worker processes that each load the models once, so inference
+    neither holds the GIL of the trading loop nor delays its risk checks. Every
+    job returns a future, callers wait for it as long as their deadline allows
+    and otherwise carry on without it. Scores of the scorer's store are served
+    without a round trip to the workers, new scores are stored once the job completes.
+
+    With zero workers the jobs are scored immediately in the calling thread, as
+    one batch across all jobs, and the returned futures are already done.
+
+    :param workers: Number of worker processes, 0 scores in the calling thread.
+    :param scorer: Scorer used in the calling thread, its settings are copied to the workers.
+    :param model_ids: Models loaded by every worker at start up.
+    """
+
+    def __init__(self, workers: int, scorer: SentimentScorer, model_ids: Optional[list[str]] = None) -> None:
+        if workers < 0:
+            raise ValueError("Number of sentiment workers cannot be negative")
+
+        self.workers = workers
+        self.scorer = scorer
+        self._executor = None
+
+        if workers > 0:
+            # Workers share the CPU cores unless the number of threads is configured
+            num_threads = scorer.num_threads or max(1, (os.cpu_count() or 1) // workers)
+            # Spawned, forking a process with an initialized torch thread pool can deadlock
+            self._executor = ProcessPoolExecutor(
+                workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(scorer.batch_size, num_threads, scorer.backend, scorer.onnx_dir, tuple(model_ids or ()))
+                )
+
+    def start(self, timeout: Optional[float] = None) -> None:
+        """Starts the worker processes and waits until they loaded the models"""
+        if self._executor is None:
+            return
+
+        done, _ = wait([self._executor.submit(_ready) for _ in range(self.workers)], timeout)
+        logging.info(f"SentimentWorkerPool: {len(done)} out of {self.workers} workers ready")
+
+    def submit(self, model_ids: list[str], jobs: dict[Hashable, tuple[list[str], Optional[list[str]]]]) -> dict[Hashable, Future]:
+        """
+        Scores the texts of every job with every model.
+
+        :param model_ids: Hugging Face ids of the models.
+        :param jobs: Texts and their article keys per job, e.g. per ticker. Keys may be None to bypass the store.
+        :return: Future per job, resolving to the predicted class indices per model id.
+        """
+        if self._executor is None:
+            return self._score_inline(model_ids, jobs)
+
+        futures = {}
+        for job, (texts, articles) in jobs.items():
+            futures[job] = self._submit(model_ids, texts, articles)
+        return futures
+
+    def shutdown(self) -> None:
+        """Stops the workers without waiting for the running jobs"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def _submit(self, model_ids: list[str], texts: list[str], articles: Optional[list[str]]) -> Future:
+        result = Future()
+        predictions, new = {}, {}
+        for model_id in model_ids:
+            if self.scorer.store is not None and articles is not None:
+                predictions[model_id], new[model_id] = self.scorer.lookup(model_id, articles)
+            else:
+                predictions[model_id], new[model_id] = np.full(len(texts), -1, dtype=np.int64), list(range(len(texts)))
+
+        pending = {model_id: [texts[i] for i in rows] for model_id, rows in new.items() if rows}
+        if not pending:
+            result.set_result(predictions)
+            return result
+
+        def complete(job: Future) -> None:
+            try:
+                for model_id, scores in job.result().items():
+                    predictions[model_id][new[model_id]] = scores
+                    if self.scorer.store is not None and articles is not None:
+                        self.scorer.remember(model_id, articles, predictions[model_id], new[model_id])
+            except Exception as err:
+                result.set_exception(err)
+                return
+            result.set_result(predictions)
+
+        self._executor.submit(_score, pending).add_done_callback(complete)
+        return result
+
+    def _score_inline(self, model_ids: list[str], jobs: dict[Hashable, tuple[list[str], Optional[list[str]]]]) -> dict[Hashable, Future]:
+        texts = [text for job_texts, _ in jobs.values() for text in job_texts]
+        articles = None
+        if all(job_articles is not None for _, job_articles in jobs.values()):
+            articles = [article for _, job_articles in jobs.values() for article in job_articles]
+
+        predictions = {model_id: self.scorer.predict(model_id, texts, articles) for model_id in model_ids}
+
+        futures = {}
+        offsets = np.cumsum([0] + [len(job_texts) for job_texts, _ in jobs.values()])
+        for i, job in enumerate(jobs):
+            futures[job] = Future()
+            futures[job].set_result({model_id: scores[offsets[i]:offsets[i + 1]] for model_id, scores in predictions.items()})
+        return futures
@@ -0,0 +1,29 @@
+import pandas as pd
+
+
+class SimulatedClock:
+    """Virtual time for replaying historical data.
+
+    Drop-in replacement for time.time and time.sleep, e.g. for the BarScheduler
+    and the MarketDataService: sleeping advances the clock instantly instead
+    of waiting, so a session is replayed as fast as it can be processed.
+
+    :param start: Initial time in seconds since epoch.
+    """
+
+    def __init__(self, start: float = 0.0) -> None:
+        self._now = float(start)
+
+    def time(self) -> float:
+        return self._now
+
+    def sleep(self, seconds: float) -> None:
+        self._now += max(float(seconds), 0.0)
+
+    def advance_to(self, timestamp: float) -> None:
+        """Moves the clock forward to the given time, never backwards"""
+        self._now = max(self._now, float(timestamp))
+
+    def now(self, timezone=None) -> pd.Timestamp:
+        now = pd.Timestamp(self._now, unit="s", tz="UTC")
+        return now.tz_convert(timezone) if timezone is not None else now
@@ -9,20 +9,17 @@ class StatisticsGatherer:
     def __init__(self) -> None:
         self.signals = {}
         self.risk_management_thresholds = {}
+        self.strategy_statistics = {}
 
     def increment_stop_loss(self, tickers: list[str]) -> None:
         for ticker in tickers:
-            if ticker in self.risk_management_thresholds:
-                self.risk_management_thresholds[ticker]["stop_loss"] += 1
-            else:
-                self.risk_management_thresholds[ticker] = {"stop_loss": 1}
+            thresholds = self.risk_management_thresholds.setdefault(ticker, {})
+            thresholds["stop_loss"] = thresholds.get("stop_loss", 0) + 1
 
     def increment_take_profit(self, tickers: list[str]) -> None:
         for ticker in tickers:
-            if ticker in self.risk_management_thresholds:
-                self.risk_management_thresholds[ticker]["take_profit"] += 1
-            else:
-                self.risk_management_thresholds[ticker] = {"take_profit": 1}
+            thresholds = self.risk_management_thresholds.setdefault(ticker, {})
+            thresholds["take_profit"] = thresholds.get("take_profit", 0) + 1
 
     def increment_signals(self, ticker_signals: dict[str, Signal]) -> None:
         for ticker, signal in ticker_signals.items():
@@ -35,6 +32,13 @@ class StatisticsGatherer:
             else:
                 self.signals[ticker] = {signal: 1}
 
+    def increment_strategy_statistics(self, statistics: dict[str, dict[str, int]]) -> None:
+        """Counters per ticker reported by the strategy, e.g. articles scored per sentiment tier"""
+        for ticker, counts in statistics.items():
+            ticker_counts = self.strategy_statistics.setdefault(ticker, {})
+            for name, count in counts.items():
+                ticker_counts[name] = ticker_counts.get(name, 0) + count
+
     def to_dataframe(self) -> pd.DataFrame:
         """Converts the collected statistics to a DataFrame."""
 
@@ -55,6 +59,14 @@ class StatisticsGatherer:
                         "value": threshold_value
                     })
 
+        for ticker, statistic_map in self.strategy_statistics.items():
+            for statistic_name, statistic_value in statistic_map.items():
+                data.append({
+                    "ticker": ticker,
+                    "type": statistic_name,
+                    "value": statistic_value
+                })
+
         return pd.DataFrame(data)
 
     def to_csv(self, filename: str) -> None:
@@ -18,6 +18,10 @@ def split_tenor_string(entry):
     numbers = 1 if numbers == "" else numbers
     return (int(numbers), letters or None)
 
+def chunked(items: list, size: int) -> list[list]:
+    """Splits a list into consecutive chunks of at most size items"""
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
 def calc_intraday_time_points(time_interval: str, start_timestamp: pd.Timestamp, end_timestamp: pd.Timestamp) -> int:
     time_diff = (end_timestamp - start_timestamp).total_seconds()
     interval_seconds = pd.Timedelta(time_interval).total_seconds()
@@ -32,6 +36,18 @@ def timezone_from_calendar(calendar: str) -> str:
     else:
         raise ValueError("Calendar not recognized")
 
+def trading_session(market_calendar: str, date: pd.Timestamp) -> tuple[pd.Timestamp, pd.Timestamp] | None:
+    """Open and close of the regular session on the given date. None on weekends and holidays."""
+    timezone = timezone_from_calendar(market_calendar)
+    date = pd.Timestamp(date).tz_localize(timezone) if pd.Timestamp(date).tz is None else pd.Timestamp(date).tz_convert(timezone)
+
+    market_holidays = holidays.NYSE() if market_calendar == 'NYSE' else holidays.UnitedKingdom()
+    if date.dayofweek > 4 or date.strftime('%Y-%m-%d') in market_holidays:
+        return None
+
+    return (pd.Timestamp(date.year, date.month, date.day, 9, 30, tz=timezone),
+            pd.Timestamp(date.year, date.month, date.day, 16, 0, tz=timezone))
+
 def market_open(market_calendar='NYSE'):
     # Get the current time in the market's timezone as a pd.Timestamp
     timezone = timezone_from_calendar(market_calendar)
@@ -0,0 +1,55 @@
+import pandas as pd
+from src.data_structures.bar_builder import BarBuilder
+
+TIMEZONE = "America/New_York"
+
+
+def at(time: str) -> int:
+    return pd.Timestamp(f"2024-03-05 {time}", tz=TIMEZONE).value
+
+
+def test_bars_are_anchored_to_the_session_open():
+    bars = []
+    builder = BarBuilder(pd.Timedelta("45min"), lambda *bar: bars.append(bar), anchor=at("09:30"))
+    builder.on_tick("A", at("09:31"), 1.0)   # partial first bar, dropped
+    builder.on_tick("A", at("10:20"), 2.0, 5)
+    builder.on_tick("A", at("10:50"), 4.0, 1)
+    builder.on_tick("A", at("10:59"), 3.0, 2)
+    builder.close_bars(at("11:00"))
+
+    assert bars == [("A", at("10:15"), (2.0, 4.0, 2.0, 3.0, 8.0))]
+
+
+def test_first_bar_is_passed_to_on_first_bar():
+    bars, first_bars = [], []
+    builder = BarBuilder(pd.Timedelta("5min"), lambda *bar: bars.append(bar), anchor=at("09:30"),
+                         on_first_bar=lambda *bar: first_bars.append(bar))
+    builder.on_tick("A", at("09:32"), 1.0, 1)
+    builder.on_tick("A", at("09:36"), 2.0, 1)
+    builder.close_bars(at("09:40"))
+
+    assert first_bars == [("A", at("09:30"), (1.0, 1.0, 1.0, 1.0, 1.0))]
+    assert bars == [("A", at("09:35"), (2.0, 2.0, 2.0, 2.0, 1.0))]
+
+
+def test_late_ticks_are_dropped_and_out_of_order_ticks_keep_the_latest_close():
+    bars = []
+    builder = BarBuilder(pd.Timedelta("5min"), lambda *bar: bars.append(bar), anchor=at("09:30"))
+    builder.on_tick("A", at("09:31"), 1.0)
+    builder.close_bars(at("09:35"))
+
+    builder.on_tick("A", at("09:34"), 9.0)          # before the latest close
+    builder.on_tick("A", at("09:37"), 2.0)
+    builder.on_tick("A", at("09:36"), 3.0)          # arrives after a later tick
+    builder.close_bars(at("09:40"))
+
+    assert bars == [("A", at("09:35"), (2.0, 3.0, 2.0, 2.0, 0.0))]
+    assert builder.last_price("A") == 3.0
+
+
+def test_wait_for_close_returns_once_the_interval_is_closed():
+    builder = BarBuilder(pd.Timedelta("5min"), lambda *bar: None)
+
+    assert not builder.wait_for_close(at("09:35"), timeout=0.01)
+    builder.close_bars(at("09:35"))
+    assert builder.wait_for_close(at("09:35"), timeout=0.01)
@@ -0,0 +1,83 @@
+import pandas as pd
+import pytest
+
+pytest.importorskip("pyarrow")
+bar_cache = pytest.importorskip("src.data_structures.bar_cache")
+BarCache = bar_cache.BarCache
+
+TIMEZONE = "America/New_York"
+
+
+def bars(start: str, periods: int, close: float = 1.0) -> pd.DataFrame:
+    index = pd.date_range(start, periods=periods, freq="30min", tz=TIMEZONE)
+    return pd.DataFrame({"open": close, "high": close, "low": close, "close": close, "volume": 100.0}, index=index)
+
+
+class FakeAPI:
+    max_batch_size = 8
+
+    def __init__(self, data: dict[str, pd.DataFrame]) -> None:
+        self.data = data
+        self.requests = []
+
+    def get_historical_prices_batch(self, symbols, interval, start_date=None, end_date=None, timezone=None):
+        self.requests.append((tuple(symbols), start_date, end_date))
+        start, end = pd.Timestamp(start_date).tz_localize(TIMEZONE), pd.Timestamp(end_date).tz_localize(TIMEZONE)
+        return {symbol: self.data[symbol][(self.data[symbol].index >= start) & (self.data[symbol].index <= end)]
+                for symbol in symbols if symbol in self.data}
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return BarCache(str(tmp_path))
+
+
+def test_missing_ranges_without_cache(cache):
+    start, end = pd.Timestamp("2024-03-05"), pd.Timestamp("2024-03-06")
+
+    assert cache.missing_ranges("provider", "A", "30min", start, end, TIMEZONE) == [(start, end)]
+
+
+def test_missing_ranges_are_leading_and_trailing_gaps(cache):
+    data = bars("2024-03-05 09:30", 4)
+    cache.merge("provider", "A", "30min", data, pd.Timestamp("2024-03-05 09:00"), pd.Timestamp("2024-03-05 12:00"), TIMEZONE)
+
+    ranges = cache.missing_ranges("provider", "A", "30min", pd.Timestamp("2024-03-05 08:00"), pd.Timestamp("2024-03-05 13:00"), TIMEZONE)
+    assert ranges == [
+        (pd.Timestamp("2024-03-05 08:00"), pd.Timestamp("2024-03-05 09:00")),
+        # Covered up to the start of the latest bar, which may still have been forming
+        (pd.Timestamp("2024-03-05 11:00"), pd.Timestamp("2024-03-05 13:00")),
+    ]
+    assert cache.missing_ranges("provider", "A", "30min", pd.Timestamp("2024-03-05 09:00"), pd.Timestamp("2024-03-05 10:00"), TIMEZONE) == []
+
+
+def test_merge_of_empty_data_does_not_mark_range_as_covered(cache):
+    start, end = pd.Timestamp("2024-03-05"), pd.Timestamp("2024-03-06")
+    cache.merge("provider", "A", "30min", bars("2024-03-05 09:30", 0), start, end, TIMEZONE)
+    cache.merge("provider", "A", "30min", None, start, end, TIMEZONE)
+
+    assert cache.missing_ranges("provider", "A", "30min", start, end, TIMEZONE) == [(start, end)]
+    assert cache.load("provider", "A", "30min") is None
+
+
+def test_merge_replaces_refetched_bars(cache):
+    start, end = pd.Timestamp("2024-03-05 09:00"), pd.Timestamp("2024-03-05 12:00")
+    cache.merge("provider", "A", "30min", bars("2024-03-05 09:30", 4, 1.0), start, end, TIMEZONE)
+    cache.merge("provider", "A", "30min", bars("2024-03-05 11:00", 2, 2.0), start, end, TIMEZONE)
+
+    data = cache.load("provider", "A", "30min")
+    assert len(data) == 5
+    assert data["close"].tolist() == [1.0, 1.0, 1.0, 2.0, 2.0]
+
+
+def test_batch_fetches_only_missing_ranges(cache):
+    api = FakeAPI({"A": bars("2024-03-05 09:30", 8), "B": bars("2024-03-05 09:30", 8)})
+    start, end = pd.Timestamp("2024-03-05 09:00"), pd.Timestamp("2024-03-05 11:00")
+    first = cache.get_historical_prices_batch(api, "provider", ["A", "B"], "30min", start, end, TIMEZONE)
+    assert api.requests == [(("A", "B"), start, end)]
+    assert len(first["A"]) == 4
+
+    later = pd.Timestamp("2024-03-05 13:00")
+    second = cache.get_historical_prices_batch(api, "provider", ["A", "B"], "30min", start, later, TIMEZONE)
+    assert api.requests[1] == (("A", "B"), pd.Timestamp("2024-03-05 11:00"), later)
+    assert len(second["B"]) == 8
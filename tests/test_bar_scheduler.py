@@ -0,0 +1,46 @@
+import pandas as pd
+from src.utilities.bar_scheduler import BarScheduler
+
+TIMEZONE = "America/New_York"
+
+
+class FakeClock:
+    def __init__(self, start: float) -> None:
+        self.now = start
+
+    def time(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.now += seconds
+
+
+def test_session_schedule_leaves_out_the_session_close():
+    scheduler = BarScheduler.for_session("NYSE", "5min", now=pd.Timestamp("2024-03-05 09:00", tz=TIMEZONE))
+
+    assert scheduler.bar_closes[0] == pd.Timestamp("2024-03-05 09:35", tz=TIMEZONE)
+    assert scheduler.bar_closes[-1] == pd.Timestamp("2024-03-05 15:55", tz=TIMEZONE)
+    assert len(scheduler.bar_closes) == 77
+
+
+def test_session_schedule_skips_published_closes_and_weekends():
+    scheduler = BarScheduler.for_session("NYSE", "5min", publication_lag=2.0, now=pd.Timestamp("2024-03-05 15:45:03", tz=TIMEZONE))
+    assert scheduler.bar_closes == [pd.Timestamp("2024-03-05 15:50", tz=TIMEZONE), pd.Timestamp("2024-03-05 15:55", tz=TIMEZONE)]
+
+    assert BarScheduler.for_session("NYSE", "5min", now=pd.Timestamp("2024-03-09 10:00", tz=TIMEZONE)).bar_closes == []
+
+
+def test_iteration_waits_for_publication_and_folds_overruns():
+    closes = list(pd.date_range("2024-03-05 09:35", periods=4, freq="5min", tz=TIMEZONE))
+    clock = FakeClock(closes[0].timestamp() - 10)
+    scheduler = BarScheduler(closes, publication_lag=1.0, clock=clock.time, sleep=clock.sleep)
+
+    yielded = []
+    for bar_close in scheduler:
+        yielded.append(bar_close)
+        if bar_close == closes[0]:
+            clock.now += 650     # overruns the next two bar closes
+
+    assert yielded == [closes[0], closes[2], closes[3]]
+    assert scheduler.summary()["skipped"] == 1
+    assert scheduler.metrics[0].jitter == 0.0
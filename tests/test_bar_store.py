@@ -0,0 +1,116 @@
+import numpy as np
+import pandas as pd
+import pytest
+from src.data_structures.bar_store import BarStore, BarStoreGroup
+
+
+def bar(value: float) -> tuple[float, float, float, float, float]:
+    return (value, value + 1, value - 1, value, 100.0)
+
+
+def test_append_keeps_ascending_order():
+    store = BarStore(10)
+    for timestamp in (1, 2, 3):
+        store.append(timestamp, bar(timestamp))
+
+    assert store.timestamps.tolist() == [1, 2, 3]
+    assert store.column("close").tolist() == [1.0, 2.0, 3.0]
+    assert store.bar(-1) == {"open": 3.0, "high": 4.0, "low": 2.0, "close": 3.0, "volume": 100.0}
+
+
+def test_append_overwrites_stored_timestamp():
+    store = BarStore(10)
+    store.append(1, bar(1))
+    store.append(2, bar(2))
+    store.append(1, bar(5))
+
+    assert store.timestamps.tolist() == [1, 2]
+    assert store.column("close").tolist() == [5.0, 2.0]
+
+
+def test_append_inserts_late_bar():
+    store = BarStore(10)
+    for timestamp in (1, 3, 4):
+        store.append(timestamp, bar(timestamp))
+    store.append(2, bar(2))
+
+    assert store.timestamps.tolist() == [1, 2, 3, 4]
+    assert store.column("close").tolist() == [1.0, 2.0, 3.0, 4.0]
+
+
+def test_insert_at_capacity_drops_oldest_bar():
+    store = BarStore(3)
+    for timestamp in (1, 3, 4):
+        store.append(timestamp, bar(timestamp))
+    store.append(2, bar(2))
+
+    assert store.timestamps.tolist() == [2, 3, 4]
+
+
+def test_compaction_keeps_latest_capacity_bars():
+    store = BarStore(4)
+    for timestamp in range(25):
+        store.append(timestamp, bar(timestamp))
+
+    assert len(store) == 4
+    assert store.timestamps.tolist() == [21, 22, 23, 24]
+    assert store.column("close").tolist() == [21.0, 22.0, 23.0, 24.0]
+
+
+def test_window_is_read_only_view_of_latest_bars():
+    store = BarStore(10)
+    for timestamp in range(5):
+        store.append(timestamp, bar(timestamp))
+
+    window = store.window("close", 3)
+    assert window.tolist() == [2.0, 3.0, 4.0]
+    assert not window.flags.writeable
+    assert store.window("close", 0).size == 0
+    assert store.window("close", 10).tolist() == [0.0, 1.0, 2.0, 3.0, 4.0]
+
+
+def test_append_frame_sorts_and_deduplicates():
+    index = pd.DatetimeIndex(["2024-03-05 09:40", "2024-03-05 09:30", "2024-03-05 09:35", "2024-03-05 09:40"])
+    data = pd.DataFrame({"Open": 1.0, "High": 2.0, "Low": 0.5, "Close": [4.0, 2.0, 3.0, 5.0], "Volume": 10.0}, index=index)
+    store = BarStore(10)
+    store.append_frame(data)
+
+    assert len(store) == 3
+    assert store.column("close").tolist() == [2.0, 3.0, 5.0]
+    assert store.to_dataframe().index.equals(pd.DatetimeIndex(sorted(set(index)), name="datetime"))
+
+
+def test_timezone_aware_store_round_trips():
+    index = pd.date_range("2024-03-05 09:30", periods=3, freq="5min", tz="America/New_York")
+    store = BarStore(10)
+    store.append_frame(pd.DataFrame({"close": [1.0, 2.0, 3.0]}, index=index))
+
+    assert store.latest_timestamp == index[-1]
+    assert store.locate(index[1]) == 1
+    assert store.asof(index[1] + pd.Timedelta("1min")) == 1
+    assert store.between(index[1], index[2]) == slice(1, 3)
+
+
+def test_bar_store_group_panel_is_a_view():
+    group = BarStoreGroup(["A", "B", "C"], capacity=10)
+    for timestamp in range(4):
+        for row, ticker in enumerate(group.tickers):
+            group.stores[ticker].append(timestamp, bar(10 * row + timestamp))
+
+    panel = group.panel(["A", "B"], "close", 2)
+    assert panel.tolist() == [[2.0, 3.0], [12.0, 13.0]]
+    assert not panel.flags.writeable
+    assert group.panel(["A", "C"], "close", 2) is None
+
+
+def test_bar_store_group_panel_requires_aligned_bars():
+    group = BarStoreGroup(["A", "B"], capacity=10)
+    group.stores["A"].append(1, bar(1))
+    group.stores["B"].append(2, bar(2))
+
+    assert group.panel(["A", "B"], "close", 1) is None
+
+
+def test_capacity_must_be_positive():
+    with pytest.raises(ValueError):
+        BarStore(0)
@@ -0,0 +1,143 @@
+import threading
+import time
+import pandas as pd
+import pytest
+
+cached_mkdata_api = pytest.importorskip("src.readers.cached_mkdata_api")
+CachedMarketDataAPI = cached_mkdata_api.CachedMarketDataAPI
+
+
+class FakeAPI:
+    max_batch_size = 8
+
+    def __init__(self, price: float = 1.0, delay: float = 0.0) -> None:
+        self.price = price
+        self.delay = delay
+        self.calls = []
+
+    def get_real_time_price(self, symbol):
+        self.calls.append(symbol)
+        time.sleep(self.delay)
+        return self.price
+
+    def get_real_time_prices(self, symbols):
+        self.calls.append(tuple(symbols))
+        return {symbol: self.price for symbol in symbols}
+
+    def get_news(self, symbol, start_date=None, end_date=None):
+        self.calls.append(symbol)
+        return pd.DataFrame() if self.price is None else pd.DataFrame({"title": ["news"]})
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(cached_mkdata_api.time, "monotonic", clock)
+    return clock
+
+
+def test_cached_until_ttl_expires(clock):
+    api = FakeAPI()
+    cached = CachedMarketDataAPI(api, {"real_time_price": 5.0})
+
+    assert cached.get_real_time_price("A") == 1.0
+    clock.now += 4
+    assert cached.get_real_time_price("A") == 1.0
+    assert api.calls == ["A"]
+
+    clock.now += 2
+    cached.get_real_time_price("A")
+    assert api.calls == ["A", "A"]
+    assert cached.stats()["real_time_price"] == {"hits": 1, "misses": 2, "coalesced": 0}
+
+
+def test_zero_ttl_disables_caching(clock):
+    api = FakeAPI()
+    cached = CachedMarketDataAPI(api, {"real_time_price": 0.0})
+    cached.get_real_time_price("A")
+    cached.get_real_time_price("A")
+
+    assert api.calls == ["A", "A"]
+
+
+def test_batch_fetches_only_uncached_symbols(clock):
+    api = FakeAPI()
+    cached = CachedMarketDataAPI(api)
+    cached.get_real_time_price("A")
+
+    assert cached.get_real_time_prices(["A", "B", "C"]) == {"A": 1.0, "B": 1.0, "C": 1.0}
+    assert api.calls == ["A", ("B", "C")]
+
+
+def test_closed_window_never_expires(clock):
+    api = FakeAPI()
+    cached = CachedMarketDataAPI(api, {"news": 60.0})
+    yesterday = pd.Timestamp.now().normalize() - pd.Timedelta(days=1)
+    cached.get_news("A", yesterday - pd.Timedelta(days=1), yesterday)
+
+    clock.now += 1e6
+    cached.get_news("A", yesterday - pd.Timedelta(days=1), yesterday)
+    assert api.calls == ["A"]
+
+
+def test_empty_results_are_not_cached(clock):
+    api = FakeAPI(price=None)
+    cached = CachedMarketDataAPI(api)
+    yesterday = pd.Timestamp.now().normalize() - pd.Timedelta(days=1)
+
+    assert cached.get_news("A", yesterday, yesterday).empty
+    cached.get_news("A", yesterday, yesterday)
+    assert api.calls == ["A", "A"]
+
+
+def test_expired_entries_are_swept(clock):
+    api = FakeAPI()
+    cached = CachedMarketDataAPI(api, {"real_time_price": 5.0})
+    cached.get_real_time_price("A")
+
+    clock.now += CachedMarketDataAPI.SWEEP_INTERVAL + 1
+    cached.get_real_time_price("B")
+    assert list(cached._entries) == [("real_time_price", "B")]
+
+
+def test_concurrent_identical_requests_are_coalesced():
+    api = FakeAPI(delay=0.2)
+    cached = CachedMarketDataAPI(api)
+    barrier = threading.Barrier(4)
+    results = []
+
+    def request():
+        barrier.wait()
+        results.append(cached.get_real_time_price("A"))
+
+    threads = [threading.Thread(target=request) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert results == [1.0] * 4
+    assert api.calls == ["A"]
+    assert cached.stats()["real_time_price"]["coalesced"] == 3
+
+
+def test_failures_are_raised_to_all_waiters_and_not_cached(clock):
+    class FailingAPI(FakeAPI):
+        def get_real_time_price(self, symbol):
+            self.calls.append(symbol)
+            raise ConnectionError("provider down")
+
+    api = FailingAPI()
+    cached = CachedMarketDataAPI(api)
+    for _ in range(2):
+        with pytest.raises(ConnectionError):
+            cached.get_real_time_price("A")
+    assert api.calls == ["A", "A"]
@@ -0,0 +1,42 @@
+import time
+import pytest
+from src.utilities.fetch_engine import FetchEngine
+
+
+def test_run_collects_results_and_failures():
+    engine = FetchEngine(4)
+
+    def fail():
+        raise RuntimeError("provider down")
+
+    result = engine.run({"A": lambda: 1, "B": fail, "C": lambda: 3})
+    engine.close()
+
+    assert result.results == {"A": 1, "C": 3}
+    assert isinstance(result.failures["B"], RuntimeError)
+    assert set(result.timings) == {"A", "B", "C"}
+
+
+def test_run_executes_tasks_concurrently():
+    engine = FetchEngine(4)
+    started = time.perf_counter()
+    engine.run({key: lambda: time.sleep(0.1) for key in "ABCD"})
+    engine.close()
+
+    assert time.perf_counter() - started < 0.3
+
+
+def test_run_spreads_submissions():
+    engine = FetchEngine(4)
+    submitted = {}
+    started = time.perf_counter()
+    engine.run({key: (lambda key=key: submitted.setdefault(key, time.perf_counter() - started)) for key in "ABCD"}, spread_over=0.2)
+    engine.close()
+
+    assert submitted["A"] < 0.05
+    assert submitted["D"] == pytest.approx(0.15, abs=0.05)
+
+
+def test_needs_a_worker():
+    with pytest.raises(ValueError):
+        FetchEngine(0)
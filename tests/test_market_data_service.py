@@ -0,0 +1,59 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+market_data_service = pytest.importorskip("src.services.market_data_service")
+from src.data_structures.marketdata_state import MarketDataState
+
+API = "twelve_data"
+
+
+def bars(start: str, periods: int, close: float) -> pd.DataFrame:
+    index = pd.date_range(start, periods=periods, freq="30min", tz="America/New_York")
+    return pd.DataFrame({"open": close, "high": close, "low": close, "close": close, "volume": 100.0}, index=index)
+
+
+def service_with(frames: dict[str, pd.DataFrame], grouped: bool) -> market_data_service.MarketDataService:
+    state = MarketDataState()
+    if grouped:
+        state.market_data[API] = state._new_bar_store_group(API, frames)
+    else:
+        state.market_data[API] = {ticker: state._new_bar_store(frame) for ticker, frame in frames.items()}
+    return market_data_service.MarketDataService(state)
+
+
+def test_panel_of_grouped_tickers_is_a_view():
+    service = service_with({"A": bars("2024-03-05 09:30", 4, 1.0), "B": bars("2024-03-05 09:30", 4, 2.0)}, grouped=True)
+    panel = service.panel(["A", "B"], "close", 3, API)
+
+    assert panel.shape == (2, 3)
+    assert panel.base is not None
+    assert not panel.flags.writeable
+    assert panel[:, -1].tolist() == [1.0, 2.0]
+
+
+def test_panel_aligns_stores_on_timestamps():
+    service = service_with({"A": bars("2024-03-05 09:30", 4, 1.0), "B": bars("2024-03-05 10:30", 2, 2.0)}, grouped=False)
+    panel = service.panel(["A", "B", "C"], "close", 3, API)
+
+    assert panel.shape == (3, 3)
+    np.testing.assert_array_equal(panel[0], [1.0, 1.0, 1.0])
+    np.testing.assert_array_equal(panel[1], [np.nan, 2.0, 2.0])
+    assert np.isnan(panel[2]).all()
+
+
+def test_panel_of_no_bars_is_empty():
+    service = service_with({"A": bars("2024-03-05 09:30", 4, 1.0)}, grouped=False)
+
+    assert service.panel(["A"], "close", 0, API).shape == (1, 0)
+    assert service.panel(["C"], "close", 3, API).shape == (1, 0)
+
+
+def test_window_is_read_only():
+    service = service_with({"A": bars("2024-03-05 09:30", 4, 1.0)}, grouped=False)
+    window = service.window("A", "close", 2, API)
+
+    assert window.tolist() == [1.0, 1.0]
+    with pytest.raises(ValueError):
+        window[0] = 2.0
+    assert len(service.window("C", "close", 2, API)) == 0
@@ -0,0 +1,52 @@
+import pandas as pd
+import pytest
+
+marketdata_state = pytest.importorskip("src.data_structures.marketdata_state")
+from src.data_structures.bar_store import BarStore
+from src.utilities.rate_limiter import RateLimiterRegistry
+
+MarketDataState = marketdata_state.MarketDataState
+TIMEZONE = "America/New_York"
+API = "twelve_data"
+
+
+def state_with_bar(timezone) -> MarketDataState:
+    state = MarketDataState()
+    index = pd.DatetimeIndex([pd.Timestamp("2024-03-05 10:00", tz=TIMEZONE)])
+    if timezone is None:
+        index = index.tz_localize(None)
+    store = BarStore(100, timezone)
+    store.append_frame(pd.DataFrame({"open": [10.0], "high": [11.0], "low": [9.5], "close": [10.5], "volume": [100.0]}, index=index))
+    state.market_data[API] = {"A": store}
+    return state
+
+
+@pytest.mark.parametrize("timezone", [TIMEZONE, None])
+def test_first_streamed_bar_is_merged_into_the_rest_bar(timezone):
+    state = state_with_bar(timezone)
+    start = pd.Timestamp("2024-03-05 10:00", tz=TIMEZONE).value
+    state._merge_streamed_bar(API, TIMEZONE, "A", start, (10.4, 11.5, 10.0, 10.8, 40.0))
+
+    store = state.get_bar_store(API, "A")
+    assert len(store) == 1
+    assert store.bar(-1) == {"open": 10.0, "high": 11.5, "low": 9.5, "close": 10.8, "volume": 140.0}
+
+
+def test_first_streamed_bar_without_rest_bar_is_dropped():
+    state = state_with_bar(TIMEZONE)
+    start = pd.Timestamp("2024-03-05 10:30", tz=TIMEZONE).value
+    state._merge_streamed_bar(API, TIMEZONE, "A", start, (10.4, 11.5, 10.0, 10.8, 40.0))
+
+    assert len(state.get_bar_store(API, "A")) == 1
+
+
+@pytest.fixture
+def limited():
+    RateLimiterRegistry.configure({API: 8}, period=60.0)
+    yield
+    RateLimiterRegistry.configure({})
+
+
+@pytest.mark.parametrize("requests, credits, spread", [(2, 16, 120.0), (16, 16, 64.0), (1, 8, 0.0)])
+def test_spread_for_rate_limit(limited, requests, credits, spread):
+    assert MarketDataState._spread_for_rate_limit(API, requests, credits) == pytest.approx(spread, abs=1.0)
@@ -0,0 +1,76 @@
+import asyncio
+import threading
+import time
+import pytest
+from src.utilities.rate_limiter import TokenBucket, RateLimiterRegistry
+
+
+def test_token_bucket_takes_available_tokens_without_waiting():
+    bucket = TokenBucket(10, period=1.0)
+
+    assert bucket.acquire(5) == 0.0
+    assert bucket.remaining() == pytest.approx(5, abs=0.1)
+
+
+def test_token_bucket_waits_for_refill():
+    bucket = TokenBucket(20, period=1.0)
+    bucket.acquire(20)
+
+    assert bucket.wait_time(2) == pytest.approx(0.1, abs=0.02)
+    waited = bucket.acquire(2)
+    assert waited == pytest.approx(0.1, abs=0.05)
+
+
+def test_token_bucket_serves_large_requests_in_installments():
+    bucket = TokenBucket(20, period=1.0, capacity=5)
+
+    started = time.perf_counter()
+    bucket.acquire(10)
+    assert time.perf_counter() - started == pytest.approx(0.25, abs=0.1)
+
+
+def test_token_bucket_rejects_invalid_rate():
+    with pytest.raises(ValueError):
+        TokenBucket(0)
+
+
+def test_async_acquire_takes_available_tokens_right_away():
+    bucket = TokenBucket(10, period=1.0)
+
+    assert asyncio.run(bucket.acquire_async(3)) == 0.0
+    assert bucket.remaining() == pytest.approx(7, abs=0.1)
+
+
+def test_async_acquire_queues_behind_waiting_threads():
+    bucket = TokenBucket(10, period=1.0, capacity=1)
+    bucket.acquire(1)
+    order = []
+
+    def thread_acquire():
+        bucket.acquire(1)
+        order.append("thread")
+
+    thread = threading.Thread(target=thread_acquire)
+    thread.start()
+    time.sleep(0.02)
+
+    async def async_acquire():
+        await bucket.acquire_async(1)
+        order.append("async")
+
+    asyncio.run(async_acquire())
+    thread.join()
+    assert order == ["thread", "async"]
+
+
+def test_registry_charges_endpoint_and_provider_buckets():
+    RateLimiterRegistry.configure({"provider": 10, "provider.price": 4}, period=60.0)
+    try:
+        RateLimiterRegistry.acquire("provider", "price", credits=3)
+
+        assert RateLimiterRegistry.remaining("provider", "price") == pytest.approx(1, abs=0.1)
+        assert RateLimiterRegistry.remaining("provider") == pytest.approx(7, abs=0.1)
+        assert RateLimiterRegistry.remaining("unlimited") is None
+        assert RateLimiterRegistry.wait_time("unlimited", credits=100) == 0.0
+    finally:
+        RateLimiterRegistry.configure({})
@@ -0,0 +1,93 @@
+import pandas as pd
+import pytest
+
+simulated_broker_api = pytest.importorskip("src.readers.simulated_broker_api")
+from src.data_structures.bar_store import BarStore
+from src.data_structures.marketdata_state import MarketDataState
+from src.data_structures.order import Order
+from src.services.market_data_service import MarketDataService
+from src.utilities.enums import Signal
+
+TIMEZONE = "America/New_York"
+API = "simulated"
+
+
+class FakeClock:
+    def __init__(self, time: str) -> None:
+        self.now = pd.Timestamp(time, tz=TIMEZONE).timestamp()
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def at(time: str) -> pd.Timestamp:
+    return pd.Timestamp(f"2024-03-05 {time}", tz=TIMEZONE)
+
+
+def add_bar(state: MarketDataState, time: str, open_: float, high: float, low: float, close: float) -> None:
+    store = state.market_data.setdefault(API, {}).setdefault("A", BarStore(100, TIMEZONE))
+    store.append(at(time).value, (open_, high, low, close, 1000.0))
+
+
+def broker_at(time: str, **kwargs) -> tuple[simulated_broker_api.SimulatedBrokerAPI, MarketDataState, FakeClock]:
+    state = MarketDataState()
+    clock = FakeClock(f"2024-03-05 {time}")
+    broker = simulated_broker_api.SimulatedBrokerAPI(10000.0, **kwargs)
+    broker.attach_market_data(MarketDataService(state, clock), API)
+    broker.timezone = TIMEZONE
+    return broker, state, clock
+
+
+def test_market_order_fills_at_slipped_close_with_commission():
+    broker, state, _ = broker_at("10:00:01", slippage_bps=10, commission_per_share=0.01, min_commission=1.0)
+    add_bar(state, "09:30", 100.0, 101.0, 99.0, 100.0)
+    broker.place_market_order(Order("A", Signal.BUY, 10, None, "market"))
+
+    trade = broker.trades.iloc[0]
+    assert trade["price"] == pytest.approx(100.1)
+    assert trade["commission"] == 1.0
+    assert broker.get_cash() == pytest.approx(10000.0 - 1001.0 - 1.0)
+
+    broker.place_market_order(Order("A", Signal.SELL, 10, None, "market"))
+    assert broker.trades.iloc[1]["price"] == pytest.approx(99.9)
+    assert broker.get_all_positions() == []
+
+
+def test_limit_order_rests_until_a_bar_trades_through():
+    broker, state, _ = broker_at("10:00:01")
+    add_bar(state, "09:30", 100.0, 101.0, 99.0, 100.0)
+    broker.place_limit_order(Order("A", Signal.BUY, 10, 98.0, "limit"))
+    assert broker.pending_orders == 1
+
+    add_bar(state, "10:00", 100.0, 100.5, 98.5, 99.0)
+    broker.get_cash()
+    assert broker.pending_orders == 1
+
+    add_bar(state, "10:30", 97.5, 99.0, 97.0, 98.5)
+    broker.get_cash()
+    assert broker.pending_orders == 0
+    # Gapped through the limit, filled at the better open
+    assert broker.trades.iloc[0]["price"] == 97.5
+
+
+def test_limit_order_expires_at_the_end_of_the_day():
+    broker, state, clock = broker_at("15:00:01")
+    add_bar(state, "14:30", 100.0, 101.0, 99.0, 100.0)
+    broker.place_limit_order(Order("A", Signal.SELL, 10, 105.0, "limit"))
+
+    clock.now = pd.Timestamp("2024-03-06 09:30", tz=TIMEZONE).timestamp()
+    broker.get_cash()
+    assert broker.pending_orders == 0
+    assert broker.trades.empty
+
+
+def test_fill_latency_fills_against_the_bars_of_that_time():
+    broker, state, clock = broker_at("10:29:59", fill_latency=5.0)
+    add_bar(state, "10:00", 100.0, 101.0, 99.0, 100.0)
+    broker.place_market_order(Order("A", Signal.BUY, 10, None, "market"))
+    assert broker.trades.empty
+
+    clock.now += 5.0
+    add_bar(state, "10:30", 102.0, 102.0, 102.0, 102.0)
+    broker.get_cash()
+    assert broker.trades.iloc[0]["price"] == 102.0
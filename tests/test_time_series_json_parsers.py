@@ -0,0 +1,84 @@
+import io
+import json
+import numpy as np
+import pandas as pd
+import pytest
+from src.parsers.time_series_json_parsers import AlphaVantageTimeSeriesJSONParser, TwelveDataTimeSeriesJSONParser
+
+
+def alpha_vantage_response(dates: list[str]) -> dict:
+    """Daily time series, newest first like the provider returns it"""
+    bars = {
+        date: {"1. open": str(i), "2. high": str(i + 1), "3. low": str(i - 1), "4. close": str(i + 0.5), "5. volume": "100"}
+        for i, date in enumerate(sorted(dates, reverse=True))
+    }
+    return {"Meta Data": {"1. Information": "Daily Prices"}, "Time Series (Daily)": bars}
+
+
+DATES = ["2024-03-01", "2024-03-04", "2024-03-05", "2024-03-06", "2024-03-07"]
+
+
+def test_alpha_vantage_parse_returns_ascending_float_frame():
+    data = AlphaVantageTimeSeriesJSONParser.parse(alpha_vantage_response(DATES))
+
+    assert list(data.columns) == ["open", "high", "low", "close", "volume"]
+    assert (data.dtypes == np.float64).all()
+    assert data.index.is_monotonic_increasing
+    assert data.index[-1] == pd.Timestamp("2024-03-07")
+    assert data["close"].iloc[-1] == 0.5
+
+
+def test_alpha_vantage_parse_selects_window():
+    response = alpha_vantage_response(DATES)
+
+    between = AlphaVantageTimeSeriesJSONParser.parse(response, pd.Timestamp("2024-03-04"), pd.Timestamp("2024-03-06"))
+    assert between.index.strftime("%Y-%m-%d").tolist() == ["2024-03-04", "2024-03-05", "2024-03-06"]
+
+    latest = AlphaVantageTimeSeriesJSONParser.parse(response, number_points=2)
+    assert latest.index.strftime("%Y-%m-%d").tolist() == ["2024-03-06", "2024-03-07"]
+
+
+@pytest.mark.parametrize("response", [None, {"Note": "API call frequency exceeded"}, {"Error Message": "Invalid API call"}])
+def test_alpha_vantage_parse_returns_empty_frame_without_time_series(response):
+    data = AlphaVantageTimeSeriesJSONParser.parse(response)
+
+    assert data.empty
+    assert list(data.columns) == ["open", "high", "low", "close", "volume"]
+
+
+def test_alpha_vantage_parse_stream_matches_parse():
+    pytest.importorskip("ijson")
+    response = alpha_vantage_response(DATES)
+    stream = io.BytesIO(json.dumps(response).encode())
+
+    streamed = AlphaVantageTimeSeriesJSONParser.parse_stream(stream, "Time Series (Daily)", pd.Timestamp("2024-03-04"), number_points=3)
+    parsed = AlphaVantageTimeSeriesJSONParser.parse(response, pd.Timestamp("2024-03-04"), number_points=3)
+    pd.testing.assert_frame_equal(streamed, parsed)
+
+
+def test_alpha_vantage_parse_stream_returns_empty_frame_on_note():
+    pytest.importorskip("ijson")
+    stream = io.BytesIO(json.dumps({"Note": "API call frequency exceeded"}).encode())
+
+    data = AlphaVantageTimeSeriesJSONParser.parse_stream(stream, "Time Series (Daily)")
+    assert data.empty
+    assert list(data.columns) == ["open", "high", "low", "close", "volume"]
+
+
+def test_twelve_data_parse_localizes_and_sorts():
+    values = [
+        {"datetime": "2024-03-05 09:35:00", "open": "2", "high": "3", "low": "1", "close": "2.5", "volume": "10"},
+        {"datetime": "2024-03-05 09:30:00", "open": "1", "high": "2", "low": "0.5", "close": "1.5", "volume": "20"},
+    ]
+    data = TwelveDataTimeSeriesJSONParser.parse(values, "America/New_York")
+
+    assert data.index.tolist() == [pd.Timestamp("2024-03-05 09:30", tz="America/New_York"),
+                                   pd.Timestamp("2024-03-05 09:35", tz="America/New_York")]
+    assert data["close"].tolist() == [1.5, 2.5]
+
+
+def test_twelve_data_parse_fills_missing_fields_with_nan():
+    data = TwelveDataTimeSeriesJSONParser.parse([{"datetime": "2024-03-05", "close": "1"}], None)
+
+    assert data["close"].tolist() == [1.0]
+    assert np.isnan(data["volume"].iloc[0])